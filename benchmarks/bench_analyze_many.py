@@ -0,0 +1,58 @@
+"""Throughput of PoetryAnalyzer.analyze_many against per-poem calls.
+
+Usage:
+    python benchmarks/bench_analyze_many.py [--poems N] [--batch-size B]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.analyzer import PoetryAnalyzer
+from corpus import make_corpus
+
+
+def per_poem(analyzer, poems):
+    """Analyze poems one at a time with the individual methods."""
+    for poem in poems:
+        analyzer.analyze_rhyme_scheme(poem)
+        analyzer.analyze_imagery(poem)
+        analyzer.analyze_sentiment(poem)
+
+
+def batched(analyzer, poems, batch_size):
+    """Analyze poems through a single analyze_many stream."""
+    for _ in analyzer.analyze_many(poems, batch_size=batch_size):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--poems', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    analyzer = PoetryAnalyzer()
+    poems = make_corpus(args.poems)
+    # Warm up model and vocabulary state outside the timed region
+    batched(analyzer, poems[:10], args.batch_size)
+
+    start = time.perf_counter()
+    per_poem(analyzer, poems)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched(analyzer, poems, args.batch_size)
+    bulk = time.perf_counter() - start
+
+    print(f"per-poem calls: {args.poems / single:10.1f} poems/sec")
+    print(f"analyze_many:   {args.poems / bulk:10.1f} poems/sec "
+          f"({single / bulk:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Scaling of generate_batch across worker processes.
+
+Generates the same seeded batch with 1, 2, 4, ... workers (up to the CPU
+count), reports poems/sec and speedup over one worker, and checks that
+every run produced identical poems.
+
+Usage:
+    python benchmarks/bench_batch.py [--form haiku] [--poems N] [--seed S]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch import FORMS, generate_batch
+
+
+def worker_counts(limit):
+    count = 1
+    while count < limit:
+        yield count
+        count *= 2
+    yield limit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--form', choices=sorted(FORMS), default='haiku')
+    parser.add_argument('--poems', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    # Build the process-wide phonetic index and lexicon before timing;
+    # forked workers inherit them
+    generate_batch(args.form, 1, seed=args.seed, workers=1)
+
+    reference = None
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        poems = generate_batch(args.form, args.poems, seed=args.seed, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        reference = reference or poems
+        print(f"workers={workers:3d}: {args.poems / elapsed:10.1f} poems/sec "
+              f"speedup {baseline / elapsed:5.2f}x "
+              f"identical={poems == reference}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Candidates/sec: per-candidate analyzer calls vs batched best_of scoring.
+
+"Before" generates every candidate and then scores each one with its own
+``analyze_imagery``, ``analyze_sentiment`` and ``count_line_syllables``
+calls; "after" runs ``PoetryGenerator.best_of``, which scores candidates
+in batches with one ``analyze_many`` pass and one vectorized syllable
+count per batch. Both use the same seeded candidates and must pick the
+same poems. No threshold is set, so every candidate is scored.
+
+Usage:
+    python benchmarks/bench_best_of.py [--form haiku] [--candidates N]
+        [--batch-size B] [--seed S]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.batch import FORMS
+from core.generator import PoetryGenerator
+from core.selection import DEFAULT_WEIGHTS, PoemScorer
+
+
+def per_candidate(generator, form, n, mood, seed):
+    """Generate ``n`` candidates, scoring each with its own analyzer calls."""
+    analyzer = generator.analyzer
+    scorer = PoemScorer(analyzer, mood=mood,
+                        syllables=generator.templates[form].get('structure'))
+    rng = random.Random(seed)
+    generate = getattr(generator, FORMS[form])
+    scored = []
+    for index in range(n):
+        poem = generate(mood=mood, rng=rng)
+        lines = [line for line in poem.split('\n') if line.strip()]
+        components = {
+            'imagery': scorer._imagery(analyzer.analyze_imagery(poem), len(lines)),
+            'sentiment': scorer._sentiment(analyzer.analyze_sentiment(poem)),
+        }
+        if scorer.syllables is not None:
+            components['syllables'] = scorer._exactness(
+                [analyzer.count_line_syllables(line)['total'] for line in lines])
+        weights = [DEFAULT_WEIGHTS[name] for name in components]
+        score = sum(w * v for w, v in zip(weights, components.values())) / sum(weights)
+        scored.append((score, -index, poem))
+    return [(poem, score) for score, _, poem in sorted(scored, reverse=True)[:1]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--form', choices=sorted(FORMS), default='haiku')
+    parser.add_argument('--candidates', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--mood', default='nature')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = PoetryGenerator(PoetryAnalyzer())
+    # Load the lexicon, models and feature vocabulary before timing
+    generator.best_of(args.form, 2, mood=args.mood, rng=random.Random(args.seed))
+    per_candidate(generator, args.form, 2, args.mood, args.seed)
+
+    start = time.perf_counter()
+    before = per_candidate(generator, args.form, args.candidates, args.mood, args.seed)
+    before_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = generator.best_of(args.form, args.candidates, mood=args.mood,
+                              batch_size=args.batch_size, rng=random.Random(args.seed))
+    after_time = time.perf_counter() - start
+
+    assert before[0][0] == after[0][0], "batched scoring picked a different poem"
+    print(f"per-candidate scoring: {args.candidates / before_time:10.1f} candidates/sec "
+          f"({before_time:.2f}s)")
+    print(f"best_of (batched):     {args.candidates / after_time:10.1f} candidates/sec "
+          f"({after_time:.2f}s, {before_time / after_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Lines/sec: per-word count_line_syllables vs vectorized corpus features.
+
+"Before" counts every line with ``PoetryAnalyzer.count_line_syllables``
+(one cached Python lookup per word); "after" extracts syllables, stresses
+and line totals for the whole corpus with ``CorpusFeatureExtractor``.
+
+Usage:
+    python benchmarks/bench_features.py [--lines N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.features import CorpusFeatureExtractor
+from corpus import SAMPLE_POEMS
+
+
+def make_lines(n):
+    """Return ``n`` lines by cycling through the sample poems' lines."""
+    lines = [line for poem in SAMPLE_POEMS for line in poem.splitlines()]
+    return [lines[i % len(lines)] for i in range(n)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    lines = make_lines(args.lines)
+    analyzer = PoetryAnalyzer()
+    extractor = CorpusFeatureExtractor(analyzer.phonetics)
+
+    start = time.perf_counter()
+    totals = [analyzer.count_line_syllables(line)['total'] for line in lines]
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = extractor.extract(lines)
+    after = time.perf_counter() - start
+
+    assert features.line_syllables.tolist() == totals
+    print(f"count_line_syllables: {args.lines / before:12.0f} lines/sec ({before:.2f}s)")
+    print(f"corpus features:      {args.lines / after:12.0f} lines/sec ({after:.2f}s, "
+          f"{before / after:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Memory and lines/sec: list-of-strings Markov chain vs ``MarkovModel``.
+
+"Before" is the simple version's trigram chain, a dict from word-pair
+tuples to lists of successor strings (duplicates repeated), sampled with
+``random.choice``; its size is measured with ``tracemalloc``. "After" is
+``MarkovModel`` with interned ids, CSR transitions and cumulative counts,
+saved and loaded memory-mapped; its size is the bytes of its arrays.
+Both are trained on lines of seeded generated poems and sample lines of a
+fixed syllable budget; ``MarkovModel`` lines must also end where a corpus
+line ends, which the list chain does not check.
+
+Usage:
+    python benchmarks/bench_markov.py [--lines N] [--samples N] [--seed S]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+from core.markov import MarkovModel
+from core.phonetics import WORD_RE, get_phonetic_index
+
+
+def build_chain(lines):
+    """Trigram chain as in the simple version: pair -> list of successors."""
+    chain = defaultdict(list)
+    for line in lines:
+        words = WORD_RE.findall(line.lower())
+        for i in range(len(words) - 2):
+            chain[(words[i], words[i + 1])].append(words[i + 2])
+    return chain
+
+
+def sample_chain(chain, starts, syllables, counts, rng, attempts=20):
+    """Walk the list chain from a random start pair to ``syllables``."""
+    for _ in range(attempts):
+        line = list(rng.choice(starts))
+        remaining = syllables - counts[line[0]] - counts[line[1]]
+        while remaining > 0:
+            candidates = chain.get((line[-2], line[-1]))
+            if not candidates:
+                break
+            word = rng.choice(candidates)
+            if counts[word] > remaining:
+                break
+            line.append(word)
+            remaining -= counts[word]
+        if remaining == 0:
+            return line
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=50000)
+    parser.add_argument('--samples', type=int, default=5000)
+    parser.add_argument('--syllables', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = PoetryGenerator(PoetryAnalyzer(), rng=args.seed)
+    lines = [generator.generate_line(rng.randint(5, 10))
+             for rng in [random.Random(args.seed)] for _ in range(args.lines)]
+
+    tracemalloc.start()
+    chain = build_chain(lines)
+    chain_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = MarkovModel.load(MarkovModel.train(lines).save(f'{tmp}/model'))
+
+        phonetics = get_phonetic_index()
+        counts = {w: max(1, phonetics.syllables(w) or 1)
+                  for words in chain for w in words}
+        counts.update({w: max(1, phonetics.syllables(w) or 1)
+                       for successors in chain.values() for w in successors})
+        starts = list(chain)
+
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.samples):
+            sample_chain(chain, starts, args.syllables, counts, rng)
+        before_time = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.samples):
+            model.sample_line(args.syllables, rng)
+        after_time = time.perf_counter() - start
+
+        print(f"{len(lines)} lines: {len(model)} words, {len(model.state_keys)} "
+              f"contexts, {len(model.successors)} transitions")
+        print(f"list chain:  {chain_bytes / 1e6:8.2f} MB  "
+              f"{args.samples / before_time:10.1f} lines/sec")
+        print(f"MarkovModel: {model.nbytes / 1e6:8.2f} MB  "
+              f"{args.samples / after_time:10.1f} lines/sec "
+              f"({chain_bytes / model.nbytes:.1f}x smaller, memory-mapped)")
+
+
+if __name__ == '__main__':
+    main()
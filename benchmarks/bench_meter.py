@@ -0,0 +1,82 @@
+"""Sonnets/sec: per-word stress lookups vs vectorized meter scoring.
+
+"Before" rebuilds the archived ``analyze_meter``: a ``pronouncing`` lookup
+per word per line, then each line's pattern is compared with every foot
+template in Python. "After" scores the whole batch with
+``PoetryAnalyzer.score_meter`` (precomputed stresses, NumPy matching).
+Generation is not timed.
+
+Usage:
+    python benchmarks/bench_meter.py [--sonnets N] [--seed S]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.batch import generate_batch
+from core.generator import PoetryGenerator
+from core.meter import METERS
+
+
+def per_word_scores(analyzer, poems):
+    """Best-meter deviation per poem, one dictionary lookup per word."""
+    import pronouncing
+    scores = []
+    for poem in poems:
+        deviations = []
+        for line in poem.split('\n'):
+            pattern = []
+            for word in line.split():
+                phones = pronouncing.phones_for_word(word.lower().strip(".,;:!?'"))
+                if phones:
+                    pattern.extend(int(s) for s in pronouncing.stresses(phones[0]))
+                else:
+                    syllables = analyzer.count_syllables(word)
+                    pattern.extend(([1, 0] * syllables)[:syllables])
+            if pattern:
+                deviations.append(min(
+                    sum((s > 0) != foot[i % len(foot)] for i, s in enumerate(pattern))
+                    / len(pattern) for foot in METERS.values()))
+        scores.append(sum(deviations) / len(deviations) if deviations else 1.0)
+    return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sonnets', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    analyzer = PoetryAnalyzer()
+    sonnets = generate_batch('sonnet', args.sonnets, seed=args.seed, workers=1,
+                             generator=PoetryGenerator(analyzer))
+    # Load the phonetic index and feature vocabulary before timing
+    analyzer.score_meter(sonnets[:1])
+    per_word_scores(analyzer, sonnets[:1])
+
+    start = time.perf_counter()
+    per_word_scores(analyzer, sonnets)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer.score_meter(sonnets, meter=None)
+    after = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer.score_meter(sonnets, meter='iambic', feet=5)
+    target = time.perf_counter() - start
+
+    print(f"per-word lookups:        {args.sonnets / before:10.0f} sonnets/sec ({before:.2f}s)")
+    print(f"score_meter (best fit):  {args.sonnets / after:10.0f} sonnets/sec "
+          f"({after:.2f}s, {before / after:.1f}x)")
+    print(f"score_meter (iambic 5):  {args.sonnets / target:10.0f} sonnets/sec "
+          f"({target:.2f}s, {before / target:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
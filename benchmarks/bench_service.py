@@ -0,0 +1,61 @@
+"""Requests/sec and latency of PoetryService, unbatched vs micro-batched.
+
+Fires concurrent analysis requests at an in-process service, first with
+one poem per parse (``--max-batch 1``, like one parse per request in a
+thread server) and then with micro-batching.
+
+Usage:
+    python benchmarks/bench_service.py [--requests N] [--concurrency C]
+        [--max-batch B]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.service import PoetryService
+from corpus import make_corpus
+
+
+async def run(analyzer, poems, concurrency, max_batch):
+    """Send every poem with at most ``concurrency`` requests in flight."""
+    async with PoetryService(analyzer, max_batch=max_batch,
+                             max_pending=concurrency) as service:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def request(poem):
+            async with limit:
+                await service.analyze(poem)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(poem) for poem in poems))
+        return time.perf_counter() - start, service.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--max-batch', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    analyzer = PoetryAnalyzer()
+    poems = make_corpus(args.requests)
+    list(analyzer.analyze_many(poems[:10]))  # load the model before timing
+
+    for label, max_batch in (('unbatched', 1), ('micro-batched', args.max_batch)):
+        elapsed, stats = asyncio.run(run(analyzer, poems, args.concurrency, max_batch))
+        latency = stats['latency']['analyze']
+        print(f"{label:14s} {args.requests / elapsed:8.0f} req/sec  "
+              f"p50 {latency['p50_ms']:8.1f} ms  p99 {latency['p99_ms']:8.1f} ms  "
+              f"mean batch {stats['mean_batch_size']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
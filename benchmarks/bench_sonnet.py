@@ -0,0 +1,39 @@
+"""Sonnet generation throughput.
+
+Usage:
+    python benchmarks/bench_sonnet.py [--sonnets N] [--seed S]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sonnets', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    analyzer = PoetryAnalyzer()
+    generator = PoetryGenerator(analyzer, rng=args.seed)
+    template = generator.templates['sonnet']['rhyme_scheme']
+    generator.generate_sonnet()
+
+    start = time.perf_counter()
+    sonnets = [generator.generate_sonnet() for _ in range(args.sonnets)]
+    elapsed = time.perf_counter() - start
+
+    matching = sum(analyzer.analyze_rhyme_scheme(s) == template for s in sonnets)
+    print(f"generate_sonnet: {args.sonnets / elapsed:10.1f} sonnets/sec")
+    print(f"rhyme scheme matches template: {matching}/{args.sonnets}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Word picks/sec: list-building word_cache lookups vs WordBank offsets.
+
+"Before" rebuilds a candidate list from every syllable bucket up to the
+bound for each pick, as the original generate_line did; "after" draws one
+random index into the WordBank's cumulative offsets.
+
+Usage:
+    python benchmarks/bench_word_pick.py [--picks N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.lexicon import CATEGORIES, load_lexicon
+from core.wordbank import WordBank
+
+
+def legacy_cache(lexicon):
+    """Nested defaultdict cache in the original word_cache layout."""
+    cache = defaultdict(lambda: defaultdict(list))
+    for category in CATEGORIES:
+        for word in lexicon.category_words(category):
+            cache[category][lexicon.syllables(word)].append(word)
+    return cache
+
+
+def legacy_pick(cache, category, max_syllables):
+    possible_words = []
+    for syll in range(1, max_syllables + 1):
+        if syll in cache[category]:
+            possible_words.extend(cache[category][syll])
+    return random.choice(possible_words)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--picks', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    lexicon = load_lexicon()
+    cache = legacy_cache(lexicon)
+    bank = WordBank.from_lexicon(lexicon)
+    random.seed(0)
+    queries = [(random.choice(CATEGORIES), random.randint(1, 5))
+               for _ in range(args.picks)]
+
+    start = time.perf_counter()
+    for category, bound in queries:
+        legacy_pick(cache, category, bound)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for category, bound in queries:
+        bank.pick(category, bound)
+    after = time.perf_counter() - start
+
+    print(f"list-building picks: {args.picks / before:12.0f} picks/sec")
+    print(f"WordBank picks:      {args.picks / after:12.0f} picks/sec "
+          f"({before / after:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
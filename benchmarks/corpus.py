@@ -0,0 +1,28 @@
+"""Fixed poem corpus shared by the benchmark scripts."""
+
+SAMPLE_POEMS = [
+    """Shall I compare thee to a summer's day?
+Thou art more lovely and more temperate:
+Rough winds do shake the darling buds of May,
+And summer's lease hath all too short a date;""",
+    """Soft winds whisper dreams
+Through autumn's golden branches
+Time flows like water""",
+    """The river bends beneath a silver moon
+And sorrow drifts like mist across the stone
+I hear the thunder of a distant rune
+The meadow sleeps in shadow all alone""",
+    """Bright blossoms tremble in the morning light
+A sparrow sings of courage and of grace
+The ocean hums a lullaby of night
+And memory returns to every place""",
+    """Whispers of eternity
+echo through the silent forest
+where longing meets the crimson dawn
+and hope is soft as velvet rain""",
+]
+
+
+def make_corpus(n):
+    """Return ``n`` poems by cycling through the fixed samples."""
+    return [SAMPLE_POEMS[i % len(SAMPLE_POEMS)] for i in range(n)]
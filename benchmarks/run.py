@@ -0,0 +1,255 @@
+"""Benchmark suite for the public analyzer and generator methods.
+
+Every case runs on a fixed corpus with a fixed seed; the generator's RNG
+is reseeded before each repetition, so every repetition does identical
+work. Results are printed as a table and can be written as JSON. Given a
+baseline file, each case's fastest repetition is compared with the
+baseline's (the minimum is the statistic least disturbed by other load on
+the machine) and the run fails if any case is slower by more than the
+threshold.
+
+The reference baseline is committed as ``benchmarks/baseline.json``
+together with the machine and spaCy pipeline it was recorded with, so a
+plain run compares against it. Baselines are machine-specific: a run on a
+different machine prints a warning, and its changes are only indicative.
+A run on a different spaCy pipeline (name or components) times different
+work altogether, so its comparison is informational and never fails the
+run. When a change is meant to move the numbers, re-record the baseline
+on the reference machine with ``--update-baseline`` and commit it with
+the change.
+
+Usage:
+    python benchmarks/run.py [--repeat R] [--seed S] [--only NAME ...]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+        [--threshold 0.25] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+from core.phonetics import WORD_RE
+from corpus import make_corpus
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+
+CASES = {}
+
+
+def case(name):
+    """Register ``setup(context) -> (run, ops)`` as the benchmark ``name``."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    """Fixed corpus, seed and shared instances for every case."""
+
+    def __init__(self, seed, poems=50):
+        self.seed = seed
+        self.poems = make_corpus(poems)
+        self.words = [w for poem in self.poems for w in WORD_RE.findall(poem.lower())]
+        self.analyzer = PoetryAnalyzer()
+        self.generator = PoetryGenerator(self.analyzer, rng=seed)
+
+
+@case('count_syllables')
+def _count_syllables(ctx):
+    count = ctx.analyzer.count_syllables
+    words = ctx.words
+
+    def run():
+        for word in words:
+            count(word)
+    return run, len(words)
+
+
+def _per_poem(method):
+    def setup(ctx):
+        analyze = getattr(ctx.analyzer, method)
+        poems = ctx.poems
+
+        def run():
+            for poem in poems:
+                analyze(poem)
+        return run, len(poems)
+    return setup
+
+
+for _method in ('analyze_meter', 'analyze_sound_devices', 'analyze_rhyme_scheme',
+                'analyze_imagery', 'analyze_sentiment'):
+    case(_method)(_per_poem(_method))
+
+
+@case('analyze')
+def _analyze(ctx):
+    def run():
+        for poem in ctx.poems:
+            ctx.analyzer.analyze(poem)
+    return run, len(ctx.poems)
+
+
+@case('score_meter')
+def _score_meter(ctx):
+    def run():
+        ctx.analyzer.score_meter(ctx.poems)
+    return run, len(ctx.poems)
+
+
+def _generated(method, calls, **kwargs):
+    def setup(ctx):
+        generate = getattr(ctx.generator, method)
+
+        def run():
+            for _ in range(calls):
+                generate(**kwargs)
+        return run, calls
+    return setup
+
+
+case('generate_line')(_generated('generate_line', 200, syllables=7))
+case('generate_haiku')(_generated('generate_haiku', 50))
+case('generate_free_verse')(_generated('generate_free_verse', 20))
+case('generate_sonnet')(_generated('generate_sonnet', 10))
+
+
+@case('PoetryGenerator.__init__')
+def _generator_init(ctx):
+    def run():
+        for _ in range(10):
+            PoetryGenerator(ctx.analyzer, rng=ctx.seed)
+    return run, 10
+
+
+def run_case(ctx, name, repeat):
+    """Time one case; returns its ops per run and per-op timings in µs."""
+    run, ops = CASES[name](ctx)
+    ctx.generator.rng.seed(ctx.seed)
+    run()  # warm caches and lazy loads
+    timings = []
+    for _ in range(repeat):
+        ctx.generator.rng.seed(ctx.seed)
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / ops * 1e6)
+    return {
+        'ops': ops,
+        'median_us': statistics.median(timings),
+        'min_us': min(timings),
+        'max_us': max(timings),
+    }
+
+
+def machine_metadata(ctx):
+    """Describe the interpreter, machine and spaCy pipeline of this run."""
+    nlp = ctx.analyzer.nlp
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'spacy_pipeline': f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}",
+        'spacy_components': list(nlp.pipe_names),
+    }
+
+
+# Metadata that changes what the cases measure, not just how fast.
+PIPELINE_KEYS = ('spacy_pipeline', 'spacy_components')
+
+
+def compare(results, baseline, threshold):
+    """Return {name: relative change of the minimum} and the regressed names."""
+    changes = {}
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = result['min_us'] / base['min_us'] - 1
+        changes[name] = change
+        if change > threshold:
+            regressions.append(name)
+    return changes, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), default=None)
+    parser.add_argument('--output', default=None, help='write results as JSON')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown of a minimum vs the baseline')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write these results to the baseline file')
+    args = parser.parse_args(argv)
+
+    ctx = Context(args.seed)
+    names = args.only or list(CASES)
+    results = {name: run_case(ctx, name, args.repeat) for name in names}
+    machine = machine_metadata(ctx)
+    report = {
+        'meta': dict(machine, seed=args.seed, repeat=args.repeat),
+        'benchmarks': results,
+    }
+
+    baseline = {}
+    informational = False
+    if not args.update_baseline and Path(args.baseline).exists():
+        with open(args.baseline) as f:
+            recorded = json.load(f)
+        baseline = recorded['benchmarks']
+        differences = {key: f"{key} {recorded['meta'].get(key)!r} -> {value!r}"
+                       for key, value in machine.items()
+                       if recorded['meta'].get(key) != value}
+        informational = any(key in differences for key in PIPELINE_KEYS)
+        if informational:
+            print(f"note: baseline was recorded with a different spaCy pipeline "
+                  f"({'; '.join(differences.values())}); the comparison is "
+                  f"informational and does not fail the run")
+        elif differences:
+            print(f"warning: baseline was recorded on a different setup "
+                  f"({'; '.join(differences.values())}); changes are indicative only")
+    changes, regressions = compare(results, baseline, args.threshold)
+    report['comparison'] = {'baseline': args.baseline if baseline else None,
+                            'threshold': args.threshold,
+                            'informational': informational,
+                            'changes': changes,
+                            'regressions': regressions}
+
+    print(f"{'benchmark':28s} {'median µs/op':>14s} {'min µs/op':>12s} {'vs baseline':>12s}")
+    for name, result in results.items():
+        change = f"{changes[name]:+.1%}" if name in changes else '-'
+        flag = ''
+        if name in regressions:
+            flag = '  slower' if informational else '  REGRESSION'
+        print(f"{name:28s} {result['median_us']:14.1f} {result['min_us']:12.1f} "
+              f"{change:>12s}{flag}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    return 1 if regressions and not informational else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
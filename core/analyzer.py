@@ -1,10 +1,6 @@
 """Poetry analysis module for detecting rhythm, rhyme, and other poetic elements."""
 
-import spacy
-import pronouncing
-from textblob import TextBlob
 from collections import defaultdict
-import string
 import sys
 import os
 
@@ -13,35 +9,75 @@ _parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _parent_dir not in sys.path:
     sys.path.insert(0, _parent_dir)
 
-from vocabulary import (
-    nature_words,
-    emotion_words,
-    abstract_words,
-    sensory_words
-)
+from vocabulary import emotion_words
+
+# spaCy, TextBlob and the CMU dictionary are imported by the methods that
+# need them, so importing this module stays cheap.
+from .cache import LRUCache
+from .imagery import get_imagery_matcher
+from .instrumentation import NULL_INSTRUMENTATION
+from .models import DEFAULT_MODEL, get_nlp
+from .phonetics import WORD_RE, estimate_syllables, get_phonetic_index
+from .pipeline import DOC_ANALYSES, PoemRepresentation, check_analyses, empty_result
+
+# Bump when a change alters analysis results, so cached results are dropped.
+ANALYZER_VERSION = 3
 
 class PoetryAnalyzer:
-    def __init__(self):
-        """Initialize the poetry analyzer with required NLP tools.
+    def __init__(self, model=DEFAULT_MODEL, syllable_cache_size=4096,
+                 syllable_cache_policy='lru', result_cache=None,
+                 instrumentation=None):
+        """Initialize the poetry analyzer.
 
-        Raises:
-            OSError: If spaCy model 'en_core_web_sm' is not installed.
-                     Install it with: python -m spacy download en_core_web_sm
+        The spaCy pipeline is shared process-wide and loaded on first use.
+
+        Args:
+            model: Name of the spaCy pipeline to use.
+            syllable_cache_size: Maximum words memoized by count_syllables
+                (0 disables the cache, None makes it unbounded).
+            syllable_cache_policy: Eviction policy, 'lru' or 'fifo'.
+            result_cache: Optional AnalysisCache consulted by the rhyme,
+                imagery and sentiment analyses and by analyze_many.
+            instrumentation: Optional Instrumentation receiving stage
+                timings and counters; disabled by default.
         """
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except OSError:
-            raise OSError(
-                "spaCy model 'en_core_web_sm' not found. "
-                "Install it with: python -m spacy download en_core_web_sm"
-            )
+        self.model = model
+        self.result_cache = result_cache
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self._nlp = None
+        self.syllable_cache = LRUCache(syllable_cache_size, syllable_cache_policy)
         self.pos_to_words = defaultdict(list)
         self.rhyme_dict = defaultdict(list)
         self.syllable_patterns = []
-        
+
+    @property
+    def nlp(self):
+        """spaCy pipeline from the process-wide registry, loaded lazily.
+
+        Raises:
+            OSError: If the spaCy model is not installed.
+                     Install it with: python -m spacy download en_core_web_sm
+        """
+        if self._nlp is None:
+            self._nlp = get_nlp(self.model)
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, nlp):
+        self._nlp = nlp
+
+    @property
+    def phonetics(self):
+        """Process-wide phonetic index shared by all analyzer instances."""
+        return get_phonetic_index()
+
     def count_syllables(self, word):
         """Count syllables in a word using pronouncing dictionary.
 
+        Results, including fallback estimates for unknown words, are
+        memoized in ``self.syllable_cache``; see its ``stats()`` for hit
+        rates.
+
         Args:
             word: A single word string.
 
@@ -53,26 +89,177 @@ class PoetryAnalyzer:
         word = word.strip()
         if not word:
             return 1
-        try:
-            phones = pronouncing.phones_for_word(word)
-            if phones:
-                return len(pronouncing.stresses(phones[0]))
-            
-            # Fallback syllable counting
-            count = 0
-            vowels = 'aeiouy'
-            word = word.lower().strip('.,!?')
-            if word[0] in vowels:
-                count += 1
-            for index in range(1, len(word)):
-                if word[index] in vowels and word[index-1] not in vowels:
-                    count += 1
-            if word.endswith('e'):
-                count -= 1
-            return max(1, count)
-        except (IndexError, KeyError, ValueError):
-            return 1
-    
+        key = word.lower()
+        syllables = self.syllable_cache.get(key)
+        if syllables is None:
+            syllables = self.phonetics.syllables(key)
+            if syllables is None:
+                self.instrumentation.count('syllable_estimates')
+                syllables = estimate_syllables(key)
+            syllables = max(1, syllables)
+            self.syllable_cache.put(key, syllables)
+        return syllables
+
+    def count_line_syllables(self, line):
+        """Count syllables word by word in a line of text.
+
+        The text is tokenized once and each word is resolved through the
+        syllable cache, so multi-word phrases are never looked up whole.
+
+        Args:
+            line: A phrase, line or other text.
+
+        Returns:
+            dict: 'words' (lowercased tokens), 'syllables' (per-word
+            counts) and 'total'. Empty/invalid input gives a total of 0.
+        """
+        if not line or not isinstance(line, str):
+            return {'words': [], 'syllables': [], 'total': 0}
+        words = WORD_RE.findall(line.lower())
+        counts = [self.count_syllables(word) for word in words]
+        return {'words': words, 'syllables': counts, 'total': sum(counts)}
+
+    def corpus_features(self, lines):
+        """Syllable and stress features for many lines at once, via NumPy.
+
+        Gives the same per-word counts as count_syllables without a Python
+        call per word; use it for corpus-scale statistics.
+
+        Args:
+            lines: Iterable of line strings (a string is split into lines).
+
+        Returns:
+            CorpusFeatures: Line offsets plus flat token, syllable and
+            stress arrays; see core.features.
+        """
+        from .features import get_feature_extractor
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        return get_feature_extractor().extract(lines)
+
+    def analyze(self, poem, features=None):
+        """Run several analyses over one shared representation of a poem.
+
+        The poem is split into lines once; tokens, rhyme keys, syllable
+        features and the spaCy parse are computed only if a requested
+        analysis needs them, and shared by every analysis that does (see
+        ``core.pipeline``). Results come from the result cache when set.
+
+        Args:
+            poem: Multi-line poem string.
+            features: Analysis names from ``core.pipeline.ANALYSES``
+                ('rhyme_scheme', 'meter', 'sound_devices', 'imagery',
+                'sentiment', 'structure'); None runs them all.
+
+        Returns:
+            dict: One result per requested analysis, shaped like the
+            corresponding ``analyze_*`` method; 'structure' holds 'lines',
+            'words' and 'syllables_per_line'.
+
+        Raises:
+            ValueError: If an analysis name is unknown.
+        """
+        features = check_analyses(features)
+        if not poem or not isinstance(poem, str) or not poem.strip():
+            return {analysis: empty_result(analysis) for analysis in features}
+        hits = self._cache_hits(poem, features)
+        return self._run_stages(self._represent(poem), features, hits)
+
+    def get_complete_analysis(self, poem):
+        """Run every analysis, grouped as the original complete analysis.
+
+        Returns:
+            dict: 'sound_devices' (rhyme scheme, alliteration, assonance,
+            consonance, density and per-line 'meter_patterns' stresses),
+            'imagery', 'sentiment', 'meter' and 'structure'.
+        """
+        results = self.analyze(poem)
+        return {
+            'sound_devices': {
+                'rhyme_scheme': results['rhyme_scheme'],
+                **results['sound_devices'],
+                'meter_patterns': [line['stresses'] for line in results['meter']],
+            },
+            'imagery': results['imagery'],
+            'sentiment': results['sentiment'],
+            'meter': results['meter'],
+            'structure': results['structure'],
+        }
+
+    def analyze_meter(self, poem):
+        """Classify the meter of each line of a poem.
+
+        Stresses come from the CMU dictionary through the feature
+        extractor; lines are matched against every foot in
+        ``core.meter.METERS`` at once.
+
+        Args:
+            poem: Multi-line poem string.
+
+        Returns:
+            list: One dict per non-empty line with 'line', 'stresses'
+            (0, 1, 2, or -1 for estimated syllables), 'meter' (e.g.
+            'iambic pentameter', None for lines without words) and
+            'deviation' (0 for a perfect fit, up to 1). Empty list for
+            empty/invalid input.
+        """
+        return self.analyze(poem, ('meter',))['meter']
+
+    def score_meter(self, poems, meter='iambic', feet=5):
+        """Score the metrical quality of many poems in one vectorized pass.
+
+        Args:
+            poems: Iterable of poem strings.
+            meter: Foot to score against (see ``core.meter.METERS``), or
+                None to score each line against its best-fitting meter.
+            feet: Target feet per line when ``meter`` is given.
+
+        Returns:
+            list: Mean line deviation per poem, from 0 (every line fits)
+            to 1; 1.0 for poems without lines.
+
+        Raises:
+            ValueError: If ``meter`` is unknown or ``feet`` is not positive.
+        """
+        import numpy as np
+        from .meter import classify_meter, score_meter
+        lines = []
+        counts = []
+        for poem in poems:
+            poem_lines = [line for line in (poem or '').split('\n') if line.strip()]
+            lines.extend(poem_lines)
+            counts.append(len(poem_lines))
+        with self.instrumentation.timer('meter'):
+            features = self.corpus_features(lines)
+            if meter is None:
+                deviation = classify_meter(features).deviation
+            else:
+                deviation = score_meter(features, meter, feet)
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            totals = np.concatenate([[0.0], np.cumsum(deviation)])
+            sums = totals[offsets[1:]] - totals[offsets[:-1]]
+            counts = np.asarray(counts, dtype=np.float64)
+            scores = np.where(counts > 0, sums / np.maximum(counts, 1), 1.0)
+        return scores.tolist()
+
+    def analyze_sound_devices(self, poem):
+        """Find alliteration, assonance and consonance from word phonemes.
+
+        One linear pass over the poem's words (see ``core.sounds``), cheap
+        enough to filter every generated poem on its 'density'.
+
+        Args:
+            poem: Multi-line poem string.
+
+        Returns:
+            dict: 'alliteration', 'assonance' and 'consonance' lists of
+            groups with 'sound', 'words', 'start' and 'end' word positions,
+            plus 'density', the share of words in any group. Empty groups
+            and a density of 0.0 for empty/invalid input.
+        """
+        return self.analyze(poem, ('sound_devices',))['sound_devices']
+
     def analyze_rhyme_scheme(self, poem):
         """Detect the rhyme scheme of a poem.
 
@@ -82,86 +269,187 @@ class PoetryAnalyzer:
         Returns:
             str: Rhyme scheme letters (e.g. 'ABAB'), empty string if poem is empty.
         """
-        if not poem or not isinstance(poem, str) or not poem.strip():
-            return ''
-        def clean_word(word):
-            return word.lower().strip(string.punctuation)
-        
-        lines = [line.strip() for line in poem.split('\n') if line.strip()]
-        rhyme_scheme = []
-        rhyme_mapping = {}
-        current_rhyme = 0
-        
-        for line in lines:
-            words = line.split()
-            if not words:
-                continue
-            
-            last_word = clean_word(words[-1])
-            rhymes = pronouncing.rhymes(last_word)
-            rhyme_key = tuple(rhymes[:3]) if rhymes else last_word
-            
-            if rhyme_key not in rhyme_mapping:
-                rhyme_mapping[rhyme_key] = chr(65 + current_rhyme)
-                current_rhyme += 1
-            
-            rhyme_scheme.append(rhyme_mapping[rhyme_key])
-        
-        return ''.join(rhyme_scheme)
-    
+        return self.analyze(poem, ('rhyme_scheme',))['rhyme_scheme']
+
     def analyze_imagery(self, poem):
         """Analyze types of imagery used in the poem.
 
+        Maps each imagery category present to the vocabulary entries found,
+        in order; see ``core.imagery``.
         Returns empty dict for empty/invalid input.
         """
-        if not poem or not isinstance(poem, str) or not poem.strip():
-            return {}
-        imagery = defaultdict(list)
-        doc = self.nlp(poem.lower())
-        
-        # Get all words from our vocabulary modules
-        nature_vocab = set(nature_words.get_all_nature_words())
-        emotion_vocab = set(emotion_words.get_all_emotion_words())
-        abstract_vocab = set(abstract_words.get_all_abstract_words())
-        sensory_vocab = set(sensory_words.get_all_sensory_words())
-        
-        for token in doc:
-            word = token.text.lower()
-            
-            if word in nature_vocab:
-                imagery['nature'].append(word)
-            if word in emotion_vocab:
-                imagery['emotional'].append(word)
-            if word in abstract_vocab:
-                imagery['abstract'].append(word)
-            if word in sensory_vocab:
-                imagery['sensory'].append(word)
-        
-        return dict(imagery)
-    
+        return self.analyze(poem, ('imagery',))['imagery']
+
     def analyze_sentiment(self, poem):
         """Analyze the emotional tone of the poem.
 
+        ``emotion_count`` maps each EMOTIONS category (joy, fear, courage,
+        ...) to the number of its words found in the poem.
         Returns neutral sentiment for empty/invalid input.
         """
-        if not poem or not isinstance(poem, str) or not poem.strip():
-            return {'polarity': 0.0, 'subjectivity': 0.0, 'emotion_count': {}}
-        blob = TextBlob(poem)
-        sentiment = {
-            'polarity': blob.sentiment.polarity,
-            'subjectivity': blob.sentiment.subjectivity
+        return self.analyze(poem, ('sentiment',))['sentiment']
+
+    def _parse(self, poem):
+        with self.instrumentation.timer('spacy_parse'):
+            return self.nlp(poem.lower())
+
+    def _represent(self, poem, doc=None):
+        """Wrap a poem in the representation shared by the stages."""
+        return PoemRepresentation(poem, parse=self._parse,
+                                  phonetics=self.phonetics,
+                                  extract=self.corpus_features, doc=doc)
+
+    def _cache_hits(self, poem, features):
+        """Return {analysis: cached result} for the cached ``features``."""
+        cache = self.result_cache
+        if cache is None:
+            return {}
+        hits = {}
+        for analysis in features:
+            result = cache.get(analysis, poem, self.model)
+            if result is not None:
+                hits[analysis] = result
+        return hits
+
+    def _run_stages(self, representation, features, hits):
+        """Compute the analyses missing from ``hits`` and cache them."""
+        cache = self.result_cache
+        results = {}
+        for analysis in features:
+            result = hits.get(analysis)
+            if result is None:
+                result = getattr(self, f'_stage_{analysis}')(representation)
+                if cache is not None:
+                    cache.put(analysis, representation.poem, result, self.model)
+            results[analysis] = result
+        return results
+
+    def _stage_rhyme_scheme(self, representation):
+        rhyme_scheme = []
+        rhyme_mapping = {}
+        with self.instrumentation.timer('rhyme_lookup'):
+            for rhyme_key in representation.rhyme_keys:
+                if rhyme_key not in rhyme_mapping:
+                    rhyme_mapping[rhyme_key] = chr(65 + len(rhyme_mapping))
+                rhyme_scheme.append(rhyme_mapping[rhyme_key])
+        return ''.join(rhyme_scheme)
+
+    def _stage_meter(self, representation):
+        from .meter import classify_meter
+        lines = representation.lines
+        with self.instrumentation.timer('meter'):
+            features = representation.corpus_features
+            meters = classify_meter(features)
+        return [{'line': line,
+                 'stresses': features.line_stresses(i).tolist(),
+                 'meter': meters.label(i),
+                 'deviation': float(meters.deviation[i])}
+                for i, line in enumerate(lines)]
+
+    def _stage_sound_devices(self, representation):
+        from .sounds import get_sound_scanner
+        with self.instrumentation.timer('sound_devices'):
+            return get_sound_scanner().scan_lines(representation.line_words)
+
+    def _stage_imagery(self, representation):
+        return self._imagery_from_doc(representation.doc)
+
+    def _stage_sentiment(self, representation):
+        return self._sentiment_from_doc(representation.poem, representation.doc)
+
+    def _stage_structure(self, representation):
+        return {
+            'lines': len(representation.lines),
+            'words': sum(map(len, representation.line_words)),
+            'syllables_per_line':
+                representation.corpus_features.line_syllables.tolist(),
         }
-        
-        # Count emotion words
+
+    def analyze_many(self, poems, batch_size=64, n_process=1,
+                     features=('rhyme_scheme', 'imagery', 'sentiment')):
+        """Analyze a stream of poems, parsing each one with spaCy only once.
+
+        Poems are streamed through ``nlp.pipe`` and each resulting ``Doc``
+        is shared by the stages of ``analyze``. Poems whose requested
+        analyses need no parse, or whose parsed analyses are all cached,
+        skip parsing entirely.
+
+        Args:
+            poems: Iterable of poem strings.
+            batch_size: Number of poems spaCy processes per batch.
+            n_process: Number of spaCy worker processes.
+            features: Analysis names, as for ``analyze``; None runs all.
+
+        Yields:
+            dict: Per-poem results keyed by analysis (by default
+            'rhyme_scheme', 'imagery' and 'sentiment'), in input order.
+
+        Raises:
+            ValueError: If an analysis name is unknown.
+        """
+        features = check_analyses(features)
+
+        def texts():
+            for poem in poems:
+                valid = bool(poem and isinstance(poem, str) and poem.strip())
+                if not valid:
+                    yield '', (None, None)
+                    continue
+                hits = self._cache_hits(poem, features)
+                needs_doc = any(analysis in DOC_ANALYSES and analysis not in hits
+                                for analysis in features)
+                yield (poem.lower() if needs_doc else ''), (poem, hits)
+
+        docs = iter(self.nlp.pipe(texts(), as_tuples=True,
+                                  batch_size=batch_size, n_process=n_process))
+        timer = self.instrumentation.timer
+        while True:
+            # Parsing happens lazily inside the pipe, so time each step.
+            with timer('spacy_parse'):
+                item = next(docs, None)
+            if item is None:
+                break
+            doc, (poem, hits) = item
+            if poem is None:
+                yield {analysis: empty_result(analysis) for analysis in features}
+                continue
+            yield self._run_stages(self._represent(poem, doc), features, hits)
+
+    def _sentiment_from_doc(self, poem, doc):
+        """Polarity, subjectivity and emotion counts for a parsed poem."""
+        sentiment = self._polarity(poem)
+        sentiment['emotion_count'] = self._emotion_counts_from_doc(doc)
+        return sentiment
+
+    def _polarity(self, poem):
+        """Return TextBlob polarity and subjectivity for a poem."""
+        from textblob import TextBlob
+        with self.instrumentation.timer('sentiment'):
+            sentiment = TextBlob(poem).sentiment
+            return {
+                'polarity': sentiment.polarity,
+                'subjectivity': sentiment.subjectivity
+            }
+
+    def _imagery_from_doc(self, doc):
+        """Collect vocabulary imagery from an already parsed ``Doc``.
+
+        Tokens are matched by text, falling back to their lemma, against
+        the shared imagery trie, so multi-word entries are found too.
+        """
+        with self.instrumentation.timer('vocab_match'):
+            tokens = [token.text.lower() for token in doc]
+            lemmas = [token.lemma_.lower() for token in doc]
+            return get_imagery_matcher().categorize(tokens, lemmas)
+
+    def _emotion_counts_from_doc(self, doc):
+        """Count emotion vocabulary per EMOTIONS category in a parsed ``Doc``."""
+        lookup = emotion_words.get_emotion_lookup()
         emotion_counts = defaultdict(int)
-        doc = self.nlp(poem.lower())
-        
-        for token in doc:
-            word = token.text.lower()
-            # Check against emotion vocabulary
-            for emotion_word in emotion_words.get_all_emotion_words():
-                if word == emotion_word:
-                    emotion_counts['emotional'] += 1
-        
-        sentiment['emotion_count'] = dict(emotion_counts)
-        return sentiment
\ No newline at end of file
+
+        with self.instrumentation.timer('vocab_match'):
+            for token in doc:
+                for emotion in lookup.get(token.text.lower(), ()):
+                    emotion_counts[emotion] += 1
+
+        return dict(emotion_counts)
@@ -0,0 +1,110 @@
+"""Bulk poem generation across a process pool with reproducible seeding.
+
+Every poem gets its own seed derived from the batch seed and the poem's
+index, so a batch is identical whatever the number of workers or how the
+work is chunked. Workers rebuild the calling generator from its analyzer's
+spaCy pipeline name and its language model's directory, which they
+memory-map, so they share the model's pages instead of pickling it.
+"""
+
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+FORMS = {
+    'haiku': 'generate_haiku',
+    'free_verse': 'generate_free_verse',
+    'sonnet': 'generate_sonnet',
+}
+
+_worker_generator = None
+
+
+def poem_seed(seed, index):
+    """Return the seed for poem ``index`` of a batch seeded with ``seed``."""
+    return f'{seed}:{index}'
+
+
+def _new_generator(analyzer_model=None, model_path=None):
+    from .analyzer import PoetryAnalyzer
+    from .generator import PoetryGenerator
+    from .markov import MarkovModel
+    analyzer = PoetryAnalyzer(analyzer_model) if analyzer_model else PoetryAnalyzer()
+    language_model = MarkovModel.load(model_path) if model_path else None
+    return PoetryGenerator(analyzer, language_model=language_model)
+
+
+def _warm_up(generator):
+    """Load the lexicon and fill the composer's counting tables."""
+    for method in FORMS.values():
+        getattr(generator, method)(rng=random.Random(0))
+
+
+def _init_worker(analyzer_model=None, model_path=None):
+    global _worker_generator
+    _worker_generator = _new_generator(analyzer_model, model_path)
+    _warm_up(_worker_generator)
+
+
+def _generate(generator, form, mood, seed, indices):
+    """Generate the poems at ``indices``, each with its own derived RNG."""
+    method = getattr(generator, FORMS[form])
+    return [method(mood=mood, rng=random.Random(poem_seed(seed, index)))
+            for index in indices]
+
+
+def _generate_chunk(args):
+    return _generate(_worker_generator, *args)
+
+
+def generate_batch(form, n, mood=None, seed=None, workers=None,
+                   generator=None, chunksize=None):
+    """Generate ``n`` poems of one form, optionally across processes.
+
+    Args:
+        form: 'haiku', 'free_verse' or 'sonnet'.
+        n: Number of poems.
+        mood: Optional mood passed to every poem.
+        seed: Batch seed; the same seed always yields the same poems. A
+            random seed is drawn when None.
+        workers: Number of worker processes (default: CPU count). With 1
+            the batch runs in this process.
+        generator: Generator used when running in-process; a new one is
+            created if omitted. Workers build their own with the same
+            spaCy pipeline and language model, memory-mapped from the
+            directory it was loaded from (a model trained in this
+            process is saved to a temporary one for the batch).
+        chunksize: Poems per task sent to a worker.
+
+    Returns:
+        list: The poems, in index order.
+
+    Raises:
+        ValueError: If the form is unknown or n is negative.
+    """
+    if form not in FORMS:
+        raise ValueError(f"form must be one of {sorted(FORMS)}, got {form!r}")
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or n <= 1:
+        return _generate(generator or _new_generator(), form, mood, seed, range(n))
+
+    chunksize = chunksize or max(1, -(-n // (workers * 4)))
+    tasks = [(form, mood, seed, range(start, min(start + chunksize, n)))
+             for start in range(0, n, chunksize)]
+    analyzer_model = generator.analyzer.model if generator else None
+    language_model = generator.language_model if generator else None
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = None
+        if language_model is not None:
+            model_path = language_model.path or language_model.save(
+                os.path.join(tmp, 'model'))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(analyzer_model, model_path)) as pool:
+            return [poem for chunk in pool.map(_generate_chunk, tasks)
+                    for poem in chunk]
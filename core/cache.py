@@ -0,0 +1,252 @@
+"""Bounded, thread-safe caches with hit/miss/eviction statistics.
+
+``LRUCache`` is a general in-memory cache; ``AnalysisCache`` layers
+poem-content keys and an optional SQLite tier on top of it for analysis
+results.
+"""
+
+import threading
+from collections import OrderedDict
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Size-bounded mapping that evicts by recency ('lru') or age ('fifo').
+
+    All operations take an internal lock, so one cache can be shared by
+    threads. Counters record hits, misses and evictions for sizing.
+    """
+
+    def __init__(self, maxsize=4096, policy='lru'):
+        """Create a cache.
+
+        Args:
+            maxsize: Maximum number of entries; 0 disables caching and None
+                leaves the cache unbounded.
+            policy: 'lru' evicts the least recently used entry, 'fifo' the
+                oldest inserted one.
+
+        Raises:
+            ValueError: If policy or maxsize is invalid.
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {EVICTION_POLICIES}, got {policy!r}")
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be >= 0 or None")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key``, counting a hit or a miss."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            if self.policy == 'lru':
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting entries beyond maxsize."""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return
+            self._data[key] = value
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove and return the entry for ``key`` if present."""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Drop every entry; statistics are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        """Zero the hit, miss and eviction counters."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hits, misses, evictions, size, maxsize and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def normalize_poem(poem):
+    """Canonical text of a poem for cache keys.
+
+    The stripped, non-empty lines the analysis stages see. Text inside a
+    line is kept as is, since results such as meter echo each line.
+    """
+    lines = (line.strip() for line in poem.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class AnalysisCache:
+    """Cache of analysis results keyed by poem content and analyzer version.
+
+    Keys hash the normalized poem text together with the analysis name,
+    the spaCy model, ``ANALYZER_VERSION`` and the vocabulary digest, so a
+    result is only reused by the analysis that produced it. Results are
+    stored as JSON and decoded on every hit, so callers may mutate them.
+
+    An in-memory ``LRUCache`` is checked first; with ``path`` set, a SQLite
+    file backs it and survives restarts. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, maxsize=1024, policy='lru', path=None):
+        """Create a cache.
+
+        Args:
+            maxsize: Entries held in memory (see LRUCache).
+            policy: Memory eviction policy, 'lru' or 'fifo'.
+            path: Optional SQLite database file for the on-disk tier.
+        """
+        self.memory = LRUCache(maxsize, policy)
+        self.path = path
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.version = self._current_version()
+        if path is not None:
+            import sqlite3
+            self._db = sqlite3.connect(path, check_same_thread=False,
+                                       isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS results ('
+                             'key TEXT PRIMARY KEY, version TEXT, value TEXT)')
+            self._purge_stale()
+
+    @staticmethod
+    def _current_version():
+        from .analyzer import ANALYZER_VERSION
+        from .lexicon import vocabulary_digest
+        return f'{ANALYZER_VERSION}:{vocabulary_digest()}'
+
+    def key(self, analysis, poem, model=''):
+        """Return the cache key of one analysis of ``poem``."""
+        import hashlib
+        payload = '\0'.join((self.version, model, analysis, normalize_poem(poem)))
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def get(self, analysis, poem, model='', default=None):
+        """Return a cached result, or ``default`` on a miss in every tier."""
+        import json
+        key = self.key(analysis, poem, model)
+        value = self.memory.get(key)
+        if value is None and self._db is not None:
+            with self._db_lock:
+                row = self._db.execute('SELECT value FROM results WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is None:
+                    self.disk_misses += 1
+                else:
+                    self.disk_hits += 1
+            if row is not None:
+                value = row[0]
+                self.memory.put(key, value)
+        return default if value is None else json.loads(value)
+
+    def put(self, analysis, poem, value, model=''):
+        """Store a result in memory and, if configured, on disk."""
+        import json
+        key = self.key(analysis, poem, model)
+        encoded = json.dumps(value)
+        self.memory.put(key, encoded)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                 (key, self.version, encoded))
+
+    def _purge_stale(self):
+        with self._db_lock:
+            return self._db.execute('DELETE FROM results WHERE version != ?',
+                                    (self.version,)).rowcount
+
+    def invalidate(self):
+        """Re-read the analyzer and vocabulary version and drop stale results.
+
+        Call after the vocabulary changes in a running process. The memory
+        tier is cleared; disk entries from other versions are deleted. The
+        process-wide emotion lookup and imagery matcher are dropped too, so
+        fresh analyses see the new vocabulary.
+
+        Returns:
+            int: Number of disk entries removed.
+        """
+        from .imagery import reset_imagery_matcher
+        from vocabulary import emotion_words
+        emotion_words.get_emotion_lookup.cache_clear()
+        reset_imagery_matcher()
+        self.version = self._current_version()
+        self.memory.clear()
+        return self._purge_stale() if self._db is not None else 0
+
+    def clear(self):
+        """Drop every cached result from both tiers."""
+        self.memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM results')
+
+    def stats(self):
+        """Return memory-tier stats plus disk-tier and overall hit counts."""
+        memory = self.memory.stats()
+        hits = memory['hits'] + self.disk_hits
+        lookups = memory['hits'] + memory['misses']
+        stats = {
+            'memory': memory,
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+        if self._db is not None:
+            with self._db_lock:
+                size = self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+            stats['disk'] = {'hits': self.disk_hits, 'misses': self.disk_misses,
+                             'size': size, 'path': self.path}
+        return stats
+
+    def close(self):
+        """Close the on-disk tier."""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
@@ -0,0 +1,177 @@
+"""Exact-fit syllable composition over syllable-bucketed word pools.
+
+A pool is a tuple of categories from a ``word_cache``-style mapping
+(category -> syllables -> words), held as a ``WordBank``. Counting tables
+record how many word sequences from a pool reach each syllable total,
+which lets the composer draw a sequence uniformly from all sequences
+summing exactly to a target in a single pass, with no rejection or retry
+loop.
+"""
+
+import random
+from collections import defaultdict
+
+from .wordbank import WordBank
+
+
+class SyllableComposer:
+    """Samples word sequences whose syllables sum exactly to a target.
+
+    A line is described by an optional *prefix* pool, from which any
+    number of words may be drawn, followed by fixed *slots*, each filled by
+    exactly one word from its own pool. Every distinct word sequence that
+    fits is equally likely.
+    """
+
+    def __init__(self, word_cache):
+        """Create a composer over ``word_cache[category][syllables] -> words``."""
+        if not isinstance(word_cache, WordBank):
+            word_cache = WordBank(word_cache)
+        self.word_cache = word_cache
+        self._bucket_sizes = {}
+        self._free_counts = {}
+        self._slot_counts = {}
+
+    def bucket_sizes(self, pool):
+        """Return {syllables: number of words} for a pool of categories."""
+        sizes = self._bucket_sizes.get(pool)
+        if sizes is None:
+            totals = defaultdict(int)
+            for category in pool:
+                words = self.word_cache.get(category)
+                for syllables in (words or ()):
+                    totals[syllables] += words.count(syllables)
+            sizes = dict(sorted(totals.items()))
+            self._bucket_sizes[pool] = sizes
+        return sizes
+
+    def free_count(self, pool, total):
+        """Number of word sequences of any length from ``pool`` summing to ``total``."""
+        if total < 0:
+            return 0
+        table = self._free_counts.get(pool)
+        if table is None:
+            table = [1]
+        if len(table) <= total:
+            table = list(table)
+            sizes = self.bucket_sizes(pool)
+            while len(table) <= total:
+                t = len(table)
+                table.append(sum(n * table[t - s] for s, n in sizes.items() if s <= t))
+            self._free_counts[pool] = table
+        return table[total]
+
+    def slot_count(self, slots, total):
+        """Number of ways to fill one word per pool in ``slots`` summing to ``total``."""
+        if not slots:
+            return 1 if total == 0 else 0
+        if total < len(slots):
+            return 0
+        key = (slots, total)
+        count = self._slot_counts.get(key)
+        if count is None:
+            head, rest = slots[0], slots[1:]
+            count = sum(n * self.slot_count(rest, total - s)
+                        for s, n in self.bucket_sizes(head).items() if s <= total)
+            self._slot_counts[key] = count
+        return count
+
+    def count(self, total, slots=(), prefix=None):
+        """Number of lines of ``total`` syllables: a free prefix, then the slots."""
+        if prefix is None:
+            return self.slot_count(slots, total)
+        return sum(self.free_count(prefix, a) * self.slot_count(slots, total - a)
+                   for a in range(total + 1))
+
+    def sample(self, total, slots=(), prefix=None, rng=random):
+        """Draw a line uniformly from all that fit ``total`` exactly.
+
+        Args:
+            total: Target syllable count.
+            slots: Tuple of pools, one word drawn from each, in order.
+            prefix: Optional pool for a leading run of any number of words.
+            rng: Source of randomness with a ``randrange`` method.
+
+        Returns:
+            tuple: (prefix_words, slot_words), or None if nothing fits.
+        """
+        result = self.sample_forms(total, [(0, slots)], prefix, rng)
+        return result[1:] if result else None
+
+    def sample_forms(self, total, forms, prefix=None, rng=random):
+        """Draw uniformly across several line forms sharing one budget.
+
+        Args:
+            total: Target syllable count.
+            forms: Sequence of (fixed_syllables, slots); fixed syllables are
+                spent by words the caller supplies, such as template text.
+            prefix: Optional pool for a leading run of any number of words.
+            rng: Source of randomness with a ``randrange`` method.
+
+        Returns:
+            tuple: (form_index, prefix_words, slot_words), or None if no
+            form fits.
+        """
+        weights = [self.count(total - fixed, tuple(slots), prefix)
+                   if total >= fixed else 0
+                   for fixed, slots in forms]
+        count = sum(weights)
+        if not count:
+            return None
+        pick = rng.randrange(count)
+        for index, weight in enumerate(weights):
+            if pick < weight:
+                break
+            pick -= weight
+
+        fixed, slots = forms[index]
+        slots = tuple(slots)
+        budget = total - fixed
+        prefix_total = 0
+        if prefix is not None:
+            for a in range(budget + 1):
+                ways = self.free_count(prefix, a) * self.slot_count(slots, budget - a)
+                if pick < ways:
+                    prefix_total = a
+                    break
+                pick -= ways
+        prefix_words = self._sample_free(prefix, prefix_total, rng) if prefix else []
+        slot_words = self._sample_slots(slots, budget - prefix_total, rng)
+        return index, prefix_words, slot_words
+
+    def _sample_free(self, pool, total, rng):
+        words = []
+        while total > 0:
+            pick = rng.randrange(self.free_count(pool, total))
+            for syllables, n in self.bucket_sizes(pool).items():
+                rest = self.free_count(pool, total - syllables)
+                if pick < n * rest:
+                    words.append(self._word(pool, syllables, pick // rest))
+                    total -= syllables
+                    break
+                pick -= n * rest
+        return words
+
+    def _sample_slots(self, slots, total, rng):
+        words = []
+        for i, pool in enumerate(slots):
+            rest_slots = slots[i + 1:]
+            pick = rng.randrange(self.slot_count(slots[i:], total))
+            for syllables, n in self.bucket_sizes(pool).items():
+                rest = self.slot_count(rest_slots, total - syllables)
+                if pick < n * rest:
+                    words.append(self._word(pool, syllables, pick // rest))
+                    total -= syllables
+                    break
+                pick -= n * rest
+        return words
+
+    def _word(self, pool, syllables, index):
+        """Return the ``index``-th word with ``syllables`` syllables in a pool."""
+        for category in pool:
+            words = self.word_cache.get(category)
+            size = words.count(syllables) if words is not None else 0
+            if index < size:
+                return words.word_at(syllables, index)
+            index -= size
+        raise IndexError(index)
@@ -0,0 +1,196 @@
+"""Vectorized syllable and stress features for whole corpora.
+
+Lines are tokenized once and every token is mapped to an integer id in a
+feature vocabulary built from the phonetic index. Syllable counts, stress
+patterns and per-line totals are then gathered with NumPy in bulk, and
+returned as a columnar ``CorpusFeatures``: line offsets into flat token
+arrays, and token offsets into one flat stress array.
+
+Counts agree with ``PoetryAnalyzer.count_syllables``: dictionary words use
+their first CMU pronunciation, unknown words the vowel-group estimate, and
+every token has at least one syllable. Stresses of estimated syllables are
+recorded as ``UNKNOWN_STRESS``.
+"""
+
+import re
+import threading
+from collections import ChainMap
+
+import numpy as np
+
+from .phonetics import WORD_RE, estimate_syllables, get_phonetic_index
+
+UNKNOWN_STRESS = -1
+
+# Words, plus line breaks so one pass tokenizes a whole corpus.
+_TOKEN_RE = re.compile(WORD_RE.pattern + r'|\n')
+_LINE_BREAK = -1
+
+
+class CorpusFeatures:
+    """Columnar syllable and stress features for a sequence of lines.
+
+    Attributes:
+        line_offsets: int64, ``n_lines + 1``; tokens of line ``i`` are
+            ``token_ids[line_offsets[i]:line_offsets[i + 1]]``.
+        token_ids: int32 feature-vocabulary id per token.
+        syllables: uint8 syllable count per token.
+        stress_offsets: int64, ``n_tokens + 1``; stresses of token ``j``
+            are ``stresses[stress_offsets[j]:stress_offsets[j + 1]]``.
+        stresses: int8 stress per syllable (0, 1, 2 or UNKNOWN_STRESS).
+        line_syllables: int32 syllable total per line.
+        vocabulary: Sequence mapping token ids back to words; the
+            extractor's own frozen list.
+        unknown: Sorted words of this extraction outside ``vocabulary``;
+            their ids follow on from ``len(vocabulary)``.
+    """
+
+    def __init__(self, line_offsets, token_ids, syllables, stress_offsets,
+                 stresses, line_syllables, vocabulary, unknown=()):
+        self.line_offsets = line_offsets
+        self.token_ids = token_ids
+        self.syllables = syllables
+        self.stress_offsets = stress_offsets
+        self.stresses = stresses
+        self.line_syllables = line_syllables
+        self.vocabulary = vocabulary
+        self.unknown = unknown
+
+    def __len__(self):
+        return len(self.line_offsets) - 1
+
+    @property
+    def line_stress_offsets(self):
+        """int64, ``n_lines + 1``: offsets of each line's stresses."""
+        return self.stress_offsets[self.line_offsets]
+
+    def words(self, line):
+        """Return the tokens of line ``line``."""
+        start, stop = self.line_offsets[line], self.line_offsets[line + 1]
+        size = len(self.vocabulary)
+        return [self.vocabulary[i] if i < size else self.unknown[i - size]
+                for i in self.token_ids[start:stop].tolist()]
+
+    def line_stresses(self, line):
+        """Return the int8 stress pattern of line ``line``."""
+        offsets = self.line_stress_offsets
+        return self.stresses[offsets[line]:offsets[line + 1]]
+
+
+class CorpusFeatureExtractor:
+    """Maps token streams to feature ids and gathers features with NumPy.
+
+    The vocabulary is every word of the phonetic index and never changes,
+    so extraction is thread-safe without locks. Words outside it get ids
+    past the vocabulary's that are local to one extraction, with estimated
+    syllables and unknown stresses; nothing about them outlives the call.
+    """
+
+    def __init__(self, phonetics=None):
+        """Build the feature vocabulary.
+
+        Args:
+            phonetics: Optional PhoneticIndex; defaults to the shared index.
+        """
+        if phonetics is None:
+            phonetics = get_phonetic_index()
+        words = list(phonetics)
+        patterns = [phonetics.stresses(word) or '?' for word in words]
+        self._ids = {word: i for i, word in enumerate(words)}
+        self._ids['\n'] = _LINE_BREAK
+        self._words = words
+        self._set_arrays(patterns)
+
+    def _set_arrays(self, patterns):
+        lengths = np.fromiter(map(len, patterns), dtype=np.int64, count=len(patterns))
+        offsets = np.zeros(len(patterns) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        stresses = np.frombuffer(''.join(patterns).encode('ascii'), dtype=np.uint8)
+        stresses = stresses.astype(np.int8) - ord('0')
+        stresses[stresses < 0] = UNKNOWN_STRESS
+        self._syllables = lengths.astype(np.uint8)
+        self._stress_offsets = offsets
+        self._stresses = stresses
+
+    def __len__(self):
+        return len(self._words)
+
+    def token_ids(self, lines):
+        """Tokenize lines and map every token to a feature id.
+
+        The corpus is tokenized in one regex pass over the joined text;
+        line breaks come back as tokens and become the line offsets.
+
+        Returns:
+            tuple: (line_offsets, token_ids, unknown): int64 and int32
+            arrays, and the sorted words outside the vocabulary, whose ids
+            start at ``len(self)``.
+        """
+        lines = list(lines)
+        text = '\n'.join(lines)
+        if text.count('\n') != max(len(lines) - 1, 0):
+            text = '\n'.join(line.replace('\n', ' ') for line in lines)
+        tokens = _TOKEN_RE.findall(text.lower())
+        ids = self._ids
+        unknown = tuple(sorted(set(tokens).difference(ids)))
+        if unknown:
+            local = dict(zip(unknown, range(len(self._words),
+                                            len(self._words) + len(unknown))))
+            ids = ChainMap(local, ids)
+        raw = np.fromiter(map(ids.__getitem__, tokens), dtype=np.int32,
+                          count=len(tokens))
+        breaks = np.flatnonzero(raw == _LINE_BREAK)
+        line_offsets = np.zeros(len(breaks) + 2 if lines else 1, dtype=np.int64)
+        if lines:
+            # Words before break k: its position minus the k earlier breaks.
+            line_offsets[1:-1] = breaks - np.arange(len(breaks))
+            line_offsets[-1] = len(raw) - len(breaks)
+        return line_offsets, raw[raw != _LINE_BREAK], unknown
+
+    def extract(self, lines):
+        """Compute syllable and stress features for every line.
+
+        Args:
+            lines: Iterable of line strings.
+
+        Returns:
+            CorpusFeatures: Columnar features, one row per input line.
+        """
+        line_offsets, token_ids, unknown = self.token_ids(lines)
+        known = token_ids < len(self._words)
+        if unknown:
+            syllables = np.empty(len(token_ids), dtype=np.uint8)
+            syllables[known] = self._syllables[token_ids[known]]
+            estimated = np.array([estimate_syllables(word) for word in unknown],
+                                 dtype=np.uint8)
+            syllables[~known] = estimated[token_ids[~known] - len(self._words)]
+        else:
+            syllables = self._syllables[token_ids]
+        stress_offsets = np.zeros(len(token_ids) + 1, dtype=np.int64)
+        np.cumsum(syllables, out=stress_offsets[1:])
+        # Gather each token's stress span: the source index of output
+        # position p is start(token) + (p - stress_offsets[token]). Unknown
+        # tokens read from the first span and are then overwritten.
+        starts = self._stress_offsets[np.where(known, token_ids, 0)]
+        source = np.repeat(starts - stress_offsets[:-1], syllables) + np.arange(stress_offsets[-1])
+        stresses = self._stresses.take(source, mode='clip')
+        if unknown:
+            stresses[np.repeat(~known, syllables)] = UNKNOWN_STRESS
+
+        line_syllables = np.diff(stress_offsets[line_offsets]).astype(np.int32)
+        return CorpusFeatures(line_offsets, token_ids, syllables, stress_offsets,
+                              stresses, line_syllables, self._words, unknown)
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_feature_extractor():
+    """Return the process-wide feature extractor, building it on first use."""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = CorpusFeatureExtractor()
+    return _extractor
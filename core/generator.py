@@ -1,46 +1,94 @@
 """Poetry generation module for creating various forms of poetry."""
 
 import random
-from collections import defaultdict
-import sys
-import os
-
-# Ensure parent directory is importable for vocabulary package
-_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if _parent_dir not in sys.path:
-    sys.path.insert(0, _parent_dir)
-
-from vocabulary import (
-    nature_words,
-    emotion_words,
-    abstract_words,
-    sensory_words
+
+from .composer import SyllableComposer
+from .instrumentation import NULL_INSTRUMENTATION
+from .lexicon import load_lexicon
+from .rhymes import RhymeIndex
+from .wordbank import WordBank
+
+METAPHOR_TEMPLATES = (
+    "like {} in {}",
+    "{} of {}",
+    "{} beneath {}",
+    "{} among {}",
+    "through {} like {}",
+    "{} within {}",
+)
+
+# Simpler templates that require fewer words
+IMAGE_TEMPLATES_SIMPLE = (
+    "{} {}",
+    "{} in {}",
+    "{} like {}",
+    "{} through {}",
+)
+
+# More complex templates for when we have more syllables
+IMAGE_TEMPLATES_COMPLEX = (
+    "{} {} in the {}",
+    "{} like {} {}",
+    "{} through the {}",
+    "where {} meets {}",
+    "{} of {} {}",
 )
 
+# Syllables of the templates' fixed words and the fallback phrases, so
+# generating a line never has to load the CMU dictionary to count them.
+FIXED_WORD_SYLLABLES = {
+    'among': 2, 'beneath': 2, 'gentle': 2, 'in': 1, 'like': 1, 'meets': 1,
+    'of': 1, 'oh': 1, 'the': 1, 'through': 1, 'where': 1, 'wind': 1,
+    'within': 2,
+}
+
 class PoetryGenerator:
-    def __init__(self, analyzer):
-        """Initialize the poetry generator with an analyzer instance"""
+    """Generates poems from the categorized vocabulary.
+
+    All randomness comes from a per-instance ``random.Random`` (``self.rng``)
+    or from an ``rng`` passed to an individual call; the module-level
+    ``random`` state is never used. After construction the generator's
+    own state is read-only (shared caches are filled idempotently and the
+    analyzer's syllable cache is locked), so one generator can be used
+    from a thread pool without locks. Pass a separate ``rng`` per call to
+    keep each request's output reproducible and isolated from the others.
+    """
+
+    def __init__(self, analyzer, rng=None, instrumentation=None,
+                 language_model=None):
+        """Initialize the poetry generator with an analyzer instance
+
+        Args:
+            analyzer: PoetryAnalyzer used for syllable counts.
+            rng: ``random.Random`` instance or seed for this generator's
+                default randomness; a fresh unseeded one if omitted.
+            instrumentation: Optional Instrumentation for stage timings and
+                fallback counters; defaults to the analyzer's.
+            language_model: Optional MarkovModel (core.markov) trained on a
+                corpus; standard lines are then sampled from its word flow
+                instead of the vocabulary, falling back to the vocabulary
+                when no sample fits the syllable budget.
+        """
         self.analyzer = analyzer
+        self.language_model = language_model
+        self.instrumentation = (instrumentation
+                                or getattr(analyzer, 'instrumentation', None)
+                                or NULL_INSTRUMENTATION)
+        self.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self.lexicon = load_lexicon()
         self.word_cache = self._build_word_cache()
+        self.composer = SyllableComposer(self.word_cache)
+        self.rhyme_index = RhymeIndex(self.lexicon)
+        self._fixed_syllables = {}
         self.templates = self._load_templates()
 
     def _build_word_cache(self):
-        """Build a cache of words categorized by type and syllable count"""
-        cache = defaultdict(lambda: defaultdict(list))
-
-        all_words = {
-            'nature': nature_words.get_all_nature_words(),
-            'emotion': emotion_words.get_all_emotion_words(),
-            'abstract': abstract_words.get_all_abstract_words(),
-            'sensory': sensory_words.get_all_sensory_words()
-        }
-
-        for category, words in all_words.items():
-            for word in words:
-                syllables = self.analyzer.count_syllables(word)
-                cache[category][syllables].append(word)
+        """Build a cache of words categorized by type and syllable count
 
-        return cache
+        Syllable counts come precompiled from the lexicon artifact; the
+        cache is an array-backed WordBank with cumulative syllable offsets.
+        """
+        return WordBank.from_lexicon(self.lexicon)
 
     def _load_templates(self):
         """Load poetic templates and patterns"""
@@ -65,194 +113,179 @@ class PoetryGenerator:
             }
         }
 
-    def _create_metaphor(self, mood=None):
-        """Create a metaphorical phrase combining different domains"""
-        templates = [
-            "like {} in {}",
-            "{} of {}",
-            "{} beneath {}",
-            "{} among {}",
-            "through {} like {}",
-            "{} within {}"
-        ]
-
+    def _word_syllables(self, text):
+        """Syllables of a fixed or vocabulary word, or else of ``text`` as a line
+
+        Fixed words and vocabulary words are counted from precompiled
+        tables; only other text goes through the analyzer.
+        """
+        syllables = FIXED_WORD_SYLLABLES.get(text)
+        if syllables is not None:
+            return syllables
+        if text in self.lexicon:
+            return self.lexicon.syllables(text)
+        return self.analyzer.count_line_syllables(text)['total']
+
+    def _template_syllables(self, template):
+        """Syllables spent by a template's fixed words (cached per template)"""
+        syllables = self._fixed_syllables.get(template)
+        if syllables is None:
+            syllables = sum(map(self._word_syllables, template.replace("{}", " ").split()))
+            self._fixed_syllables[template] = syllables
+        return syllables
+
+    def _line_pool(self, mood=None):
+        """Categories that free-running words of a line are drawn from"""
+        if mood and mood in self.word_cache:
+            return (mood,)
+        return tuple(self.word_cache.keys())
+
+    def _fill_templates(self, syllables, templates, slot_pools, rng, prefix=None):
+        """Fill one of ``templates`` so the phrase has exactly ``syllables``
+
+        Every template/word combination that fits is equally likely.
+
+        Returns:
+            tuple: (phrase, syllables), or None when no template fits.
+        """
+        forms = [(self._template_syllables(t), slot_pools[:t.count("{}")])
+                 for t in templates]
+        result = self.composer.sample_forms(syllables, forms, prefix, rng)
+        if result is None:
+            return None
+        index, prefix_words, slot_words = result
+        phrase = ' '.join(prefix_words + [templates[index].format(*slot_words)])
+        return phrase, syllables
+
+    def _create_metaphor(self, syllables, rng, mood=None):
+        """Create a metaphorical phrase combining different domains
+
+        Leading words from the line's pool pad the metaphor to exactly
+        ``syllables``.
+
+        Returns:
+            tuple: (phrase, syllables), or None if no metaphor fits.
+        """
         categories = ['nature', 'emotion', 'abstract', 'sensory']
         if mood:
             primary = mood
-            secondary = random.choice([c for c in categories if c != mood])
+            secondary = rng.choice([c for c in categories if c != mood])
         else:
-            primary, secondary = random.sample(categories, 2)
-
-        word1 = random.choice(self.word_cache[primary][random.randint(1, 2)])
-        word2 = random.choice(self.word_cache[secondary][random.randint(1, 2)])
-
-        return random.choice(templates).format(word1, word2)
-
-    def _create_image_phrase(self, syllables, mood=None):
-        """Create a vivid image phrase with specific syllable count"""
-        # Simpler templates that require fewer words
-        simple_templates = [
-            "{} {}",
-            "{} in {}",
-            "{} like {}",
-            "{} through {}",
-        ]
-
-        # More complex templates for when we have more syllables
-        complex_templates = [
-            "{} {} in the {}",
-            "{} like {} {}",
-            "{} through the {}",
-            "where {} meets {}",
-            "{} of {} {}"
-        ]
+            primary, secondary = rng.sample(categories, 2)
+
+        return self._fill_templates(
+            syllables, METAPHOR_TEMPLATES, ((primary,), (secondary,)), rng,
+            prefix=self._line_pool(mood))
+
+    def _create_image_phrase(self, syllables, rng, mood=None):
+        """Create a vivid image phrase with exactly ``syllables`` syllables
 
+        Returns:
+            tuple: (phrase, syllables).
+        """
         # Choose appropriate templates based on syllable count
-        templates = simple_templates if syllables < 6 else complex_templates
-        template = random.choice(templates)
-        needed_words = template.count("{}")
+        templates = (IMAGE_TEMPLATES_SIMPLE if syllables < 6
+                     else IMAGE_TEMPLATES_COMPLEX)
 
         # Select categories
         categories = ['nature', 'sensory', 'abstract']
         if mood and mood in self.word_cache:
             categories = [mood] + [c for c in categories if c != mood]
+        pool = tuple(categories)
 
-        # Collect words
-        words = []
-        remaining_syllables = syllables
-
-        for _ in range(needed_words):
-            if remaining_syllables <= 0:
-                break
-
-            # Try to find a word that fits
-            attempts = 0
-            word_found = False
-
-            while attempts < 10 and not word_found:
-                category = random.choice(categories)
-                possible_words = []
-
-                # Look for words with appropriate syllable count
-                for syll in range(1, remaining_syllables + 1):
-                    if syll in self.word_cache[category]:
-                        possible_words.extend(self.word_cache[category][syll])
-
-                if possible_words:
-                    word = random.choice(possible_words)
-                    word_syllables = self.analyzer.count_syllables(word)
-                    if word_syllables <= remaining_syllables:
-                        words.append(word)
-                        remaining_syllables -= word_syllables
-                        word_found = True
-
-                attempts += 1
-
-        # If we couldn't get enough words, fall back to simpler phrase
-        if len(words) < needed_words:
-            return self._create_simple_phrase(syllables, mood)
-
-        try:
-            return template.format(*words)
-        except (IndexError, KeyError):
-            return self._create_simple_phrase(syllables, mood)
-
-    def _create_simple_phrase(self, syllables, mood=None):
-        """Create a very simple phrase when more complex ones fail"""
+        phrase = self._fill_templates(syllables, templates, (pool,) * 3, rng)
+        if phrase is None:
+            self.instrumentation.count('image_misses')
+            return self._create_simple_phrase(syllables, rng, mood)
+        return phrase
+
+    def _create_simple_phrase(self, syllables, rng, mood=None):
+        """Create a very simple phrase when more complex ones fail
+
+        Returns:
+            tuple: (phrase, syllables).
+        """
         if mood and mood in self.word_cache:
             category = mood
         else:
-            category = random.choice(['nature', 'sensory', 'abstract'])
+            category = rng.choice(['nature', 'sensory', 'abstract'])
 
-        # Get a single word
-        for syll in range(1, syllables + 1):
-            if syll in self.word_cache[category]:
-                words = self.word_cache[category][syll]
-                if words:
-                    return random.choice(words)
+        result = self.composer.sample(syllables, prefix=(category,), rng=rng)
+        if result:
+            return ' '.join(result[0]), syllables
 
         # Ultimate fallback
-        return "gentle"
-
-    def generate_line(self, syllables, mood=None, end_word=None, line_type='standard'):
-        """Generate a single line of poetry with specified constraints"""
-        # Handle very small syllable counts
-        if syllables < 3:
-            if mood and mood in self.word_cache:
-                for s in range(1, syllables + 1):
-                    if s in self.word_cache[mood]:
-                        return random.choice(self.word_cache[mood][s])
-            return "oh"  # Ultimate fallback
-
+        self.instrumentation.count('fallback_gentle')
+        return "gentle", FIXED_WORD_SYLLABLES["gentle"]
+
+    def generate_line(self, syllables, mood=None, end_word=None, line_type='standard',
+                      rng=None):
+        """Generate a single line of poetry with exactly ``syllables`` syllables
+
+        Words are drawn by the exact-fit composer from every sequence that
+        meets the budget, so lines never need re-counting or retries.
+        """
+        rng = self.rng if rng is None else rng
+        with self.instrumentation.timer('compose_line'):
+            return self._compose_line(syllables, rng, mood, end_word, line_type)[0]
+
+    def _compose_line(self, syllables, rng, mood=None, end_word=None,
+                      line_type='standard'):
+        """Build a line and carry its syllable total alongside the text
+
+        Returns:
+            tuple: (line, syllables).
+        """
+        self.instrumentation.count('line_attempts')
+        words = []
+        total = 0
+        if end_word:
+            end_syllables = self._word_syllables(end_word)
+            if end_syllables <= syllables:
+                syllables -= end_syllables
+                words = [end_word]
+                total = end_syllables
+        if syllables < 1:
+            if words:
+                return end_word, total
+            self.instrumentation.count('fallback_oh')
+            return "oh", FIXED_WORD_SYLLABLES["oh"]  # Ultimate fallback
+
+        phrase = None
         # Try metaphor
-        if line_type == 'metaphor' and random.random() < 0.7:
-            try:
-                metaphor = self._create_metaphor(mood)
-                if self.analyzer.count_syllables(metaphor) <= syllables:
-                    return metaphor
-            except (IndexError, KeyError, ValueError):
-                pass
+        if line_type == 'metaphor' and rng.random() < 0.7:
+            phrase = self._create_metaphor(syllables, rng, mood)
+            if phrase is None:
+                self.instrumentation.count('metaphor_misses')
 
         # Try image phrase
-        if line_type == 'image' or random.random() < 0.3:
-            try:
-                image = self._create_image_phrase(syllables, mood)
-                if self.analyzer.count_syllables(image) <= syllables:
-                    return image
-            except (IndexError, KeyError, ValueError):
-                pass
-
-        # Standard line generation
-        if mood and mood in self.word_cache:
-            primary_category = mood
-            secondary_categories = [c for c in self.word_cache.keys() if c != mood]
-        else:
-            categories = list(self.word_cache.keys())
-            if categories:
-                primary_category = random.choice(categories)
-                secondary_categories = [c for c in categories if c != primary_category]
+        if phrase is None and (line_type == 'image' or rng.random() < 0.3):
+            phrase = self._create_image_phrase(syllables, rng, mood)
+
+        # Corpus-learned word flow
+        if phrase is None and self.language_model is not None:
+            sampled = self.language_model.sample_line(syllables, rng)
+            if sampled is None:
+                self.instrumentation.count('markov_misses')
             else:
-                return "gentle breeze"  # Ultimate fallback
+                phrase = ' '.join(sampled), syllables
 
-        # Build line word by word
-        words = []
-        current_syllables = 0
-
-        while current_syllables < syllables:
-            remaining = syllables - current_syllables
-            if remaining < 1:
-                break
-
-            # Try to find appropriate word
-            category = random.choice([primary_category] + secondary_categories)
-            possible_words = []
-
-            for syll in range(1, remaining + 1):
-                if syll in self.word_cache[category]:
-                    possible_words.extend(self.word_cache[category][syll])
-
-            if not possible_words:
-                if not words:  # If we haven't added any words yet, use fallback
-                    return "gentle wind"
-                break
-
-            word = random.choice(possible_words)
-            words.append(word)
-            current_syllables += self.analyzer.count_syllables(word)
-
-        # Handle end word requirement
-        if end_word and words:
-            try:
-                current_syllables = sum(self.analyzer.count_syllables(w) for w in words[:-1])
-                if current_syllables + self.analyzer.count_syllables(end_word) <= syllables:
-                    words[-1] = end_word
-            except (IndexError, KeyError, ValueError):
-                pass
-
-        return ' '.join(words)
-
-    def generate_haiku(self, mood=None):
+        # Standard line generation
+        if phrase is None:
+            result = self.composer.sample(syllables, prefix=self._line_pool(mood),
+                                          rng=rng)
+            if result is None:
+                self.instrumentation.count('fallback_gentle_wind')
+                return "gentle wind", (FIXED_WORD_SYLLABLES["gentle"]
+                                       + FIXED_WORD_SYLLABLES["wind"])
+            phrase = ' '.join(result[0]), syllables
+
+        line, line_syllables = phrase
+        return ' '.join([line] + words), line_syllables + total
+
+    def generate_haiku(self, mood=None, rng=None):
         """Generate a haiku"""
+        rng = self.rng if rng is None else rng
         structure = self.templates['haiku']['structure']
         focus = self.templates['haiku']['focus']
 
@@ -260,14 +293,16 @@ class PoetryGenerator:
         for i, syllables in enumerate(structure):
             line_type = 'image' if i == 1 else 'standard'
             mood_for_line = mood or focus[i % len(focus)]
-            lines.append(self.generate_line(syllables, mood_for_line, line_type=line_type))
+            lines.append(self.generate_line(syllables, mood_for_line,
+                                            line_type=line_type, rng=rng))
 
         return '\n'.join(lines)
 
-    def generate_free_verse(self, num_lines=None, mood=None):
+    def generate_free_verse(self, num_lines=None, mood=None, rng=None):
         """Generate free verse poetry"""
+        rng = self.rng if rng is None else rng
         if not num_lines:
-            num_lines = random.randint(
+            num_lines = rng.randint(
                 self.templates['free_verse']['min_lines'],
                 self.templates['free_verse']['max_lines']
             )
@@ -278,11 +313,11 @@ class PoetryGenerator:
         for i in range(num_lines):
             # Vary line length but maintain some rhythm
             if prev_syllables:
-                syllables = prev_syllables + random.randint(-2, 2)
+                syllables = prev_syllables + rng.randint(-2, 2)
                 syllables = max(self.templates['free_verse']['min_syllables'],
                               min(self.templates['free_verse']['max_syllables'], syllables))
             else:
-                syllables = random.randint(
+                syllables = rng.randint(
                     self.templates['free_verse']['min_syllables'],
                     self.templates['free_verse']['max_syllables']
                 )
@@ -290,19 +325,58 @@ class PoetryGenerator:
             # Alternate between different line types
             line_type = 'metaphor' if i % 3 == 0 else 'image' if i % 3 == 1 else 'standard'
 
-            lines.append(self.generate_line(syllables, mood, line_type=line_type))
+            lines.append(self.generate_line(syllables, mood, line_type=line_type, rng=rng))
             prev_syllables = syllables
 
         return '\n'.join(lines)
 
-    def generate_sonnet(self, mood=None):
-        """Generate a Shakespearean sonnet"""
+    def _assign_end_words(self, rhyme_scheme, syllables, rng, mood=None):
+        """Choose an end word for every line of a rhyme scheme up front
+
+        Each rhyme letter gets its own rhyme class with enough distinct
+        words for all of its lines. Classes in the mood's category are
+        preferred; the rest of the vocabulary fills any shortfall.
+        """
+        letters = list(dict.fromkeys(rhyme_scheme))
+        needed = max(rhyme_scheme.count(letter) for letter in letters)
+
+        classes = []
+        if mood and mood in self.word_cache:
+            mood_classes = self.rhyme_index.classes((mood,), needed, syllables)
+            classes = rng.sample(mood_classes, min(len(letters), len(mood_classes)))
+        if len(classes) < len(letters):
+            remaining = [key for key in self.rhyme_index.classes(None, needed, syllables)
+                         if key not in classes]
+            classes += rng.sample(remaining,
+                                  min(len(letters) - len(classes), len(remaining)))
+
+        end_words = {}
+        for letter, key in zip(letters, classes):
+            words = ()
+            if mood and mood in self.word_cache:
+                words = self.rhyme_index.words(key, (mood,), syllables)
+            if len(words) < rhyme_scheme.count(letter):
+                words = self.rhyme_index.words(key, max_syllables=syllables)
+            end_words[letter] = rng.sample(words, rhyme_scheme.count(letter))
+
+        # Letters left without a class (tiny vocabularies) go unconstrained
+        return [end_words[letter].pop() if letter in end_words else None
+                for letter in rhyme_scheme]
+
+    def generate_sonnet(self, mood=None, rng=None):
+        """Generate a Shakespearean sonnet
+
+        End words for the whole rhyme scheme are assigned first from the
+        rhyme-class index, then each line is filled to exact length.
+        """
+        rng = self.rng if rng is None else rng
         lines = []
         rhyme_scheme = self.templates['sonnet']['rhyme_scheme']
         syllables = self.templates['sonnet']['structure'][0]
-        rhyme_words = defaultdict(list)
+        with self.instrumentation.timer('end_words'):
+            end_words = self._assign_end_words(rhyme_scheme, syllables, rng, mood)
 
-        for i, rhyme in enumerate(rhyme_scheme):
+        for i, end_word in enumerate(end_words):
             if i % 4 == 0:  # Start of new quatrain
                 line_type = 'metaphor'
             elif i % 4 == 2:  # Middle of quatrain
@@ -310,19 +384,60 @@ class PoetryGenerator:
             else:
                 line_type = 'standard'
 
-            if rhyme in rhyme_words:
-                # Use existing rhyme
-                end_word = random.choice(rhyme_words[rhyme])
-                lines.append(self.generate_line(syllables, mood, end_word, line_type))
-            else:
-                # Generate new line
-                line = self.generate_line(syllables, mood, line_type=line_type)
-                lines.append(line)
-
-                # Find rhyming words for future
-                last_word = line.split()[-1]
-                rhymes = self.analyzer.get_rhyming_words(last_word)
-                if rhymes:
-                    rhyme_words[rhyme].extend(rhymes)
+            lines.append(self.generate_line(syllables, mood, end_word, line_type, rng))
 
         return '\n'.join(lines)
+
+    def best_of(self, form, n, k=1, mood=None, scorer=None, threshold=None,
+                batch_size=16, rng=None):
+        """Generate up to ``n`` candidate poems and return the best ``k``
+
+        Candidates are generated lazily and scored a batch at a time; once
+        ``k`` of them score at least ``threshold`` no more are generated.
+        The default scorer is a ``PoemScorer`` (core.selection) rating
+        syllable exactness against the form, imagery in the mood's
+        category and sentiment, with one analyzer pass per batch.
+
+        Args:
+            form: 'haiku', 'free_verse' or 'sonnet'.
+            n: Maximum number of candidates to generate.
+            k: Number of poems to return.
+            mood: Optional mood passed to every candidate and the scorer.
+            scorer: Optional callable mapping a list of poems to a list of
+                scores (higher is better).
+            threshold: Optional score at which to stop early.
+            batch_size: Candidates scored per scorer call.
+            rng: ``random.Random`` for this call; defaults to ``self.rng``.
+
+        Returns:
+            list: Up to ``k`` (poem, score) pairs, best first.
+
+        Raises:
+            ValueError: If the form is unknown or ``k``/``batch_size`` is
+                not positive.
+        """
+        from .batch import FORMS
+        from .selection import PoemScorer, select_best
+        if form not in FORMS:
+            raise ValueError(f"form must be one of {sorted(FORMS)}, got {form!r}")
+        rng = self.rng if rng is None else rng
+        if scorer is None:
+            template = self.templates[form]
+            scorer = PoemScorer(self.analyzer, mood=mood,
+                                syllables=template.get('structure'))
+        generate = getattr(self, FORMS[form])
+        candidates = (generate(mood=mood, rng=rng) for _ in range(n))
+        return select_best(candidates, scorer, k, threshold, batch_size)
+
+    def generate_batch(self, form, n, mood=None, seed=None, workers=1):
+        """Generate ``n`` poems of ``form`` ('haiku', 'free_verse', 'sonnet')
+
+        Each poem is generated from a seed derived from ``seed`` and its
+        index, so output is identical for any ``workers`` count. With more
+        than one worker the poems are spread across a process pool whose
+        workers each build and pre-warm their own generator with this
+        one's spaCy pipeline and language model.
+        """
+        from .batch import generate_batch
+        return generate_batch(form, n, mood=mood, seed=seed, workers=workers,
+                              generator=self)
@@ -0,0 +1,135 @@
+"""Token-trie matcher tagging vocabulary imagery in one pass.
+
+The four vocabulary modules are compiled once per process into a trie
+over lowercased tokens whose terminal nodes hold a bitmask of imagery
+categories. Matching walks the tokens left to right, taking the longest
+entry starting at each position, so a poem is tagged for every category
+at once in time linear in its length. Entries may span several tokens,
+and a token that does not match by its text may match by its lemma.
+"""
+
+import os
+import sys
+import threading
+
+# Ensure parent directory is importable for vocabulary package
+_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+
+from vocabulary import get_all_words
+
+# Keys of the analyze_imagery result; bit i of a mask is category i.
+IMAGERY_CATEGORIES = ('nature', 'emotional', 'abstract', 'sensory')
+
+# Vocabulary module (and generator mood) -> imagery category.
+VOCABULARY_CATEGORIES = {
+    'nature': 'nature',
+    'emotion': 'emotional',
+    'abstract': 'abstract',
+    'sensory': 'sensory',
+}
+
+# Trie nodes are dicts of token -> child; this key holds a terminal's mask.
+_MASK = None
+
+
+class ImageryMatcher:
+    """Trie of token sequences mapped to imagery category bitmasks."""
+
+    def __init__(self, entries):
+        """Build the trie.
+
+        Args:
+            entries: Iterable of (phrase, mask); phrases are split on
+                whitespace into tokens. Masks of repeated phrases are merged.
+        """
+        root = {}
+        for phrase, mask in entries:
+            tokens = phrase.lower().split()
+            if not tokens:
+                continue
+            node = root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_MASK] = node.get(_MASK, 0) | mask
+        self._root = root
+
+    @classmethod
+    def from_vocabulary(cls):
+        """Build the matcher from every word in the vocabulary modules."""
+        return cls(
+            (word, 1 << IMAGERY_CATEGORIES.index(VOCABULARY_CATEGORIES[category]))
+            for category, words in get_all_words().items()
+            for word in words)
+
+    def matches(self, tokens, lemmas=None):
+        """Yield leftmost-longest vocabulary matches.
+
+        Args:
+            tokens: Sequence of lowercased token texts.
+            lemmas: Optional sequence of lowercased lemmas, aligned with
+                ``tokens``, tried where a token's text does not match.
+
+        Yields:
+            tuple: (start, end, phrase, mask) for each match, where
+            ``phrase`` is the vocabulary entry matched.
+        """
+        root = self._root
+        n = len(tokens)
+        i = 0
+        while i < n:
+            node = root
+            path = []
+            best = None
+            j = i
+            while j < n:
+                key = tokens[j]
+                child = node.get(key)
+                if child is None and lemmas is not None:
+                    key = lemmas[j]
+                    child = node.get(key)
+                if child is None:
+                    break
+                node = child
+                path.append(key)
+                j += 1
+                mask = node.get(_MASK)
+                if mask:
+                    best = (j, mask)
+            if best is None:
+                i += 1
+                continue
+            end, mask = best
+            yield i, end, ' '.join(path[:end - i]), mask
+            i = end
+
+    def categorize(self, tokens, lemmas=None):
+        """Return {category: [matched phrases]} for the categories present."""
+        imagery = {}
+        for _, _, phrase, mask in self.matches(tokens, lemmas):
+            for bit, category in enumerate(IMAGERY_CATEGORIES):
+                if mask & (1 << bit):
+                    imagery.setdefault(category, []).append(phrase)
+        return imagery
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_imagery_matcher():
+    """Return the process-wide imagery matcher, building it on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = ImageryMatcher.from_vocabulary()
+    return _matcher
+
+
+def reset_imagery_matcher():
+    """Drop the shared matcher so its next use rebuilds it from the vocabulary."""
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
@@ -0,0 +1,208 @@
+"""Optional stage timers and event counters for analysis and generation.
+
+``PoetryAnalyzer`` and ``PoetryGenerator`` report to an ``Instrumentation``
+passed as ``instrumentation=``. By default they hold ``NULL_INSTRUMENTATION``
+whose hooks do nothing, so disabled instrumentation costs one no-op method
+call per hook.
+
+Stages timed:
+    spacy_parse, sentiment (TextBlob), vocab_match, rhyme_lookup, meter,
+    sound_devices, compose_line, end_words.
+
+Events counted:
+    line_attempts, metaphor_misses, image_misses (image phrase fell back
+    to a simple phrase), markov_misses (no language-model line fit the
+    syllable budget), fallback_gentle, fallback_oh, fallback_gentle_wind
+    (ultimate fallbacks), syllable_estimates (words missing from the
+    dictionary).
+
+Snapshots are pushed to sinks, any object with an ``emit(snapshot)``
+method: ``LoggingSink``, ``PrometheusSink`` and ``MemorySink`` are
+provided.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullInstrumentation:
+    """Instrumentation that records nothing."""
+
+    enabled = False
+
+    def timer(self, stage):
+        return _NULL_TIMER
+
+    def count(self, event, n=1):
+        pass
+
+    def snapshot(self):
+        return {'timers': {}, 'counters': {}}
+
+    def flush(self):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class _Timer:
+    __slots__ = ('_instrumentation', '_stage', '_start')
+
+    def __init__(self, instrumentation, stage):
+        self._instrumentation = instrumentation
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._instrumentation.record(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+class Instrumentation:
+    """Thread-safe stage timers and event counters with pluggable sinks."""
+
+    enabled = True
+
+    def __init__(self, sinks=()):
+        """Create an instrumentation registry.
+
+        Args:
+            sinks: Objects with an ``emit(snapshot)`` method, called by
+                ``flush()``.
+        """
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._timers = defaultdict(lambda: [0, 0.0, 0.0])
+        self._counters = defaultdict(int)
+
+    def timer(self, stage):
+        """Context manager timing one execution of ``stage``."""
+        return _Timer(self, stage)
+
+    def record(self, stage, seconds):
+        """Add one timed execution of ``stage``."""
+        with self._lock:
+            timer = self._timers[stage]
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def count(self, event, n=1):
+        """Increment the counter for ``event``."""
+        with self._lock:
+            self._counters[event] += n
+
+    def snapshot(self):
+        """Return cumulative timers and counters.
+
+        Returns:
+            dict: 'timers' maps each stage to 'count', 'total_seconds' and
+            'max_seconds'; 'counters' maps each event to its count.
+        """
+        with self._lock:
+            return {
+                'timers': {stage: {'count': count, 'total_seconds': total,
+                                   'max_seconds': longest}
+                           for stage, (count, total, longest) in self._timers.items()},
+                'counters': dict(self._counters),
+            }
+
+    def reset(self):
+        """Zero every timer and counter."""
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def flush(self):
+        """Send the current snapshot to every sink."""
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.emit(snapshot)
+
+
+class MemorySink:
+    """Keeps the most recent snapshots in memory."""
+
+    def __init__(self, maxlen=100):
+        self.snapshots = deque(maxlen=maxlen)
+
+    def emit(self, snapshot):
+        self.snapshots.append(snapshot)
+
+    @property
+    def latest(self):
+        return self.snapshots[-1] if self.snapshots else None
+
+
+class LoggingSink:
+    """Logs one line per stage and one line for all counters."""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('poetry_system.instrumentation')
+        self.level = level
+
+    def emit(self, snapshot):
+        for stage, timer in sorted(snapshot['timers'].items()):
+            mean = timer['total_seconds'] / timer['count'] if timer['count'] else 0.0
+            self.logger.log(self.level, "stage %s: %d calls, %.3f ms total, "
+                            "%.3f ms mean, %.3f ms max", stage, timer['count'],
+                            timer['total_seconds'] * 1000, mean * 1000,
+                            timer['max_seconds'] * 1000)
+        if snapshot['counters']:
+            self.logger.log(self.level, "counters: %s", ', '.join(
+                f'{event}={n}' for event, n in sorted(snapshot['counters'].items())))
+
+
+def prometheus_text(snapshot, prefix='poetry'):
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = [
+        f'# TYPE {prefix}_stage_seconds_total counter',
+        *(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {timer["total_seconds"]!r}'
+          for stage, timer in sorted(snapshot['timers'].items())),
+        f'# TYPE {prefix}_stage_calls_total counter',
+        *(f'{prefix}_stage_calls_total{{stage="{stage}"}} {timer["count"]}'
+          for stage, timer in sorted(snapshot['timers'].items())),
+        f'# TYPE {prefix}_events_total counter',
+        *(f'{prefix}_events_total{{event="{event}"}} {n}'
+          for event, n in sorted(snapshot['counters'].items())),
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusSink:
+    """Renders snapshots as Prometheus text, optionally to a file.
+
+    Writing to a file lets a node-exporter textfile collector scrape it.
+    """
+
+    def __init__(self, path=None, prefix='poetry'):
+        self.path = path
+        self.prefix = prefix
+        self.text = ''
+
+    def emit(self, snapshot):
+        self.text = prometheus_text(snapshot, self.prefix)
+        if self.path:
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(self.text)
+            os.replace(tmp_path, self.path)
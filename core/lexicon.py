@@ -0,0 +1,296 @@
+"""Compiled vocabulary lexicon.
+
+Compiles the four vocabulary modules into a single versioned ``.npz``
+artifact holding the word list, category and sub-category membership,
+syllable counts and rhyme keys. Worker processes load the artifact lazily
+instead of re-deriving it from the vocabulary modules and the CMU
+dictionary. The artifact records a digest of the vocabulary data and is
+rebuilt automatically when a vocabulary module changes.
+
+Build it ahead of time with::
+
+    python -m core.lexicon [--output PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import zipfile
+
+# Ensure parent directory is importable for vocabulary package
+_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+
+from vocabulary import (
+    nature_words,
+    emotion_words,
+    abstract_words,
+    sensory_words
+)
+
+from .phonetics import estimate_syllables, get_phonetic_index
+
+FORMAT_VERSION = 1
+
+CATEGORIES = ('nature', 'emotion', 'abstract', 'sensory')
+
+_ENV_PATH = 'POETRY_LEXICON_PATH'
+
+
+def _vocabulary_sources():
+    """Return the nested vocabulary dicts keyed by top-level category."""
+    return {
+        'nature': nature_words.NATURE_ELEMENTS,
+        'emotion': emotion_words.EMOTIONS,
+        'abstract': abstract_words.ABSTRACT_CONCEPTS,
+        'sensory': sensory_words.SENSORY_DETAILS,
+    }
+
+
+def vocabulary_digest():
+    """Return a digest of the vocabulary data and the artifact format."""
+    payload = json.dumps([FORMAT_VERSION, _vocabulary_sources()], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def default_lexicon_path():
+    """Return the artifact path, honouring the POETRY_LEXICON_PATH variable."""
+    return os.environ.get(_ENV_PATH) or os.path.join(
+        _parent_dir, 'vocabulary', 'lexicon.npz')
+
+
+def compile_lexicon(phonetics=None):
+    """Compile the vocabulary modules into the artifact's arrays.
+
+    Args:
+        phonetics: Optional PhoneticIndex; defaults to the shared index.
+
+    Returns:
+        dict: Array name -> numpy array, as stored in the artifact.
+    """
+    import numpy as np
+    if phonetics is None:
+        phonetics = get_phonetic_index()
+
+    word_ids = {}
+    word_masks = []
+    word_subcategories = []
+    subcategory_names = []
+    for bit, (category, groups) in enumerate(_vocabulary_sources().items()):
+        for group, words in groups.items():
+            subcategory_id = len(subcategory_names)
+            subcategory_names.append(f'{category}/{group}')
+            for word in words:
+                if word not in word_ids:
+                    word_ids[word] = len(word_ids)
+                    word_masks.append(0)
+                    word_subcategories.append([])
+                word_id = word_ids[word]
+                word_masks[word_id] |= 1 << bit
+                if subcategory_id not in word_subcategories[word_id]:
+                    word_subcategories[word_id].append(subcategory_id)
+
+    words = list(word_ids)
+    syllables = []
+    rhyme_keys = {}
+    rhyme_ids = []
+    for word in words:
+        entry = phonetics.lookup(word)
+        if entry is None:
+            syllables.append(estimate_syllables(word))
+            rhyme_ids.append(-1)
+        else:
+            syllables.append(max(1, entry[0]))
+            rhyme_ids.append(rhyme_keys.setdefault(entry[2], len(rhyme_keys)))
+
+    offsets = np.zeros(len(words) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(ids) for ids in word_subcategories])
+    return {
+        'format_version': np.array(FORMAT_VERSION, dtype=np.int32),
+        'digest': np.array(vocabulary_digest()),
+        'words': np.array(words),
+        'categories': np.array(word_masks, dtype=np.uint8),
+        'syllables': np.array(syllables, dtype=np.uint8),
+        'rhyme_ids': np.array(rhyme_ids, dtype=np.int32),
+        'rhyme_keys': np.array(list(rhyme_keys)),
+        'subcategory_names': np.array(subcategory_names),
+        'subcategory_offsets': offsets,
+        'subcategory_ids': np.array(
+            [i for ids in word_subcategories for i in ids], dtype=np.int16),
+    }
+
+
+def build_lexicon(path=None, phonetics=None):
+    """Compile the vocabulary and write the artifact.
+
+    Args:
+        path: Output path; defaults to default_lexicon_path().
+        phonetics: Optional PhoneticIndex used for syllables and rhymes.
+
+    Returns:
+        str: The path written.
+    """
+    import numpy as np
+    path = path or default_lexicon_path()
+    arrays = compile_lexicon(phonetics)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+class Lexicon:
+    """Read-only view over a compiled vocabulary artifact.
+
+    Arrays are read from the artifact on first access; Python-level
+    indexes (word -> id, category word lists) are derived lazily too.
+    """
+
+    def __init__(self, arrays):
+        """Wrap a mapping of artifact arrays (an ``NpzFile`` or a dict)."""
+        self._arrays = arrays
+        self._cache = {}
+
+    @classmethod
+    def load(cls, path):
+        """Open an artifact without reading its arrays yet."""
+        import numpy as np
+        return cls(np.load(path, allow_pickle=False))
+
+    def _array(self, name):
+        if name not in self._cache:
+            self._cache[name] = self._arrays[name]
+        return self._cache[name]
+
+    @property
+    def format_version(self):
+        return int(self._array('format_version'))
+
+    @property
+    def digest(self):
+        return str(self._array('digest'))
+
+    @property
+    def words(self):
+        """Tuple of every vocabulary word, indexed by word id."""
+        if 'word_list' not in self._cache:
+            self._cache['word_list'] = tuple(self._array('words').tolist())
+        return self._cache['word_list']
+
+    @property
+    def syllable_counts(self):
+        """uint8 array of syllable counts, indexed by word id."""
+        return self._array('syllables')
+
+    @property
+    def category_masks(self):
+        """uint8 array of category bitmasks (bit i = CATEGORIES[i])."""
+        return self._array('categories')
+
+    def _word_ids(self):
+        if 'word_ids' not in self._cache:
+            self._cache['word_ids'] = {w: i for i, w in enumerate(self.words)}
+        return self._cache['word_ids']
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self._word_ids()
+
+    def word_id(self, word):
+        """Return the id of ``word``, or None if it is not in the vocabulary."""
+        return self._word_ids().get(word)
+
+    def syllables(self, word):
+        """Return the compiled syllable count of a vocabulary word."""
+        return int(self.syllable_counts[self._word_ids()[word]])
+
+    def rhyme_key(self, word):
+        """Return the rhyming part of a vocabulary word, or None if unknown."""
+        rhyme_id = int(self._array('rhyme_ids')[self._word_ids()[word]])
+        return str(self._array('rhyme_keys')[rhyme_id]) if rhyme_id >= 0 else None
+
+    def categories(self, word):
+        """Return the top-level categories a vocabulary word belongs to."""
+        mask = int(self.category_masks[self._word_ids()[word]])
+        return tuple(c for bit, c in enumerate(CATEGORIES) if mask & (1 << bit))
+
+    def subcategories(self, word):
+        """Return 'category/group' names for a vocabulary word."""
+        word_id = self._word_ids()[word]
+        offsets = self._array('subcategory_offsets')
+        ids = self._array('subcategory_ids')[offsets[word_id]:offsets[word_id + 1]]
+        names = self._array('subcategory_names')
+        return tuple(str(names[i]) for i in ids)
+
+    def category_words(self, category):
+        """Return the words in a top-level category, in vocabulary order."""
+        key = ('category', category)
+        if key not in self._cache:
+            if category not in CATEGORIES:
+                return ()
+            import numpy as np
+            bit = 1 << CATEGORIES.index(category)
+            ids = np.flatnonzero(self.category_masks & bit)
+            words = self.words
+            self._cache[key] = tuple(words[i] for i in ids)
+        return self._cache[key]
+
+
+_lexicons = {}
+_lexicons_lock = threading.Lock()
+
+
+def load_lexicon(path=None):
+    """Return the process-wide lexicon for ``path``, building it if needed.
+
+    A missing artifact, or one compiled from different vocabulary data or
+    by a different format version, is rebuilt. If the artifact location is
+    not writable the lexicon is compiled in memory instead.
+    """
+    path = path or default_lexicon_path()
+    lexicon = _lexicons.get(path)
+    if lexicon is not None:
+        return lexicon
+    with _lexicons_lock:
+        lexicon = _lexicons.get(path)
+        if lexicon is None:
+            lexicon = _open_or_build(path)
+            _lexicons[path] = lexicon
+    return lexicon
+
+
+def _open_or_build(path):
+    if os.path.exists(path):
+        try:
+            lexicon = Lexicon.load(path)
+            if (lexicon.format_version == FORMAT_VERSION
+                    and lexicon.digest == vocabulary_digest()):
+                return lexicon
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+    try:
+        return Lexicon.load(build_lexicon(path))
+    except OSError:
+        return Lexicon(compile_lexicon())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Compile the vocabulary modules into a lexicon artifact.')
+    parser.add_argument('--output', default=None,
+                        help='artifact path (default: $POETRY_LEXICON_PATH '
+                             'or vocabulary/lexicon.npz)')
+    args = parser.parse_args(argv)
+    print(build_lexicon(args.output))
+
+
+if __name__ == '__main__':
+    main()
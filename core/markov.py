@@ -0,0 +1,308 @@
+"""Compact n-gram language model with array-backed transitions.
+
+Words are interned to integer ids in sorted order and stored as one UTF-8
+blob with offsets. Id 0 is the empty token that marks line boundaries:
+every line starts from a context of start tokens and ends with a
+transition to it, so lines are sampled to end where corpus lines end.
+Transitions are kept in CSR form: the states (contexts of ``order`` word
+ids, encoded as one int64 key) are sorted, and state ``s`` owns the slice
+``state_offsets[s]:state_offsets[s + 1]`` of the successor ids and of
+their running counts, so a successor is drawn with one binary search over
+the cumulative counts. Syllable counts per word travel with the model, so
+lines can be sampled to an exact syllable budget.
+
+A trained model is saved as a directory of ``.npy`` files and loaded
+memory-mapped, so processes share its pages and hold no per-word Python
+objects. Train one from a text file, one line of verse per line, with::
+
+    python -m core.markov CORPUS OUTPUT [--order 2]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .phonetics import WORD_RE, estimate_syllables, get_phonetic_index
+
+FORMAT_VERSION = 2
+
+# Id of the empty token: line-start context and line-end successor.
+BOUNDARY = 0
+
+_ARRAYS = ('word_blob', 'word_offsets', 'syllables', 'state_keys',
+           'state_offsets', 'successors', 'cumulative')
+
+
+def _context_keys(sequence, positions, order, size):
+    """Encode the ``order`` ids before each position as one int64 key."""
+    keys = np.zeros(len(positions), dtype=np.int64)
+    for back in range(order, 0, -1):
+        keys = keys * size + sequence[positions - back]
+    return keys
+
+
+class MarkovModel:
+    """Word n-gram model over interned ids and CSR transition arrays.
+
+    Attributes:
+        order: Number of preceding words each transition conditions on.
+        syllables: uint8 syllable count per word id (0 for the line boundary token).
+        path: Directory the model was loaded from, or None for a model
+            trained in this process.
+    """
+
+    def __init__(self, order, arrays, path=None):
+        """Wrap trained arrays; use ``train`` or ``load`` to create one."""
+        self.order = order
+        self.path = path
+        # Plain ndarray views of memory-mapped arrays share the same pages
+        # but skip np.memmap's per-index overhead.
+        self.word_blob = np.asarray(arrays['word_blob'])
+        self.word_offsets = np.asarray(arrays['word_offsets'])
+        self.syllables = np.asarray(arrays['syllables'])
+        self.state_keys = np.asarray(arrays['state_keys'])
+        self.state_offsets = np.asarray(arrays['state_offsets'])
+        self.successors = np.asarray(arrays['successors'])
+        self.cumulative = np.asarray(arrays['cumulative'])
+        self._size = len(self.word_offsets) - 1
+        # Memoryviews over the same buffers give bisect and indexing
+        # Python ints without NumPy scalar overhead.
+        self._keys = memoryview(self.state_keys)
+        self._offsets = memoryview(self.state_offsets)
+        self._successors = memoryview(self.successors)
+        self._cumulative = memoryview(self.cumulative)
+        self._syllables = memoryview(self.syllables)
+
+    @classmethod
+    def train(cls, lines, order=2, phonetics=None):
+        """Count n-gram transitions over lines of text.
+
+        Every line starts from a context of ``order`` boundary tokens and
+        ends with a transition to one, so sampled lines begin and end the
+        way corpus lines do. Lines without words are skipped.
+
+        Args:
+            lines: Iterable of line strings (a string is split into lines).
+            order: Context length in words (2 for trigrams).
+            phonetics: Optional PhoneticIndex for syllable counts; defaults
+                to the shared index.
+
+        Returns:
+            MarkovModel: The trained model, held in memory.
+
+        Raises:
+            ValueError: If ``order`` is not positive or the vocabulary is
+                too large to encode contexts in 64 bits.
+        """
+        if order < 1:
+            raise ValueError("order must be >= 1")
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        tokenized = [words for words in (WORD_RE.findall(line.lower()) for line in lines)
+                     if words]
+        vocabulary = [''] + sorted({word for words in tokenized for word in words})
+        size = len(vocabulary)
+        if size ** (order + 1) >= 2 ** 63:
+            raise ValueError(f"{size} words are too many for an order-{order} model")
+        ids = {word: i for i, word in enumerate(vocabulary)}
+
+        # One flat sequence of blocks: `order` start tokens, the line's
+        # words, then an end token. Targets are the words and the end.
+        steps = np.fromiter(map(len, tokenized), dtype=np.int64,
+                            count=len(tokenized)) + 1
+        blocks = steps + order
+        sequence = np.zeros(int(blocks.sum()), dtype=np.int64)
+        first_steps = np.cumsum(blocks) - steps
+        targets = (np.repeat(first_steps - (np.cumsum(steps) - steps), steps)
+                   + np.arange(int(steps.sum())))
+        is_word = np.ones(len(targets), dtype=bool)
+        is_word[np.cumsum(steps) - 1] = False
+        sequence[targets[is_word]] = np.fromiter(
+            (ids[word] for words in tokenized for word in words),
+            dtype=np.int64, count=int(is_word.sum()))
+
+        keys = _context_keys(sequence, targets, order, size)
+        pairs, counts = np.unique(keys * size + sequence[targets], return_counts=True)
+        pair_keys = pairs // size
+        state_keys, state_starts = np.unique(pair_keys, return_index=True)
+        state_offsets = np.append(state_starts, len(pairs)).astype(np.int64)
+        # Running counts restart at every state.
+        running = np.cumsum(counts)
+        before = np.repeat(running[state_starts] - counts[state_starts],
+                           np.diff(state_offsets))
+
+        encoded = [word.encode('utf-8') for word in vocabulary]
+        word_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum([len(word) for word in encoded], out=word_offsets[1:])
+        phonetics = phonetics or get_phonetic_index()
+        syllables = np.array(
+            [0] + [max(1, phonetics.syllables(word) or estimate_syllables(word))
+                   for word in vocabulary[1:]], dtype=np.uint8)
+
+        return cls(order, {
+            'word_blob': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'word_offsets': word_offsets,
+            'syllables': syllables,
+            'state_keys': state_keys,
+            'state_offsets': state_offsets,
+            'successors': (pairs % size).astype(np.int32),
+            'cumulative': (running - before).astype(np.uint32),
+        })
+
+    def save(self, path):
+        """Write the model as a directory of ``.npy`` files, atomically."""
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        os.makedirs(tmp_path)
+        for name in _ARRAYS:
+            np.save(os.path.join(tmp_path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'format_version': FORMAT_VERSION, 'order': self.order}, f)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a saved model, memory-mapping its arrays by default.
+
+        Raises:
+            ValueError: If the model was saved in another format version.
+        """
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format {meta.get('format_version')!r}")
+        mode = 'r' if mmap else None
+        return cls(meta['order'], {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+            for name in _ARRAYS}, path=path)
+
+    def __len__(self):
+        """Number of words, excluding the start token."""
+        return self._size - 1
+
+    @property
+    def nbytes(self):
+        """Total size of the model's arrays in bytes."""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    def word(self, word_id):
+        """Return the word with id ``word_id``."""
+        start, end = self.word_offsets[word_id], self.word_offsets[word_id + 1]
+        return bytes(self.word_blob[start:end]).decode('utf-8')
+
+    def word_id(self, word):
+        """Return the id of ``word``, or None if it is not in the model."""
+        word = word.lower()
+        low, high = 1, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.word(middle) < word:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self._size and self.word(low) == word else None
+
+    def _state(self, context):
+        key = 0
+        for word_id in context:
+            key = key * self._size + word_id
+        state = bisect.bisect_left(self._keys, key)
+        if state < len(self._keys) and self._keys[state] == key:
+            return state
+        return None
+
+    def successors_of(self, context):
+        """Return {word: count} observed after a context of words.
+
+        A context shorter than ``order`` is taken from a line start; the
+        empty word counts lines that end after the context.
+        """
+        ids = [BOUNDARY] * (self.order - len(context)) + [self.word_id(w) or -1 for w in context]
+        state = self._state(ids[-self.order:]) if -1 not in ids else None
+        if state is None:
+            return {}
+        start, end = self.state_offsets[state], self.state_offsets[state + 1]
+        counts = np.diff(self.cumulative[start:end], prepend=0)
+        return {self.word(i): int(c) for i, c in zip(self.successors[start:end], counts)}
+
+    def _can_end(self, context):
+        """Whether a line has ended after a context of ids."""
+        state = self._state(context)
+        # Successor ids are sorted within a state, so an end comes first.
+        return state is not None and self._successors[self._offsets[state]] == BOUNDARY
+
+    def sample_next(self, context, rng):
+        """Draw a successor id of a context of ids, or None if unseen.
+
+        ``BOUNDARY`` is drawn when the line ends after the context.
+        """
+        state = self._state(context)
+        if state is None:
+            return None
+        start, end = self._offsets[state], self._offsets[state + 1]
+        draw = rng.randrange(self._cumulative[end - 1])
+        return self._successors[bisect.bisect_right(self._cumulative, draw, start, end)]
+
+    def sample_line(self, syllables, rng, attempts=20, retries=8):
+        """Sample a line with exactly ``syllables`` syllables.
+
+        The chain is walked from the line-start context; a successor that
+        would overshoot the budget, or end the line early, is redrawn up
+        to ``retries`` times before the attempt is abandoned. A walk that
+        fills the budget is only accepted if a corpus line has ended on
+        its last words.
+
+        Args:
+            syllables: Syllable budget for the line.
+            rng: ``random.Random`` supplying the draws.
+            attempts: Walks to try before giving up.
+            retries: Redraws per word when a draw does not fit.
+
+        Returns:
+            list: The line's words, or None if no attempt fit the budget
+            and ended where a corpus line can.
+        """
+        order = self.order
+        counts = self._syllables
+        for _ in range(attempts):
+            context = [BOUNDARY] * order
+            words = []
+            remaining = syllables
+            while remaining > 0:
+                for _ in range(retries):
+                    word_id = self.sample_next(context[-order:], rng)
+                    if (word_id is not None and word_id != BOUNDARY
+                            and counts[word_id] <= remaining):
+                        break
+                else:
+                    break
+                words.append(word_id)
+                context.append(word_id)
+                remaining -= counts[word_id]
+            if remaining == 0 and self._can_end(context[-order:]):
+                return [self.word(word_id) for word_id in words]
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Train an n-gram model from a text file, one line per line.')
+    parser.add_argument('corpus')
+    parser.add_argument('output')
+    parser.add_argument('--order', type=int, default=2)
+    args = parser.parse_args(argv)
+    with open(args.corpus, encoding='utf-8') as f:
+        model = MarkovModel.train(f.read().splitlines(), order=args.order)
+    model.save(args.output)
+    print(f"{args.output}: {len(model)} words, {len(model.state_keys)} contexts, "
+          f"{len(model.successors)} transitions, {model.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Vectorized metrical classification and deviation scoring.
+
+Lines are scored against repeating foot templates using the stresses from
+``CorpusFeatures`` (precomputed per word by the feature extractor), so a
+whole batch of poems is scored with a handful of NumPy passes over one
+flat syllable array.
+
+Each syllable costs between 0 and 1 where it falls in a metrical position
+it does not fit: an unstressed syllable in a stressed position or the
+reverse costs 1, secondary stresses and estimated (unknown) stresses cost
+0.5 either way, and syllables of monosyllabic words, whose stress is
+decided by context, cost half as much. A line's deviation is its total
+cost divided by its syllable count, so 0 is a perfect fit.
+"""
+
+import numpy as np
+
+# Foot templates, 1 marking the stressed position. On ties the earlier
+# meter wins.
+METERS = {
+    'iambic': (0, 1),
+    'trochaic': (1, 0),
+    'anapestic': (0, 0, 1),
+    'dactylic': (1, 0, 0),
+}
+METER_NAMES = tuple(METERS)
+
+LINE_LENGTHS = ('monometer', 'dimeter', 'trimeter', 'tetrameter',
+                'pentameter', 'hexameter', 'heptameter', 'octameter')
+
+# Stress weight indexed by stress value 0, 1 and 2; UNKNOWN_STRESS (-1)
+# indexes the last entry.
+_STRESS_WEIGHTS = np.array([0.0, 1.0, 0.5, 0.5])
+_MONOSYLLABLE_FACTOR = 0.5
+
+
+def line_label(meter, feet):
+    """Return e.g. 'iambic pentameter' for ``('iambic', 5)``."""
+    if 1 <= feet <= len(LINE_LENGTHS):
+        return f'{meter} {LINE_LENGTHS[feet - 1]}'
+    return f'{meter} {feet}-foot'
+
+
+def _count_feet(meter, syllables):
+    # Rising meters round down (a trailing unstressed syllable is a
+    # feminine ending); falling meters round up (catalexis drops the final
+    # unstressed syllable).
+    foot = METERS[meter]
+    if foot[-1]:
+        feet = syllables // len(foot)
+    else:
+        feet = -(-syllables // len(foot))
+    return np.maximum(feet, 1)
+
+
+class LineMeters:
+    """Best-fitting meter of every line of a ``CorpusFeatures``.
+
+    Attributes:
+        meter: int8 index into ``METER_NAMES`` per line, -1 for lines
+            without syllables.
+        feet: int32 number of feet per line.
+        deviation: float64 deviation of each line from its meter; 1.0 for
+            lines without syllables.
+        costs: float64 array of shape ``(len(METER_NAMES), n_lines)``
+            holding each line's deviation from every meter.
+    """
+
+    def __init__(self, meter, feet, deviation, costs):
+        self.meter = meter
+        self.feet = feet
+        self.deviation = deviation
+        self.costs = costs
+
+    def __len__(self):
+        return len(self.meter)
+
+    def label(self, line):
+        """Return the meter name of line ``line``, or None."""
+        if self.meter[line] < 0:
+            return None
+        return line_label(METER_NAMES[self.meter[line]], int(self.feet[line]))
+
+
+def syllable_costs(features):
+    """Per-syllable costs of a stressed and of an unstressed position.
+
+    Returns:
+        tuple: (stressed, unstressed) float64 arrays aligned with
+        ``features.stresses``.
+    """
+    weights = _STRESS_WEIGHTS[features.stresses]
+    factor = np.where(np.repeat(features.syllables == 1, features.syllables),
+                      _MONOSYLLABLE_FACTOR, 1.0)
+    return (1.0 - weights) * factor, weights * factor
+
+
+def _positions(features):
+    """Position of every syllable within its line."""
+    starts = features.line_stress_offsets[:-1]
+    return (np.arange(len(features.stresses))
+            - np.repeat(starts, features.line_syllables))
+
+
+def _line_sums(values, features):
+    """Sum ``values`` (one per syllable) within each line."""
+    totals = np.zeros(len(values) + 1)
+    np.cumsum(values, out=totals[1:])
+    offsets = features.line_stress_offsets
+    return totals[offsets[1:]] - totals[offsets[:-1]]
+
+
+def _template_costs(meter, positions, stressed, unstressed):
+    foot = np.array(METERS[meter], dtype=bool)
+    expected = foot[positions % len(foot)]
+    return np.where(expected, stressed, unstressed)
+
+
+def classify_meter(features):
+    """Find the best-fitting meter and foot count of every line.
+
+    Args:
+        features: CorpusFeatures of the lines to classify.
+
+    Returns:
+        LineMeters: Meter, feet and deviation per line.
+    """
+    stressed, unstressed = syllable_costs(features)
+    positions = _positions(features)
+    lengths = features.line_syllables
+    empty = lengths == 0
+    divisor = np.maximum(lengths, 1)
+    costs = np.vstack([
+        _line_sums(_template_costs(meter, positions, stressed, unstressed),
+                   features) / divisor
+        for meter in METER_NAMES])
+    costs[:, empty] = 1.0
+    best = np.argmin(costs, axis=0)
+    feet = np.choose(best, [_count_feet(meter, lengths) for meter in METER_NAMES])
+    meter = np.where(empty, -1, best).astype(np.int8)
+    deviation = costs[best, np.arange(len(lengths))]
+    return LineMeters(meter, feet.astype(np.int32), deviation, costs)
+
+
+def score_meter(features, meter='iambic', feet=5):
+    """Deviation of every line from one target meter and length.
+
+    Syllables past the target length and missing syllables cost 1 each,
+    and the total is divided by the longer of the line and the target.
+
+    Args:
+        features: CorpusFeatures of the lines to score.
+        meter: Name of a foot in ``METERS``.
+        feet: Target number of feet per line.
+
+    Returns:
+        numpy.ndarray: float64 deviation per line, between 0 and 1.
+
+    Raises:
+        ValueError: If ``meter`` is unknown or ``feet`` is not positive.
+    """
+    if meter not in METERS:
+        raise ValueError(f"Unknown meter {meter!r}; expected one of {METER_NAMES}")
+    if feet < 1:
+        raise ValueError(f"feet must be positive, got {feet}")
+    target = len(METERS[meter]) * feet
+    stressed, unstressed = syllable_costs(features)
+    positions = _positions(features)
+    costs = _template_costs(meter, positions, stressed, unstressed)
+    costs[positions >= target] = 0.0
+    lengths = features.line_syllables
+    total = _line_sums(costs, features) + np.abs(lengths - target)
+    return total / np.maximum(lengths, target)
+
@@ -0,0 +1,98 @@
+"""Process-wide registry of spaCy pipelines.
+
+Each pipeline is loaded at most once per process, lazily on first use,
+with the components its callers never need excluded. Load time and the
+resident-memory growth of each load are recorded as metrics.
+"""
+
+import os
+import threading
+import time
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+# The analyzer only reads token text, so the dependency parser and the
+# entity recognizer are never loaded.
+ANALYZER_EXCLUDE = ('parser', 'ner')
+
+
+def _rss_bytes():
+    """Return the current resident set size in bytes, or None if unknown."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """Thread-safe cache of loaded spaCy pipelines keyed by name and exclusions."""
+
+    def __init__(self):
+        self._models = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def get(self, name=DEFAULT_MODEL, exclude=ANALYZER_EXCLUDE):
+        """Return the pipeline ``name`` without the ``exclude`` components.
+
+        Raises:
+            OSError: If the spaCy model is not installed.
+        """
+        key = (name, tuple(sorted(exclude)))
+        nlp = self._models.get(key)
+        if nlp is None:
+            with self._lock:
+                nlp = self._models.get(key)
+                if nlp is None:
+                    nlp = self._load(key)
+        return nlp
+
+    def _load(self, key):
+        import spacy
+        name, exclude = key
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        try:
+            nlp = spacy.load(name, exclude=list(exclude))
+        except OSError:
+            raise OSError(
+                f"spaCy model '{name}' not found. "
+                f"Install it with: python -m spacy download {name}"
+            )
+        load_seconds = time.perf_counter() - start
+        rss_after = _rss_bytes()
+        self._models[key] = nlp
+        self._metrics[key] = {
+            'model': name,
+            'exclude': list(exclude),
+            'pipeline': list(nlp.pipe_names),
+            'load_seconds': load_seconds,
+            'rss_bytes': (rss_after - rss_before
+                          if rss_before is not None and rss_after is not None
+                          else None),
+        }
+        return nlp
+
+    def metrics(self):
+        """Return one record per loaded pipeline with load time and RSS growth."""
+        return [dict(record) for record in self._metrics.values()]
+
+    def clear(self):
+        """Drop every loaded pipeline (they are reloaded on next use)."""
+        with self._lock:
+            self._models.clear()
+            self._metrics.clear()
+
+
+_registry = ModelRegistry()
+
+
+def get_nlp(name=DEFAULT_MODEL, exclude=ANALYZER_EXCLUDE):
+    """Return a spaCy pipeline from the process-wide registry."""
+    return _registry.get(name, exclude)
+
+
+def model_metrics():
+    """Return load metrics for every pipeline loaded in this process."""
+    return _registry.metrics()
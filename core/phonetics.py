@@ -0,0 +1,152 @@
+"""Phonetic index over the CMU pronouncing dictionary.
+
+The index is built once per process from the data shipped with
+``pronouncing`` and shared by every analyzer, so syllable counts, stress
+patterns and rhyme lookups become dictionary hits instead of scans.
+"""
+
+import re
+import threading
+from collections import defaultdict
+
+_STRESS_RE = re.compile(r'[^012]')
+
+# Word tokens as counted by the analyzer: lowercase letters with inner
+# apostrophes ("summer's", "o'er").
+WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+def rhyming_part(phones):
+    """Return everything from the last stressed vowel to the end of the phones.
+
+    Mirrors ``pronouncing.rhyming_part`` so keys are interchangeable.
+    """
+    phones_list = phones.split()
+    for i in range(len(phones_list) - 1, 0, -1):
+        if phones_list[i][-1] in '12':
+            return ' '.join(phones_list[i:])
+    return phones
+
+
+def estimate_syllables(word):
+    """Estimate syllables for a word missing from the dictionary.
+
+    Counts vowel groups, discounting a trailing silent 'e'.
+
+    Args:
+        word: A single word string.
+
+    Returns:
+        int: Estimated syllable count (minimum 1).
+    """
+    word = word.lower().strip('.,!?')
+    if not word:
+        return 1
+    count = 0
+    vowels = 'aeiouy'
+    if word[0] in vowels:
+        count += 1
+    for index in range(1, len(word)):
+        if word[index] in vowels and word[index-1] not in vowels:
+            count += 1
+    if word.endswith('e'):
+        count -= 1
+    return max(1, count)
+
+
+class PhoneticIndex:
+    """Word -> (syllables, stresses, rhyming part) table with a rhyme index.
+
+    Entries and ``phones()`` use a word's first dictionary pronunciation,
+    matching what ``pronouncing.phones_for_word(word)[0]`` would return.
+    The inverted rhyme index covers every pronunciation, like
+    ``pronouncing.rhymes``.
+    """
+
+    def __init__(self, pronunciations):
+        """Build the index from ``(word, phones)`` pairs.
+
+        Args:
+            pronunciations: Iterable of (lowercase word, CMU phone string).
+        """
+        entries = {}
+        first_phones = {}
+        rhyme_lookup = defaultdict(list)
+        for word, phones in pronunciations:
+            key = rhyming_part(phones)
+            rhyme_lookup[key].append(word)
+            if word not in entries:
+                stresses = _STRESS_RE.sub('', phones)
+                entries[word] = (len(stresses), stresses, key)
+                first_phones[word] = phones
+        self._entries = entries
+        self._phones = first_phones
+        self._rhyme_lookup = {
+            key: tuple(dict.fromkeys(words))
+            for key, words in rhyme_lookup.items()
+        }
+
+    @classmethod
+    def from_cmudict(cls):
+        """Build the index from the CMU dictionary bundled with pronouncing."""
+        import pronouncing
+        pronouncing.init_cmu()
+        return cls(pronouncing.pronunciations)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, word):
+        return word.lower() in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def lookup(self, word):
+        """Return ``(syllables, stresses, rhyming_part)`` or None if unknown."""
+        return self._entries.get(word.lower())
+
+    def syllables(self, word):
+        """Return the dictionary syllable count, or None if unknown."""
+        entry = self._entries.get(word.lower())
+        return entry[0] if entry else None
+
+    def stresses(self, word):
+        """Return the stress string (e.g. '010'), or None if unknown."""
+        entry = self._entries.get(word.lower())
+        return entry[1] if entry else None
+
+    def phones(self, word):
+        """Return the phone string (e.g. 'W AO1 T ER0'), or None if unknown."""
+        return self._phones.get(word.lower())
+
+    def rhyme_key(self, word):
+        """Return the rhyming part of the word, or None if unknown."""
+        entry = self._entries.get(word.lower())
+        return entry[2] if entry else None
+
+    def words_for_rhyme_key(self, key):
+        """Return every word with a pronunciation ending in ``key``."""
+        return self._rhyme_lookup.get(key, ())
+
+    def rhymes(self, word):
+        """Return words rhyming with ``word`` (excluding the word itself)."""
+        word = word.lower()
+        key = self.rhyme_key(word)
+        if key is None:
+            return []
+        return [w for w in self._rhyme_lookup.get(key, ()) if w != word]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_phonetic_index():
+    """Return the process-wide phonetic index, building it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PhoneticIndex.from_cmudict()
+    return _index
@@ -0,0 +1,118 @@
+"""Shared intermediate representation for ``PoetryAnalyzer.analyze``.
+
+A ``PoemRepresentation`` is built once per poem and read by every
+analysis stage: the poem is split into lines once, and tokens, rhyme keys,
+corpus features and the spaCy ``Doc`` are each computed the first time a
+stage asks for them. A stage that is not requested never triggers the
+work only it needs, so e.g. rhyme and meter analyses never parse.
+"""
+
+import string
+
+from .phonetics import WORD_RE
+
+# Analyses in the order analyze() runs and returns them.
+ANALYSES = ('rhyme_scheme', 'meter', 'sound_devices', 'imagery', 'sentiment',
+            'structure')
+
+# Analyses that read the spaCy Doc.
+DOC_ANALYSES = frozenset({'imagery', 'sentiment'})
+
+
+def empty_result(analysis):
+    """Return the result of ``analysis`` for an empty or invalid poem."""
+    if analysis == 'rhyme_scheme':
+        return ''
+    if analysis == 'meter':
+        return []
+    if analysis == 'sound_devices':
+        return {'alliteration': [], 'assonance': [], 'consonance': [],
+                'density': 0.0}
+    if analysis == 'imagery':
+        return {}
+    if analysis == 'sentiment':
+        return {'polarity': 0.0, 'subjectivity': 0.0, 'emotion_count': {}}
+    if analysis == 'structure':
+        return {'lines': 0, 'words': 0, 'syllables_per_line': []}
+    raise ValueError(f"Unknown analysis {analysis!r}; expected one of {ANALYSES}")
+
+
+def check_analyses(features):
+    """Return ``features`` as a tuple of analysis names, defaulting to all.
+
+    Raises:
+        ValueError: If a name is not in ``ANALYSES``.
+    """
+    if features is None:
+        return ANALYSES
+    if isinstance(features, str):
+        features = (features,)
+    features = tuple(dict.fromkeys(features))
+    for analysis in features:
+        if analysis not in ANALYSES:
+            raise ValueError(
+                f"Unknown analysis {analysis!r}; expected one of {ANALYSES}")
+    return features
+
+
+class PoemRepresentation:
+    """One poem's lines, tokens and parses, each computed at most once.
+
+    Attributes:
+        poem: The original poem text.
+        lines: Stripped non-empty lines.
+    """
+
+    def __init__(self, poem, parse=None, phonetics=None, extract=None, doc=None):
+        """Wrap a poem.
+
+        Args:
+            poem: Multi-line poem string.
+            parse: Callable returning a spaCy ``Doc`` for the poem text;
+                called on first access of ``doc``.
+            phonetics: PhoneticIndex used for rhyme keys.
+            extract: Callable returning ``CorpusFeatures`` for a list of
+                lines; called on first access of ``corpus_features``.
+            doc: Optional ``Doc`` already parsed from the poem.
+        """
+        self.poem = poem
+        self.lines = [line.strip() for line in poem.split('\n') if line.strip()]
+        self._parse = parse
+        self._phonetics = phonetics
+        self._extract = extract
+        self._doc = doc
+        self._line_words = None
+        self._rhyme_keys = None
+        self._corpus_features = None
+
+    @property
+    def line_words(self):
+        """Lowercased word tokens of each line."""
+        if self._line_words is None:
+            self._line_words = [WORD_RE.findall(line.lower()) for line in self.lines]
+        return self._line_words
+
+    @property
+    def rhyme_keys(self):
+        """Rhyming part of each line's last word (the word itself if unknown)."""
+        if self._rhyme_keys is None:
+            keys = []
+            for line in self.lines:
+                last_word = line.split()[-1].lower().strip(string.punctuation)
+                keys.append(self._phonetics.rhyme_key(last_word) or last_word)
+            self._rhyme_keys = keys
+        return self._rhyme_keys
+
+    @property
+    def corpus_features(self):
+        """``CorpusFeatures`` of the lines: syllables and stresses."""
+        if self._corpus_features is None:
+            self._corpus_features = self._extract(self.lines)
+        return self._corpus_features
+
+    @property
+    def doc(self):
+        """spaCy ``Doc`` of the lowercased poem, parsed on first access."""
+        if self._doc is None:
+            self._doc = self._parse(self.poem)
+        return self._doc
@@ -0,0 +1,72 @@
+"""Rhyme-class index over the compiled vocabulary.
+
+Groups vocabulary words by rhyming part (the rhyme key shared with
+``PoetryAnalyzer.analyze_rhyme_scheme``), then by category and syllable
+count, so rhyme-constrained generation can pick end words with plain
+lookups instead of querying the pronouncing dictionary per line.
+"""
+
+from collections import defaultdict
+
+from .lexicon import CATEGORIES
+
+
+class RhymeIndex:
+    """rhyme key -> category -> syllables -> words, built from a Lexicon."""
+
+    def __init__(self, lexicon):
+        """Index every vocabulary word that has a known rhyme key."""
+        classes = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        for category in CATEGORIES:
+            for word in lexicon.category_words(category):
+                key = lexicon.rhyme_key(word)
+                if key is not None:
+                    classes[key][category][lexicon.syllables(word)].append(word)
+        self._classes = {
+            key: {category: {syllables: tuple(words)
+                             for syllables, words in sorted(buckets.items())}
+                  for category, buckets in by_category.items()}
+            for key, by_category in classes.items()
+        }
+        self._class_cache = {}
+
+    def __len__(self):
+        return len(self._classes)
+
+    def words(self, key, categories=None, max_syllables=None):
+        """Return the distinct words in a rhyme class.
+
+        Args:
+            key: Rhyme key (rhyming part).
+            categories: Optional iterable restricting the categories searched.
+            max_syllables: Optional upper bound on word length.
+
+        Returns:
+            tuple: Words in vocabulary order, without duplicates.
+        """
+        by_category = self._classes.get(key, {})
+        words = {}
+        for category in (categories or CATEGORIES):
+            for syllables, bucket in by_category.get(category, {}).items():
+                if max_syllables is None or syllables <= max_syllables:
+                    words.update(dict.fromkeys(bucket))
+        return tuple(words)
+
+    def classes(self, categories=None, min_words=2, max_syllables=None):
+        """Return rhyme keys with at least ``min_words`` distinct words.
+
+        Args:
+            categories: Optional iterable restricting the categories searched.
+            min_words: Minimum distinct words a class must offer.
+            max_syllables: Optional upper bound on word length.
+
+        Returns:
+            tuple: Matching rhyme keys, in a stable order.
+        """
+        cache_key = (tuple(categories or CATEGORIES), min_words, max_syllables)
+        keys = self._class_cache.get(cache_key)
+        if keys is None:
+            keys = tuple(key for key in self._classes
+                         if len(self.words(key, categories, max_syllables)) >= min_words)
+            self._class_cache[cache_key] = keys
+        return keys
@@ -0,0 +1,154 @@
+"""Generate-and-filter selection of the best candidate poems.
+
+Candidates are pulled lazily from an iterator in batches; each batch is
+scored with a single call to the scorer, and only the best ``k`` poems
+seen so far are kept. Generation stops as soon as ``k`` candidates reach
+the threshold, so a good batch early on saves generating the rest.
+
+``PoemScorer`` is the default scorer. It scores a whole batch with one
+``analyze_many`` pass (a single ``nlp.pipe`` run for imagery and
+sentiment) and one vectorized syllable count over all of its lines.
+"""
+
+import heapq
+from itertools import islice
+
+from .imagery import VOCABULARY_CATEGORIES
+
+DEFAULT_WEIGHTS = {'syllables': 0.5, 'imagery': 0.3, 'sentiment': 0.2}
+
+
+class PoemScorer:
+    """Scores batches of poems between 0 and 1 with the analyzer.
+
+    Components, each between 0 and 1:
+        syllables: share of lines with exactly the target syllable count
+            (a missing or extra line counts as a miss); skipped without
+            targets.
+        imagery: share of imagery matches in the mood's category, or with
+            no mood, imagery matches per line (capped at 1).
+        sentiment: closeness to the target polarity, or with no target,
+            expressiveness (mean of absolute polarity and subjectivity).
+
+    The score is the weighted mean of the components present.
+    """
+
+    def __init__(self, analyzer, mood=None, syllables=None, polarity=None,
+                 weights=None):
+        """Create a scorer.
+
+        Args:
+            analyzer: PoetryAnalyzer used for the batched passes.
+            mood: Optional vocabulary category ('nature', 'emotion',
+                'abstract' or 'sensory') the imagery should match.
+            syllables: Optional sequence of target syllables per line.
+            polarity: Optional target polarity between -1 and 1.
+            weights: Optional {component: weight}; defaults to
+                ``DEFAULT_WEIGHTS``.
+        """
+        self.analyzer = analyzer
+        self.category = VOCABULARY_CATEGORIES.get(mood) if mood else None
+        self.syllables = tuple(syllables) if syllables else None
+        self.polarity = polarity
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+
+    def components(self, poems):
+        """Return a {component: value} dict per poem, in one batched pass."""
+        poems = list(poems)
+        results = self.analyzer.analyze_many(poems, batch_size=max(len(poems), 1),
+                                             features=('imagery', 'sentiment'))
+        line_syllables = self._line_syllables(poems)
+        scored = []
+        for poem, result, counts in zip(poems, results, line_syllables):
+            components = {
+                'imagery': self._imagery(result['imagery'], len(counts)),
+                'sentiment': self._sentiment(result['sentiment']),
+            }
+            if self.syllables is not None:
+                components['syllables'] = self._exactness(counts)
+            scored.append(components)
+        return scored
+
+    def __call__(self, poems):
+        """Return the score of every poem in the batch."""
+        scores = []
+        for components in self.components(poems):
+            weights = [self.weights.get(name, 0.0) for name in components]
+            total = sum(weights)
+            scores.append(sum(w * value for w, value in zip(weights, components.values()))
+                          / total if total else 0.0)
+        return scores
+
+    def _line_syllables(self, poems):
+        """Syllables per non-empty line of every poem, from one extraction."""
+        lines = []
+        counts = []
+        for poem in poems:
+            poem_lines = [line for line in (poem or '').split('\n') if line.strip()]
+            lines.extend(poem_lines)
+            counts.append(len(poem_lines))
+        totals = self.analyzer.corpus_features(lines).line_syllables.tolist()
+        per_poem = []
+        start = 0
+        for count in counts:
+            per_poem.append(totals[start:start + count])
+            start += count
+        return per_poem
+
+    def _exactness(self, counts):
+        targets = self.syllables
+        exact = sum(count == target for count, target in zip(counts, targets))
+        return exact / max(len(counts), len(targets))
+
+    def _imagery(self, imagery, lines):
+        matches = sum(map(len, imagery.values()))
+        if self.category is None:
+            return min(1.0, matches / lines) if lines else 0.0
+        return len(imagery.get(self.category, ())) / matches if matches else 0.0
+
+    def _sentiment(self, sentiment):
+        if self.polarity is None:
+            return (abs(sentiment['polarity']) + sentiment['subjectivity']) / 2
+        return 1.0 - abs(sentiment['polarity'] - self.polarity) / 2
+
+
+def select_best(candidates, scorer, k=1, threshold=None, batch_size=16):
+    """Score candidates in batches and return the best ``k``.
+
+    Args:
+        candidates: Iterable of poems, consumed lazily one batch at a time.
+        scorer: Callable taking a list of poems and returning one score
+            per poem (higher is better).
+        k: Number of poems to return.
+        threshold: Optional score; candidates stop being drawn once ``k``
+            scored poems reach it.
+        batch_size: Candidates drawn and scored per scorer call.
+
+    Returns:
+        list: Up to ``k`` (poem, score) pairs, best first; ties keep
+        generation order.
+
+    Raises:
+        ValueError: If ``k`` or ``batch_size`` is not positive.
+    """
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    candidates = iter(candidates)
+    best = []  # min-heap of (score, -index, poem)
+    index = 0
+    while True:
+        batch = list(islice(candidates, batch_size))
+        if not batch:
+            break
+        for poem, score in zip(batch, scorer(batch)):
+            item = (score, -index, poem)
+            index += 1
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+        if threshold is not None and len(best) == k and best[0][0] >= threshold:
+            break
+    return [(poem, score) for score, _, poem in sorted(best, reverse=True)]
@@ -0,0 +1,474 @@
+"""Asyncio poetry service with micro-batched analysis.
+
+Requests arrive as JSON lines over TCP and are answered with one JSON line
+each, tagged with the request's ``id``::
+
+    {"id": 1, "op": "analyze", "poem": "..."}
+    {"id": 2, "op": "generate", "form": "haiku", "mood": "nature", "seed": 7}
+    {"id": 3, "op": "stats"}
+
+Concurrent analysis requests are queued and drained in micro-batches, each
+parsed by a single ``analyze_many`` (``nlp.pipe``) call. Parsing and
+generation run in separate executors so the event loop stays responsive
+and analysis batches never wait behind generation. Both are bounded: when
+the analysis queue is full or every generation slot is taken, submitting
+waits, and a connection stops reading new lines until there is room.
+Every request has a timeout, and per-operation p50/p99 latencies are
+reported by the 'stats' op.
+
+Run it with::
+
+    python -m core.service [--host HOST] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import FORMS
+
+
+def percentile(values, q):
+    """Return the nearest-rank ``q``-th percentile (0-100) of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class LatencyTracker:
+    """Latencies of the most recent requests, for percentile reporting."""
+
+    def __init__(self, window=10000):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        """Return count and p50/p99 latency in milliseconds over the window."""
+        samples = list(self._samples)
+        return {
+            'count': self.count,
+            'p50_ms': _ms(percentile(samples, 50)),
+            'p99_ms': _ms(percentile(samples, 99)),
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+# Allowed JSON types of each optional request field, and their description.
+_FIELD_TYPES = {
+    'poem': ((str,), 'a string'),
+    'form': ((str,), 'a string'),
+    'mood': ((str,), 'a string'),
+    'seed': ((int, str), 'an integer or a string'),
+    'timeout': ((int, float), 'a number'),
+}
+
+
+def check_request(request):
+    """Check the types of a decoded request's fields.
+
+    Raises:
+        ValueError: If a present field has the wrong type or the timeout
+            is negative.
+    """
+    for field, (types, description) in _FIELD_TYPES.items():
+        value = request.get(field)
+        if value is not None and (isinstance(value, bool)
+                                  or not isinstance(value, types)):
+            raise ValueError(f"{field} must be {description}, "
+                             f"got {type(value).__name__}")
+    timeout = request.get('timeout')
+    if timeout is not None and timeout < 0:
+        raise ValueError("timeout must be >= 0")
+
+
+class PoetryService:
+    """Async front end to one analyzer and one generator.
+
+    Use as an async context manager, or call ``start()`` and ``stop()``
+    from the running event loop.
+    """
+
+    def __init__(self, analyzer=None, generator=None, max_batch=32,
+                 max_wait=0.005, max_pending=1024, timeout=10.0, workers=2,
+                 max_generating=64, generate_workers=2):
+        """Create a service.
+
+        Args:
+            analyzer: PoetryAnalyzer; a new one if omitted.
+            generator: PoetryGenerator; built on ``analyzer`` if omitted.
+            max_batch: Most analysis requests parsed in one batch.
+            max_wait: Seconds a batch waits for more requests once the
+                first has arrived.
+            max_pending: Queued analysis requests before submitting waits.
+            timeout: Default per-request timeout in seconds.
+            workers: Executor threads for parsing.
+            max_generating: Generations queued or running before starting
+                another waits.
+            generate_workers: Executor threads for generation.
+        """
+        if analyzer is None:
+            from .analyzer import PoetryAnalyzer
+            analyzer = PoetryAnalyzer()
+        self.analyzer = analyzer
+        self._generator = generator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_generating = max_generating
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix='poetry-service')
+        self._generate_executor = ThreadPoolExecutor(
+            max_workers=generate_workers, thread_name_prefix='poetry-generate')
+        self._queue = None
+        self._generate_slots = None
+        self._generating = 0
+        self._batcher = None
+        self.latency = {'analyze': LatencyTracker(), 'generate': LatencyTracker()}
+        self.batches = 0
+        self.batched_requests = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            from .generator import PoetryGenerator
+            self._generator = PoetryGenerator(self.analyzer)
+        return self._generator
+
+    async def start(self):
+        """Start the batching task on the running loop."""
+        if self._generate_slots is None:
+            self._generate_slots = asyncio.Semaphore(self.max_generating)
+        if self._batcher is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def stop(self):
+        """Stop batching and shut the executors down."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        self._executor.shutdown(wait=True)
+        self._generate_executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def submit(self, poem):
+        """Queue a poem for analysis, waiting while the queue is full.
+
+        Returns:
+            asyncio.Future: Resolves to the poem's ``analyze_many`` result.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((poem, future))
+        return future
+
+    async def enqueue(self, poem, timeout=None):
+        """Queue a poem for analysis and return an awaitable of its result.
+
+        Waits while the queue is full; the timeout covers both the wait and
+        the analysis.
+
+        Raises:
+            asyncio.TimeoutError: If queueing, or later the analysis,
+                exceeds the timeout.
+        """
+        start = time.perf_counter()
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            future = await asyncio.wait_for(self.submit(poem), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        return self._result(future, start, timeout)
+
+    async def _result(self, future, start, timeout):
+        remaining = max(0.0, timeout - (time.perf_counter() - start))
+        try:
+            result = await asyncio.wait_for(future, remaining)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        self.latency['analyze'].record(time.perf_counter() - start)
+        return result
+
+    async def analyze(self, poem, timeout=None):
+        """Analyze one poem in the next micro-batch.
+
+        Raises:
+            asyncio.TimeoutError: If queueing and analysis exceed the timeout.
+        """
+        return await (await self.enqueue(poem, timeout))
+
+    async def start_generate(self, form, mood=None, seed=None, timeout=None):
+        """Start generating one poem and return an awaitable of it.
+
+        Waits while ``max_generating`` generations are queued or running;
+        the timeout covers both the wait and the generation. A slot is
+        held until the executor job finishes, even if its caller timed out.
+
+        Raises:
+            ValueError: If the form is unknown.
+            asyncio.TimeoutError: If waiting for a slot exceeds the timeout.
+        """
+        if form not in FORMS:
+            raise ValueError(f"form must be one of {sorted(FORMS)}, got {form!r}")
+        start = time.perf_counter()
+        timeout = self.timeout if timeout is None else timeout
+        if self._generate_slots is None:
+            self._generate_slots = asyncio.Semaphore(self.max_generating)
+        try:
+            await asyncio.wait_for(self._generate_slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        self._generating += 1
+        rng = random.Random(seed)
+
+        def run():
+            # The generator is built here on first use, off the event loop.
+            return getattr(self.generator, FORMS[form])(mood=mood, rng=rng)
+
+        future = asyncio.get_running_loop().run_in_executor(self._generate_executor, run)
+        future.add_done_callback(self._release_generate)
+        return self._generated(future, start, timeout)
+
+    def _release_generate(self, future):
+        self._generating -= 1
+        self._generate_slots.release()
+        if not future.cancelled():
+            future.exception()  # retrieved even when the caller timed out
+
+    async def _generated(self, future, start, timeout):
+        remaining = max(0.0, timeout - (time.perf_counter() - start))
+        try:
+            # Shielded so a timeout leaves the job, and its slot, running.
+            poem = await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        self.latency['generate'].record(time.perf_counter() - start)
+        return poem
+
+    async def generate(self, form, mood=None, seed=None, timeout=None):
+        """Generate one poem in the generation executor.
+
+        Raises:
+            ValueError: If the form is unknown.
+            asyncio.TimeoutError: If waiting and generation exceed the timeout.
+        """
+        return await (await self.start_generate(form, mood, seed, timeout))
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent requests max_wait to join, unless a full batch
+            # is already queued.
+            if self.max_wait > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # Requests that timed out while queued are not parsed.
+            batch = [(poem, future) for poem, future in batch if not future.done()]
+            if not batch:
+                continue
+            poems = [poem for poem, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self._analyze, poems)
+            except Exception as exc:
+                self.errors += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.batched_requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _analyze(self, poems):
+        return list(self.analyzer.analyze_many(poems, batch_size=len(poems)))
+
+    def stats(self):
+        """Return latency percentiles, batching and queue statistics."""
+        return {
+            'latency': {op: tracker.summary() for op, tracker in self.latency.items()},
+            'batches': self.batches,
+            'mean_batch_size': (self.batched_requests / self.batches
+                                if self.batches else 0.0),
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'max_pending': self.max_pending,
+            'generating': self._generating,
+            'max_generating': self.max_generating,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+        }
+
+    async def handle(self, request, pending=None):
+        """Answer one decoded request dict with a response dict.
+
+        ``pending`` is the awaitable from enqueue() or start_generate()
+        for an analyze or generate request that has already been started.
+        """
+        response = {'id': request.get('id')}
+        op = request.get('op')
+        timeout = request.get('timeout')
+        try:
+            check_request(request)
+            if op == 'analyze':
+                if pending is None:
+                    pending = await self.enqueue(request.get('poem'), timeout)
+                response['result'] = await pending
+            elif op == 'generate':
+                if pending is None:
+                    pending = await self.start_generate(
+                        request.get('form', 'haiku'), request.get('mood'),
+                        request.get('seed'), timeout)
+                response['result'] = await pending
+            elif op == 'stats':
+                response['result'] = self.stats()
+            else:
+                response['error'] = f"unknown op {op!r}"
+        except asyncio.TimeoutError:
+            response['error'] = 'timeout'
+        except ValueError as exc:
+            response['error'] = str(exc)
+        except Exception as exc:
+            response['error'] = f'{type(exc).__name__}: {exc}'
+        return response
+
+    async def handle_connection(self, reader, writer):
+        """Serve JSON-line requests from one client until it disconnects.
+
+        Requests are answered as they complete, not in arrival order.
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(response):
+            response = await response
+            async with lock:
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('request must be a JSON object')
+                except ValueError as exc:
+                    await respond(_value({'id': None, 'error': f'bad request: {exc}'}))
+                    continue
+                # Queue analysis and generation before reading on, so a full
+                # queue or no free generation slot stops this connection
+                # from reading more requests.
+                pending = None
+                try:
+                    check_request(request)
+                    if request.get('op') == 'analyze':
+                        pending = await self.enqueue(request.get('poem'),
+                                                     request.get('timeout'))
+                    elif request.get('op') == 'generate':
+                        pending = await self.start_generate(
+                            request.get('form', 'haiku'), request.get('mood'),
+                            request.get('seed'), request.get('timeout'))
+                except asyncio.TimeoutError:
+                    await respond(_value({'id': request.get('id'), 'error': 'timeout'}))
+                    continue
+                except ValueError as exc:
+                    await respond(_value({'id': request.get('id'), 'error': str(exc)}))
+                    continue
+                except Exception as exc:
+                    # Never let one request end the connection.
+                    await respond(_value({'id': request.get('id'),
+                                          'error': f'{type(exc).__name__}: {exc}'}))
+                    continue
+                tasks = {task for task in tasks if not task.done()}
+                tasks.add(asyncio.ensure_future(respond(self.handle(request, pending))))
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            # Server shutdown: drop unanswered requests and close quietly.
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+
+async def _value(value):
+    return value
+
+
+async def serve(service, host='127.0.0.1', port=8765):
+    """Start the line-protocol server; returns the ``asyncio`` server."""
+    await service.start()
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Serve poem analysis and generation over JSON lines.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--max-pending', type=int, default=1024)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = PoetryService(max_batch=args.max_batch,
+                                max_wait=args.max_wait_ms / 1000,
+                                max_pending=args.max_pending,
+                                timeout=args.timeout)
+        server = await serve(service, args.host, args.port)
+        print(f"serving on {args.host}:{args.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Single-pass detection of alliteration, assonance and consonance.
+
+A poem is tokenized once and each word is reduced, through the phonetic
+index and a bounded cache, to the three sounds that can repeat:
+
+- alliteration: the initial consonant phoneme of a stressed word;
+- assonance: the vowel of the word's primary-stressed syllable;
+- consonance: the consonants ending the word, after its last vowel.
+
+One left-to-right pass keeps, for each (device, sound) pair, the group of
+words it has appeared in so far. A word extends the open group for each
+of its sounds if it falls within ``span`` words of the group's last word,
+and otherwise closes it and starts a new one; line breaks close every
+group. Open groups are bounded by the phoneme inventory, so the cost is
+linear in the length of the poem. Words missing from the dictionary have
+no sounds but still count towards the distance between words.
+"""
+
+import threading
+
+from .cache import LRUCache
+from .phonetics import WORD_RE, get_phonetic_index
+
+SOUND_DEVICES = ('alliteration', 'assonance', 'consonance')
+
+
+def sound_features(phones):
+    """Reduce a phone string to its repeatable sounds.
+
+    Args:
+        phones: CMU phone string, e.g. 'B L AE1 NG K'.
+
+    Returns:
+        tuple: (onset, vowel, coda), each a string or None. Words without
+        a primary stress (mostly function words) have no sounds.
+    """
+    phonemes = phones.split()
+    stressed = None
+    last_vowel = None
+    for i, phoneme in enumerate(phonemes):
+        if phoneme[-1] in '012':
+            last_vowel = i
+            if phoneme[-1] == '1':
+                stressed = i
+    if stressed is None:
+        return None, None, None
+    onset = phonemes[0] if phonemes[0][-1] not in '012' else None
+    vowel = phonemes[stressed][:-1]
+    coda = ' '.join(phonemes[last_vowel + 1:]) or None
+    return onset, vowel, coda
+
+
+class SoundScanner:
+    """Finds alliteration, assonance and consonance groups in one pass."""
+
+    def __init__(self, phonetics=None, span=3, min_words=2, cache_size=8192):
+        """Create a scanner.
+
+        Args:
+            phonetics: Optional PhoneticIndex; defaults to the shared index.
+            span: Largest distance, in words, between consecutive words of
+                a group.
+            min_words: Fewest distinct words a group needs to be reported.
+            cache_size: Words whose sounds are memoized.
+        """
+        self.phonetics = phonetics or get_phonetic_index()
+        self.span = span
+        self.min_words = min_words
+        self._cache = LRUCache(cache_size)
+
+    def sounds(self, word):
+        """Return the (onset, vowel, coda) of a lowercase word, cached."""
+        sounds = self._cache.get(word)
+        if sounds is None:
+            phones = self.phonetics.phones(word)
+            sounds = sound_features(phones) if phones else (None, None, None)
+            self._cache.put(word, sounds)
+        return sounds
+
+    def scan(self, text):
+        """Find sound-device groups in a text.
+
+        Args:
+            text: Poem or line string.
+
+        Returns:
+            dict: As for ``scan_lines``.
+        """
+        return self.scan_lines(WORD_RE.findall(line) for line in text.lower().split('\n'))
+
+    def scan_lines(self, lines):
+        """Find sound-device groups in already tokenized lines.
+
+        Args:
+            lines: Iterable of lists of lowercase words, one per line.
+
+        Returns:
+            dict: For each device in ``SOUND_DEVICES``, a list of groups
+            ``{'sound', 'words', 'start', 'end'}`` ordered by position,
+            where ``start``/``end`` are word positions (end exclusive);
+            plus 'density', the share of words in at least one group.
+        """
+        devices = {device: [] for device in SOUND_DEVICES}
+        groups = {}
+        covered = set()
+        span = self.span
+        min_words = self.min_words
+
+        def close(key, group):
+            _, positions, words = group
+            if len(set(words)) >= min_words:
+                device, sound = key
+                devices[device].append({'sound': sound, 'words': words,
+                                        'start': positions[0],
+                                        'end': positions[-1] + 1})
+                covered.update(positions)
+
+        position = 0
+        for words in lines:
+            for word in words:
+                for device, sound in zip(SOUND_DEVICES, self.sounds(word)):
+                    if sound is None:
+                        continue
+                    key = (device, sound)
+                    group = groups.get(key)
+                    if group is not None and position - group[0] <= span:
+                        group[0] = position
+                        group[1].append(position)
+                        group[2].append(word)
+                    else:
+                        if group is not None:
+                            close(key, group)
+                        groups[key] = [position, [position], [word]]
+                position += 1
+            for key, group in groups.items():
+                close(key, group)
+            groups.clear()
+
+        for found in devices.values():
+            found.sort(key=lambda group: group['start'])
+        devices['density'] = len(covered) / position if position else 0.0
+        return devices
+
+
+_scanner = None
+_scanner_lock = threading.Lock()
+
+
+def get_sound_scanner():
+    """Return the process-wide sound scanner, building it on first use."""
+    global _scanner
+    if _scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                _scanner = SoundScanner()
+    return _scanner
@@ -0,0 +1,335 @@
+"""Streaming analysis of corpus files too large to load at once.
+
+Poems are read incrementally from a text file split on a delimiter (a
+blank line by default) or from JSONL, analyzed in fixed-size batches
+through ``PoetryAnalyzer.analyze_many`` and written as JSONL records or as
+columnar ``.npz`` chunks, one per batch. Memory stays bounded by the batch
+size whatever the corpus size.
+
+After every batch a checkpoint next to the output records the input byte
+offset reached and how much output was written, so an interrupted run
+resumes exactly where it stopped::
+
+    python -m core.stream corpus.txt results.jsonl
+    python -m core.stream corpus.jsonl chunks/ --input-format jsonl \\
+        --output-format columnar --resume
+"""
+
+import argparse
+import codecs
+import glob
+import json
+import os
+import sys
+from itertools import islice
+
+# Ensure parent directory is importable for vocabulary package
+_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+
+from vocabulary.emotion_words import EMOTIONS
+
+from .analyzer import PoetryAnalyzer
+from .imagery import IMAGERY_CATEGORIES
+
+INPUT_FORMATS = ('text', 'jsonl')
+OUTPUT_FORMATS = ('jsonl', 'columnar')
+
+DEFAULT_DELIMITER = '\n\n'
+
+
+def iter_poems(path, input_format='text', delimiter=DEFAULT_DELIMITER,
+               field='text', start=0, read_size=1 << 20):
+    """Yield poems from a corpus file without reading it whole.
+
+    Args:
+        path: Corpus file path.
+        input_format: 'text' (poems separated by ``delimiter``) or 'jsonl'
+            (one poem per line, a string or an object holding ``field``).
+        delimiter: Poem separator for text input.
+        field: Key of the poem text in JSONL objects.
+        start: Byte offset to start reading from, e.g. a checkpoint.
+        read_size: Bytes read per call for text input.
+
+    Yields:
+        tuple: (offset, end, poem), where ``offset`` is the poem's first
+        byte and ``end`` the offset to resume from after it. Blank poems
+        are skipped.
+
+    Raises:
+        ValueError: If input_format is unknown or the delimiter is empty.
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(
+            f"input_format must be one of {INPUT_FORMATS}, got {input_format!r}")
+    with open(path, 'rb') as f:
+        f.seek(start)
+        if input_format == 'jsonl':
+            records = _iter_jsonl(f, start, field)
+        else:
+            records = _iter_delimited(f, start, delimiter, read_size)
+        for offset, end, poem in records:
+            if isinstance(poem, str) and not poem.strip():
+                continue
+            yield offset, end, poem
+
+
+def _iter_delimited(f, start, delimiter, read_size):
+    separator = delimiter.encode('utf-8')
+    if not separator:
+        raise ValueError("delimiter must not be empty")
+    buffer = b''
+    buffer_start = start
+    while True:
+        chunk = f.read(read_size)
+        if not chunk:
+            break
+        buffer += chunk
+        pos = 0
+        while True:
+            index = buffer.find(separator, pos)
+            if index < 0:
+                break
+            end = index + len(separator)
+            yield (buffer_start + pos, buffer_start + end,
+                   buffer[pos:index].decode('utf-8', errors='replace'))
+            pos = end
+        buffer = buffer[pos:]
+        buffer_start += pos
+    if buffer:
+        yield (buffer_start, buffer_start + len(buffer),
+               buffer.decode('utf-8', errors='replace'))
+
+
+def _iter_jsonl(f, start, field):
+    offset = start
+    for line in f:
+        end = offset + len(line)
+        if line.strip():
+            record = json.loads(line)
+            yield offset, end, record.get(field) if isinstance(record, dict) else record
+        offset = end
+
+
+class JsonlWriter:
+    """Appends one JSON object per analyzed poem to a file."""
+
+    def __init__(self, path, position=None):
+        """Open ``path``, truncated to ``position`` bytes (empty if None)."""
+        self.path = path
+        self._file = open(path, 'r+b' if position is not None else 'wb')
+        if position is not None:
+            self._file.truncate(position)
+            self._file.seek(position)
+
+    def write(self, records):
+        """Write a batch of records and flush them to disk."""
+        for record in records:
+            self._file.write(json.dumps(record).encode('utf-8') + b'\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def position(self):
+        """Output size to record in a checkpoint."""
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class ColumnarWriter:
+    """Writes each batch as a ``chunk-NNNNNN.npz`` file of column arrays.
+
+    Columns: ``offset``; ``rhyme_scheme``; ``polarity`` and
+    ``subjectivity``; ``emotion_<name>`` counts for every EMOTIONS
+    category; and, for every imagery category, the matched words flattened
+    into ``imagery_<name>_words`` with ``imagery_<name>_offsets`` marking
+    each poem's slice.
+    """
+
+    def __init__(self, directory, position=None):
+        """Write chunks into ``directory``, continuing from chunk ``position``.
+
+        Without a position, chunks left by an earlier run are removed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if position is None:
+            for path in glob.glob(os.path.join(directory, 'chunk-*.npz')):
+                os.remove(path)
+        self.directory = directory
+        self._chunk = position or 0
+
+    def write(self, records):
+        """Write a batch of records as the next chunk."""
+        import numpy as np
+        columns = {
+            'offset': np.array([r['offset'] for r in records], dtype=np.int64),
+            'rhyme_scheme': np.array([r['rhyme_scheme'] for r in records], dtype=str),
+            'polarity': np.array([r['sentiment']['polarity'] for r in records],
+                                 dtype=np.float64),
+            'subjectivity': np.array([r['sentiment']['subjectivity'] for r in records],
+                                     dtype=np.float64),
+        }
+        for emotion in EMOTIONS:
+            columns[f'emotion_{emotion}'] = np.array(
+                [r['sentiment']['emotion_count'].get(emotion, 0) for r in records],
+                dtype=np.int32)
+        for category in IMAGERY_CATEGORIES:
+            words = [r['imagery'].get(category, []) for r in records]
+            offsets = np.zeros(len(records) + 1, dtype=np.int64)
+            np.cumsum([len(w) for w in words], out=offsets[1:])
+            columns[f'imagery_{category}_offsets'] = offsets
+            columns[f'imagery_{category}_words'] = np.array(
+                [w for poem in words for w in poem], dtype=str)
+
+        path = os.path.join(self.directory, f'chunk-{self._chunk:06d}.npz')
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, **columns)
+        os.replace(tmp_path, path)
+        self._chunk += 1
+
+    def position(self):
+        """Number of chunks written, to record in a checkpoint."""
+        return self._chunk
+
+    def close(self):
+        pass
+
+
+_WRITERS = {'jsonl': JsonlWriter, 'columnar': ColumnarWriter}
+
+
+def checkpoint_path(output):
+    """Return the checkpoint file kept alongside ``output``."""
+    return output.rstrip(os.sep) + '.checkpoint'
+
+
+def read_checkpoint(output):
+    """Return the saved checkpoint for ``output``, or None if there is none."""
+    try:
+        with open(checkpoint_path(output)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(output, state):
+    path = checkpoint_path(output)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def stream_analyze(input_path, output, input_format='text',
+                   delimiter=DEFAULT_DELIMITER, field='text',
+                   output_format='jsonl', batch_size=256, resume=False,
+                   max_batches=None, analyzer=None, n_process=1):
+    """Analyze a corpus file batch by batch, checkpointing after each batch.
+
+    Each result is the ``analyze_many`` dict for a poem plus its input byte
+    ``offset``.
+
+    Args:
+        input_path: Corpus file.
+        output: JSONL file, or directory of chunks for 'columnar' output.
+        input_format: 'text' or 'jsonl'; see iter_poems.
+        delimiter: Poem separator for text input.
+        field: Key of the poem text in JSONL objects.
+        output_format: 'jsonl' or 'columnar'.
+        batch_size: Poems analyzed and written per batch.
+        resume: Continue from the checkpoint of a previous run, if any;
+            otherwise start over.
+        max_batches: Stop after this many batches (resume to continue).
+        analyzer: PoetryAnalyzer to use; a new one if omitted.
+        n_process: spaCy worker processes per batch.
+
+    Returns:
+        dict: 'poems' (total written, including earlier runs), 'offset'
+        (input offset reached) and 'done' (whether the input is exhausted).
+
+    Raises:
+        ValueError: If a format is unknown, batch_size is not positive or
+            the checkpoint belongs to a run with other settings.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    settings = {'input_format': input_format, 'delimiter': delimiter,
+                'field': field, 'output_format': output_format}
+    state = read_checkpoint(output) if resume else None
+    if state is not None:
+        if state['settings'] != settings:
+            raise ValueError(
+                f"checkpoint was written with {state['settings']}, not {settings}")
+    else:
+        state = {'settings': settings, 'offset': 0, 'output': None, 'poems': 0}
+        if os.path.exists(checkpoint_path(output)):
+            os.remove(checkpoint_path(output))
+
+    analyzer = analyzer or PoetryAnalyzer()
+    poems = iter_poems(input_path, input_format, delimiter, field, state['offset'])
+    writer = _WRITERS[output_format](output, state['output'])
+    done = False
+    try:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = list(islice(poems, batch_size))
+            if not batch:
+                done = True
+                break
+            results = analyzer.analyze_many((poem for _, _, poem in batch),
+                                            batch_size=batch_size,
+                                            n_process=n_process)
+            writer.write([dict(offset=offset, **result)
+                          for (offset, _, _), result in zip(batch, results)])
+            state['offset'] = batch[-1][1]
+            state['output'] = writer.position()
+            state['poems'] += len(batch)
+            _write_checkpoint(output, state)
+            batches += 1
+    finally:
+        writer.close()
+        poems.close()
+    return {'poems': state['poems'], 'offset': state['offset'], 'done': done}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Analyze a large poem corpus in bounded-memory batches.')
+    parser.add_argument('input', help='corpus file')
+    parser.add_argument('output', help='JSONL file, or a directory for '
+                                       'columnar chunks')
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, default='text')
+    parser.add_argument('--delimiter', default=r'\n\n',
+                        help='poem separator for text input, with backslash '
+                             r'escapes (default: \n\n, a blank line)')
+    parser.add_argument('--field', default='text',
+                        help='poem key in JSONL objects (default: text)')
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='jsonl')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--max-batches', type=int, default=None)
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the checkpoint of an earlier run')
+    args = parser.parse_args(argv)
+
+    summary = stream_analyze(
+        args.input, args.output,
+        input_format=args.input_format,
+        delimiter=codecs.decode(args.delimiter, 'unicode_escape'),
+        field=args.field,
+        output_format=args.output_format,
+        batch_size=args.batch_size,
+        resume=args.resume,
+        max_batches=args.max_batches,
+        n_process=args.n_process,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Array-backed word buckets with cumulative syllable offsets.
+
+``WordBank`` replaces the nested ``defaultdict`` word cache behind the same
+``word_cache[category][syllables] -> words`` interface. Each category
+stores its words in one tuple sorted by syllable count, plus prefix
+offsets, so drawing a word with at most ``k`` syllables is a single random
+index with no list construction.
+"""
+
+import random
+from collections.abc import Mapping
+
+
+class CategoryWords(Mapping):
+    """Words of one category: syllables -> words, backed by one sorted tuple."""
+
+    def __init__(self, buckets):
+        """Build from a mapping of syllable count -> words."""
+        counts = sorted((s, tuple(words)) for s, words in buckets.items()
+                        if words and s > 0)
+        self.max_syllables = counts[-1][0] if counts else 0
+        words = []
+        # offsets[k] = number of words with at most k syllables
+        offsets = [0] * (self.max_syllables + 1)
+        for syllables, bucket in counts:
+            words.extend(bucket)
+            offsets[syllables] = len(bucket)
+        for k in range(1, len(offsets)):
+            offsets[k] += offsets[k - 1]
+        self.words = tuple(words)
+        self.offsets = tuple(offsets)
+
+    def _bounds(self, syllables):
+        if not 0 < syllables <= self.max_syllables:
+            return 0, 0
+        return self.offsets[syllables - 1], self.offsets[syllables]
+
+    def __getitem__(self, syllables):
+        start, stop = self._bounds(syllables)
+        if start == stop:
+            raise KeyError(syllables)
+        return self.words[start:stop]
+
+    def __iter__(self):
+        return (s for s in range(1, self.max_syllables + 1)
+                if self.offsets[s] > self.offsets[s - 1])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, syllables):
+        start, stop = self._bounds(syllables) if isinstance(syllables, int) else (0, 0)
+        return stop > start
+
+    def count(self, syllables):
+        """Number of words with exactly ``syllables`` syllables."""
+        start, stop = self._bounds(syllables)
+        return stop - start
+
+    def count_at_most(self, max_syllables):
+        """Number of words with at most ``max_syllables`` syllables."""
+        if max_syllables < 1:
+            return 0
+        return self.offsets[min(max_syllables, self.max_syllables)]
+
+    def word_at(self, syllables, index):
+        """Return the ``index``-th word with exactly ``syllables`` syllables."""
+        start, stop = self._bounds(syllables)
+        if not 0 <= index < stop - start:
+            raise IndexError(index)
+        return self.words[start + index]
+
+    def pick(self, max_syllables, rng=random):
+        """Return a uniformly random word with at most ``max_syllables``, or None."""
+        n = self.count_at_most(max_syllables)
+        return self.words[rng.randrange(n)] if n else None
+
+
+class WordBank(Mapping):
+    """category -> CategoryWords, a read-only drop-in for ``word_cache``."""
+
+    def __init__(self, buckets):
+        """Build from ``{category: {syllables: words}}``."""
+        self._categories = {
+            category: words if isinstance(words, CategoryWords) else CategoryWords(words)
+            for category, words in buckets.items()
+        }
+
+    @classmethod
+    def from_lexicon(cls, lexicon, categories=None):
+        """Bucket every lexicon word by category and compiled syllable count."""
+        from .lexicon import CATEGORIES
+        buckets = {}
+        for category in (categories or CATEGORIES):
+            by_syllables = {}
+            for word in lexicon.category_words(category):
+                by_syllables.setdefault(lexicon.syllables(word), []).append(word)
+            buckets[category] = by_syllables
+        return cls(buckets)
+
+    def __getitem__(self, category):
+        return self._categories[category]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def pick(self, category, max_syllables, rng=random):
+        """Return a random word from ``category`` with at most ``max_syllables``."""
+        words = self._categories.get(category)
+        return words.pick(max_syllables, rng) if words is not None else None
@@ -1,7 +1,8 @@
 """
 Unit tests for PoetryAnalyzer.
 
-Tests syllable counting, rhyme scheme detection, and input validation.
+Tests syllable counting, rhyme scheme, meter and sound-device detection,
+and input validation.
 """
 
 import pytest
@@ -46,6 +47,47 @@ class TestCountSyllables:
         """Always returns at least 1."""
         assert analyzer.count_syllables('x') >= 1
 
+    def test_memoized(self):
+        """Repeated words, including fallback ones, hit the cache."""
+        analyzer = PoetryAnalyzer(syllable_cache_size=2)
+        analyzer.count_syllables('water')
+        analyzer.count_syllables('Water')
+        analyzer.count_syllables('blorpan')
+        assert analyzer.count_syllables('blorpan') == 2
+        stats = analyzer.syllable_cache.stats()
+        assert (stats['hits'], stats['misses']) == (2, 2)
+
+    def test_cache_bounded(self):
+        """The memo cache evicts beyond its configured size."""
+        analyzer = PoetryAnalyzer(syllable_cache_size=2)
+        for word in ('cat', 'dog', 'bird'):
+            analyzer.count_syllables(word)
+        stats = analyzer.syllable_cache.stats()
+        assert stats['size'] == 2
+        assert stats['evictions'] == 1
+
+
+class TestCountLineSyllables:
+    """Tests for count_line_syllables."""
+
+    def test_per_word_counts(self, analyzer):
+        """Counts each word and totals them."""
+        result = analyzer.count_line_syllables('like water in the beautiful night')
+        assert result['words'] == ['like', 'water', 'in', 'the', 'beautiful', 'night']
+        assert result['syllables'] == [1, 2, 1, 1, 3, 1]
+        assert result['total'] == 9
+
+    def test_punctuation(self, analyzer):
+        """Punctuation is not counted as words."""
+        result = analyzer.count_line_syllables("Autumn's golden branches, -- falling!")
+        assert result['words'] == ["autumn's", 'golden', 'branches', 'falling']
+        assert result['total'] == 8
+
+    def test_empty(self, analyzer):
+        """Empty or invalid input has no words."""
+        assert analyzer.count_line_syllables('')['total'] == 0
+        assert analyzer.count_line_syllables(None)['words'] == []
+
 
 class TestAnalyzeRhymeScheme:
     """Tests for analyze_rhyme_scheme."""
@@ -61,6 +103,15 @@ class TestAnalyzeRhymeScheme:
         assert analyzer.analyze_rhyme_scheme('') == ''
         assert analyzer.analyze_rhyme_scheme(None) == ''
 
+    def test_rhyming_couplet_same_letter(self, analyzer):
+        """Rhyming end words map to the same letter."""
+        assert analyzer.analyze_rhyme_scheme("I saw a cat\nWho wore a hat") == 'AA'
+
+    def test_alternating_rhyme(self, analyzer):
+        """Alternating rhymes produce ABAB."""
+        poem = "The night is long\nThe moon is bright\nI sing a song\nOf silver light"
+        assert analyzer.analyze_rhyme_scheme(poem) == 'ABAB'
+
     def test_single_line(self, analyzer):
         """Single line gets one letter."""
         scheme = analyzer.analyze_rhyme_scheme('A single line of verse')
@@ -90,11 +141,80 @@ class TestAnalyzeSentiment:
         assert 'polarity' in result
         assert 'subjectivity' in result
 
+    def test_emotion_breakdown(self, analyzer):
+        """Emotion counts are broken down by EMOTIONS category."""
+        result = analyzer.analyze_sentiment('Bliss and terror in the darkness')
+        assert result['emotion_count'] == {'joy': 1, 'fear': 2, 'sorrow': 1}
+
     def test_empty_input(self, analyzer):
         """Empty input returns neutral sentiment."""
         result = analyzer.analyze_sentiment('')
         assert result['polarity'] == 0.0
 
 
+class TestAnalyzeMeter:
+    """Tests for analyze_meter and score_meter."""
+
+    def test_per_line_results(self, analyzer):
+        """Each non-empty line gets its stresses, meter and deviation."""
+        result = analyzer.analyze_meter("Tyger Tyger, burning bright,\n\nIn the forests of the night")
+        assert [line['meter'] for line in result] == ['trochaic tetrameter'] * 2
+        assert result[0]['stresses'] == [1, 0, 1, 0, 1, 0, 1]
+        assert result[0]['deviation'] == 0.0
+
+    def test_empty_input(self, analyzer):
+        """Empty input gives no lines."""
+        assert analyzer.analyze_meter('') == []
+        assert analyzer.analyze_meter(None) == []
+
+    def test_score_meter_batch(self, analyzer):
+        """Poems are scored together, one mean deviation per poem."""
+        iambic = "Shall I compare thee to a summer's day\nRough winds do shake the darling buds of May"
+        trochaic = "Tyger Tyger, burning bright,\nIn the forests of the night"
+        scores = analyzer.score_meter([iambic, trochaic, ''])
+        assert scores[0] < scores[1] < scores[2] == 1.0
+        assert analyzer.score_meter([trochaic], meter=None)[0] < 0.1
+
+
+class TestAnalyzeSoundDevices:
+    """Tests for analyze_sound_devices."""
+
+    def test_finds_devices(self, analyzer):
+        """Alliteration is found and density reported."""
+        result = analyzer.analyze_sound_devices('Peter Piper picked a peck of pickled peppers')
+        assert result['alliteration'][0]['sound'] == 'P'
+        assert 0 < result['density'] <= 1
+
+    def test_empty_input(self, analyzer):
+        """Empty input gives no groups."""
+        result = analyzer.analyze_sound_devices('')
+        assert result['alliteration'] == [] and result['density'] == 0.0
+
+
+class TestAnalyzeMany:
+    """Tests for analyze_many."""
+
+    def test_one_result_per_poem(self, analyzer):
+        """Yields one result per input poem, in order."""
+        poems = ['The sun shone on the river', 'I saw a cat\nWho wore a hat']
+        results = list(analyzer.analyze_many(poems, batch_size=1))
+        assert len(results) == 2
+        assert results[1]['rhyme_scheme'] == 'AA'
+
+    def test_matches_individual_calls(self, analyzer):
+        """Batch results agree with the per-poem methods."""
+        poem = 'Dark shadows fall upon the quiet river'
+        result = next(analyzer.analyze_many([poem]))
+        assert result['imagery'] == analyzer.analyze_imagery(poem)
+        assert result['sentiment'] == analyzer.analyze_sentiment(poem)
+
+    def test_empty_poems(self, analyzer):
+        """Empty or invalid poems get empty results without breaking the stream."""
+        results = list(analyzer.analyze_many(['', None, 'A line']))
+        assert results[0]['imagery'] == {}
+        assert results[1]['rhyme_scheme'] == ''
+        assert results[2]['rhyme_scheme'] == 'A'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
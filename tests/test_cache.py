@@ -0,0 +1,179 @@
+"""
+Unit tests for the bounded in-memory cache.
+
+Tests eviction policies, statistics and concurrent use.
+"""
+
+import threading
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import cache as cache_module
+from core.analyzer import PoetryAnalyzer
+from core.cache import AnalysisCache, LRUCache, normalize_poem
+from vocabulary import emotion_words
+
+POEM = "Soft winds whisper dreams\nThrough autumn's golden branches\nTime flows like water"
+
+
+class TestLRUCache:
+    """Tests for LRUCache."""
+
+    def test_hits_and_misses(self):
+        """Lookups are counted as hits or misses."""
+        cache = LRUCache(maxsize=4)
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['hit_rate'] == 0.5
+
+    def test_lru_eviction(self):
+        """LRU evicts the least recently used entry."""
+        cache = LRUCache(maxsize=2, policy='lru')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' in cache and 'b' not in cache
+        assert cache.stats()['evictions'] == 1
+
+    def test_fifo_eviction(self):
+        """FIFO evicts the oldest entry regardless of use."""
+        cache = LRUCache(maxsize=2, policy='fifo')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' not in cache and 'b' in cache
+
+    def test_disabled_and_unbounded(self):
+        """maxsize=0 stores nothing; maxsize=None never evicts."""
+        disabled = LRUCache(maxsize=0)
+        disabled.put('a', 1)
+        assert len(disabled) == 0
+        unbounded = LRUCache(maxsize=None)
+        for i in range(1000):
+            unbounded.put(i, i)
+        assert len(unbounded) == 1000
+
+    def test_invalid_policy(self):
+        """Unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            LRUCache(policy='random')
+
+    def test_concurrent_use(self):
+        """Concurrent puts and gets keep the size bound and counters consistent."""
+        cache = LRUCache(maxsize=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.put((offset, i % 80), i)
+                cache.get((offset, i % 80))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        assert stats['size'] <= 50
+        assert stats['hits'] + stats['misses'] == 8 * 500
+
+
+class TestAnalysisCache:
+    """Tests for the analysis result cache."""
+
+    def test_normalized_keys(self):
+        """Surrounding whitespace and blank lines share a key; analyses and models do not."""
+        cache = AnalysisCache()
+        messy = "  Soft winds whisper dreams\n\nThrough autumn's golden branches \nTime flows like water\n"
+        assert normalize_poem(messy) == POEM
+        assert cache.key('imagery', messy) == cache.key('imagery', POEM)
+        spaced = POEM.replace('Soft winds', 'Soft   winds')
+        assert cache.key('meter', spaced) != cache.key('meter', POEM)
+        assert cache.key('imagery', POEM) != cache.key('sentiment', POEM)
+        assert cache.key('imagery', POEM, 'a') != cache.key('imagery', POEM, 'b')
+
+    def test_analyzer_results_cached(self):
+        """Cached results equal fresh ones and repeat calls are hits."""
+        fresh = PoetryAnalyzer()
+        cached = PoetryAnalyzer(result_cache=AnalysisCache())
+        for _ in range(2):
+            assert cached.analyze_rhyme_scheme(POEM) == fresh.analyze_rhyme_scheme(POEM)
+            assert cached.analyze_imagery(POEM) == fresh.analyze_imagery(POEM)
+            assert cached.analyze_sentiment(POEM) == fresh.analyze_sentiment(POEM)
+        stats = cached.result_cache.stats()
+        assert (stats['hits'], stats['misses']) == (3, 3)
+
+    def test_analyze_many_shares_entries(self):
+        """analyze_many fills and reuses the entries of the single analyses."""
+        analyzer = PoetryAnalyzer(result_cache=AnalysisCache())
+        first = list(analyzer.analyze_many([POEM]))
+        assert analyzer.result_cache.stats()['hits'] == 0
+        assert list(analyzer.analyze_many([POEM + '\n'])) == first
+        assert analyzer.analyze_imagery(POEM) == first[0]['imagery']
+        assert analyzer.result_cache.stats()['hits'] == 4
+
+    def test_line_text_not_shared(self):
+        """Poems differing inside a line get results echoing their own text."""
+        analyzer = PoetryAnalyzer(result_cache=AnalysisCache())
+        assert analyzer.analyze_meter("The  cat   sat")[0]['line'] == "The  cat   sat"
+        assert analyzer.analyze_meter("The cat sat")[0]['line'] == "The cat sat"
+        assert analyzer.analyze_meter("  The cat sat\n\n")[0]['line'] == "The cat sat"
+
+    def test_results_are_copies(self):
+        """Mutating a returned result does not change the cached one."""
+        analyzer = PoetryAnalyzer(result_cache=AnalysisCache())
+        analyzer.analyze_imagery(POEM)['nature'].append('mutated')
+        assert 'mutated' not in analyzer.analyze_imagery(POEM)['nature']
+
+    def test_disk_tier(self, tmp_path):
+        """Results persist in SQLite across cache instances."""
+        path = str(tmp_path / 'results.db')
+        first = AnalysisCache(path=path)
+        first.put('imagery', POEM, {'nature': ['winds']})
+        first.close()
+        second = AnalysisCache(path=path)
+        assert second.get('imagery', POEM) == {'nature': ['winds']}
+        assert second.stats()['disk']['hits'] == 1
+        assert second.get('imagery', POEM) == {'nature': ['winds']}
+        assert second.stats()['memory']['hits'] == 1
+
+    def test_invalidate_on_vocabulary_change(self, tmp_path, monkeypatch):
+        """A new vocabulary digest makes earlier results unreachable and purges them."""
+        cache = AnalysisCache(path=str(tmp_path / 'results.db'))
+        cache.put('rhyme_scheme', POEM, 'ABC')
+        monkeypatch.setattr(cache_module.AnalysisCache, '_current_version',
+                            staticmethod(lambda: 'changed'))
+        assert cache.invalidate() == 1
+        assert cache.get('rhyme_scheme', POEM) is None
+        assert cache.stats()['disk']['size'] == 0
+
+
+    def test_invalidate_rebuilds_vocabulary_lookups(self):
+        """After a vocabulary change, invalidated analyses see the new words."""
+        analyzer = PoetryAnalyzer(result_cache=AnalysisCache())
+        poem = "zyzzyva in the morning\nsoft light"
+        assert 'joy' not in analyzer.analyze_sentiment(poem)['emotion_count']
+        assert 'emotional' not in analyzer.analyze_imagery(poem)
+        try:
+            with pytest.MonkeyPatch.context() as patch:
+                patch.setitem(emotion_words.EMOTIONS, 'joy',
+                              emotion_words.EMOTIONS['joy'] + ['zyzzyva'])
+                analyzer.result_cache.invalidate()
+                assert analyzer.analyze_sentiment(poem)['emotion_count']['joy'] == 1
+                assert analyzer.analyze_imagery(poem)['emotional'] == ['zyzzyva']
+        finally:
+            analyzer.result_cache.invalidate()
+        assert 'joy' not in analyzer.analyze_sentiment(poem)['emotion_count']
+        assert 'emotional' not in analyzer.analyze_imagery(poem)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,87 @@
+"""
+Unit tests for the exact-fit syllable composer.
+
+Tests counting tables, exact sums and uniform sampling.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.composer import SyllableComposer
+
+WORD_CACHE = {
+    'a': {1: ['sun', 'moon'], 2: ['river']},
+    'b': {1: ['fire'], 3: ['harmony']},
+}
+
+SYLLABLES = {'sun': 1, 'moon': 1, 'river': 2, 'fire': 1, 'harmony': 3}
+
+
+@pytest.fixture
+def composer():
+    """Composer over a tiny two-category cache."""
+    return SyllableComposer(WORD_CACHE)
+
+
+class TestCounts:
+    """Tests for the counting tables."""
+
+    def test_bucket_sizes(self, composer):
+        """Bucket sizes sum across the pool's categories."""
+        assert composer.bucket_sizes(('a', 'b')) == {1: 3, 2: 1, 3: 1}
+
+    def test_free_count(self, composer):
+        """Free sequences follow the composition recurrence."""
+        # totals of 3 from {sun, moon} (1) and {river} (2):
+        # 1+1+1 -> 8, 1+2 -> 2, 2+1 -> 2
+        assert composer.free_count(('a',), 3) == 12
+        assert composer.free_count(('a',), 0) == 1
+
+    def test_slot_count(self, composer):
+        """Slot counts fill exactly one word per slot."""
+        # sun/moon + harmony
+        assert composer.slot_count((('a',), ('b',)), 4) == 2
+        # river + fire
+        assert composer.slot_count((('a',), ('b',)), 3) == 1
+        assert composer.slot_count((('a',), ('b',)), 1) == 0
+
+
+class TestSample:
+    """Tests for sampling."""
+
+    def test_exact_total(self, composer):
+        """Sampled lines always sum to the target."""
+        rng = random.Random(0)
+        for total in range(1, 9):
+            prefix, slots = composer.sample(total, (('b',),), prefix=('a',), rng=rng)
+            assert sum(SYLLABLES[w] for w in prefix + slots) == total
+
+    def test_impossible_returns_none(self, composer):
+        """Infeasible budgets return None instead of looping."""
+        assert composer.sample(1, (('a',), ('b',))) is None
+
+    def test_uniform(self, composer):
+        """Every fitting sequence is roughly equally likely."""
+        rng = random.Random(1)
+        counts = Counter(tuple(composer.sample(3, prefix=('a',), rng=rng)[0])
+                         for _ in range(6000))
+        assert len(counts) == 12
+        assert min(counts.values()) > 350
+        assert max(counts.values()) < 650
+
+    def test_sample_forms(self, composer):
+        """Fixed syllables are spent before filling the form's slots."""
+        index, prefix, slots = composer.sample_forms(
+            4, [(9, (('a',),)), (1, (('b',),))], rng=random.Random(2))
+        assert index == 1
+        assert slots == ['harmony']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,86 @@
+"""
+Unit tests for vectorized corpus features.
+
+Tests columnar layout, agreement with count_syllables and unknown words.
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.features import UNKNOWN_STRESS, CorpusFeatureExtractor, get_feature_extractor
+
+LINES = [
+    "Shall I compare thee to a summer's day?",
+    "",
+    "Thou art more lovely and more temperate:",
+    "Zorblax glimmered",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    """Shared analyzer instance."""
+    return PoetryAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def features():
+    """Features for the sample lines from a fresh extractor."""
+    return CorpusFeatureExtractor().extract(LINES)
+
+
+class TestCorpusFeatures:
+    """Tests for CorpusFeatureExtractor.extract."""
+
+    def test_columnar_layout(self, features):
+        """Offsets index flat arrays, one row per input line."""
+        assert len(features) == len(LINES)
+        assert features.line_offsets[0] == 0
+        assert features.line_offsets[-1] == len(features.token_ids)
+        assert features.stress_offsets[-1] == len(features.stresses)
+        assert features.words(1) == []
+        assert features.words(0)[-2:] == ["summer's", 'day']
+
+    def test_matches_count_syllables(self, features, analyzer):
+        """Per-token counts and line totals agree with the analyzer."""
+        for i, line in enumerate(LINES):
+            expected = analyzer.count_line_syllables(line)
+            start, stop = features.line_offsets[i], features.line_offsets[i + 1]
+            assert features.syllables[start:stop].tolist() == expected['syllables']
+            assert features.line_syllables[i] == expected['total']
+
+    def test_stress_patterns(self, features, analyzer):
+        """Dictionary words carry CMU stresses, unknown words UNKNOWN_STRESS."""
+        stresses = features.line_stresses(2)
+        expected = ''.join(analyzer.phonetics.stresses(w) for w in features.words(2))
+        assert ''.join(map(str, stresses.tolist())) == expected
+        zorblax = features.words(3).index('zorblax')
+        token = features.line_offsets[3] + zorblax
+        span = features.stresses[features.stress_offsets[token]:
+                                 features.stress_offsets[token + 1]]
+        assert span.tolist() == [UNKNOWN_STRESS] * 2
+
+    def test_unknown_words_not_interned(self):
+        """Unknown words get ids local to one extraction; the vocabulary is frozen."""
+        extractor = get_feature_extractor()
+        size = len(extractor)
+        for i in range(50):
+            suffix = chr(ord('a') + i % 26) * (i // 26 + 1)
+            features = extractor.extract([f'florp{suffix} glimmered', f'zib{suffix}'])
+            assert features.words(0) == [f'florp{suffix}', 'glimmered']
+            assert features.words(1) == [f'zib{suffix}']
+            assert features.token_ids[0] >= size
+        assert len(extractor) == size
+        assert len(extractor._syllables) == size
+
+    def test_analyzer_entry_point(self, analyzer):
+        """PoetryAnalyzer.corpus_features splits a poem into lines."""
+        features = analyzer.corpus_features("soft winds\nwhisper dreams")
+        assert len(features) == 2
+        assert features.line_syllables.dtype == np.int32
+        assert features.line_syllables.tolist() == [2, 3]
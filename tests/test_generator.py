@@ -4,6 +4,11 @@ Unit tests for PoetryGenerator.
 Tests haiku generation and basic line generation.
 """
 
+import os
+import random
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import sys
 from pathlib import Path
@@ -11,7 +16,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.analyzer import PoetryAnalyzer
-from core.generator import PoetryGenerator
+from core.generator import (FIXED_WORD_SYLLABLES, IMAGE_TEMPLATES_COMPLEX,
+                            IMAGE_TEMPLATES_SIMPLE, METAPHOR_TEMPLATES,
+                            PoetryGenerator)
+
+PACKAGE_DIR = Path(__file__).parent.parent
 
 
 @pytest.fixture(scope='module')
@@ -50,10 +59,8 @@ class TestGenerateHaiku:
         """
         haiku = generator.generate_haiku(mood='nature')
         lines = haiku.strip().split('\n')
-        syllable_counts = []
-        for line in lines:
-            count = sum(analyzer.count_syllables(w) for w in line.split())
-            syllable_counts.append(count)
+        syllable_counts = [analyzer.count_line_syllables(line)['total']
+                           for line in lines]
 
         # Allow +/- 2 syllable tolerance per line
         assert abs(syllable_counts[0] - 5) <= 3
@@ -77,6 +84,25 @@ class TestGenerateFreeVerse:
         assert len(lines) == 6
 
 
+class TestGenerateSonnet:
+    """Tests for generate_sonnet."""
+
+    @pytest.mark.parametrize('mood', [None, 'nature', 'emotion', 'abstract', 'sensory'])
+    def test_rhyme_scheme_matches_template(self, generator, analyzer, mood):
+        """Every sonnet's detected rhyme scheme matches the template."""
+        template = generator.templates['sonnet']['rhyme_scheme']
+        for _ in range(10):
+            sonnet = generator.generate_sonnet(mood=mood)
+            assert analyzer.analyze_rhyme_scheme(sonnet) == template
+
+    def test_ten_syllable_lines(self, generator, analyzer):
+        """Fourteen lines of exactly ten syllables."""
+        lines = generator.generate_sonnet().split('\n')
+        assert len(lines) == 14
+        for line in lines:
+            assert analyzer.count_line_syllables(line)['total'] == 10
+
+
 class TestGenerateLine:
     """Tests for generate_line."""
 
@@ -86,6 +112,26 @@ class TestGenerateLine:
         assert isinstance(line, str)
         assert len(line) > 0
 
+    @pytest.mark.parametrize('line_type', ['standard', 'metaphor', 'image'])
+    def test_exact_syllables(self, generator, analyzer, line_type):
+        """Lines hit the requested syllable count exactly."""
+        for syllables in range(1, 13):
+            line = generator.generate_line(syllables, mood='nature',
+                                           line_type=line_type)
+            assert analyzer.count_line_syllables(line)['total'] == syllables
+
+    def test_end_word(self, generator, analyzer):
+        """A requested end word closes the line within the budget."""
+        line = generator.generate_line(10, end_word='night')
+        assert line.split()[-1] == 'night'
+        assert analyzer.count_line_syllables(line)['total'] == 10
+
+    def test_carried_total_matches_text(self, generator, analyzer):
+        """The syllable total carried with a line matches a recount."""
+        for line_type in ('standard', 'metaphor', 'image'):
+            line, syllables = generator._compose_line(9, generator.rng, line_type=line_type)
+            assert syllables == analyzer.count_line_syllables(line)['total']
+
     def test_small_syllable_count(self, generator):
         """Handles very small syllable requests."""
         line = generator.generate_line(syllables=2)
@@ -93,5 +139,68 @@ class TestGenerateLine:
         assert len(line) > 0
 
 
+class TestRandomness:
+    """Tests for per-instance and per-call random number generators."""
+
+    def test_seeded_generator_reproducible(self, analyzer):
+        """Generators seeded alike produce the same poems."""
+        first = PoetryGenerator(analyzer, rng=3)
+        second = PoetryGenerator(analyzer, rng=random.Random(3))
+        assert first.generate_sonnet() == second.generate_sonnet()
+        assert first.generate_free_verse() == second.generate_free_verse()
+
+    def test_global_random_untouched(self, generator):
+        """Generation never consumes the module-level random state."""
+        random.seed(99)
+        expected = random.random()
+        random.seed(99)
+        generator.generate_haiku()
+        generator.generate_sonnet()
+        assert random.random() == expected
+
+    def test_thread_pool_per_call_rng(self, generator):
+        """A shared generator gives each call's rng an isolated, reproducible result."""
+        def make(seed):
+            return generator.generate_free_verse(num_lines=5, rng=random.Random(seed))
+
+        serial = [make(seed) for seed in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            concurrent = list(pool.map(make, range(40)))
+        assert concurrent == serial
+
+
+class TestFixedSyllables:
+    """Tests for counting template and fallback words without the CMU index."""
+
+    def test_table_matches_analyzer(self, analyzer):
+        """The fixed table covers every template word and agrees with the analyzer."""
+        templates = METAPHOR_TEMPLATES + IMAGE_TEMPLATES_SIMPLE + IMAGE_TEMPLATES_COMPLEX
+        template_words = {w for t in templates for w in t.replace("{}", " ").split()}
+        assert template_words <= set(FIXED_WORD_SYLLABLES)
+        for word, syllables in FIXED_WORD_SYLLABLES.items():
+            assert analyzer.count_syllables(word) == syllables
+
+    def test_first_poems_skip_phonetic_index(self):
+        """A fresh process generates every form without building the CMU index."""
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [str(PACKAGE_DIR), env.get('PYTHONPATH', '')])
+        code = (
+            "from core import phonetics\n"
+            "from core.analyzer import PoetryAnalyzer\n"
+            "from core.generator import PoetryGenerator\n"
+            "generator = PoetryGenerator(PoetryAnalyzer(), rng=1)\n"
+            "generator.generate_haiku()\n"
+            "generator.generate_sonnet()\n"
+            "generator.generate_free_verse()\n"
+            "for line_type in ('standard', 'metaphor', 'image'):\n"
+            "    generator.generate_line(9, end_word='night', line_type=line_type)\n"
+            "print(phonetics._index is None)\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], env=env,
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == 'True'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,90 @@
+"""
+Unit tests for the imagery token trie.
+
+Tests category bitmasks, multi-word entries, lemma fallback and agreement
+with the vocabulary modules.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.imagery import IMAGERY_CATEGORIES, ImageryMatcher, get_imagery_matcher
+from vocabulary import get_all_words
+
+NATURE, EMOTIONAL, ABSTRACT, SENSORY = (1 << i for i in range(4))
+
+
+@pytest.fixture
+def matcher():
+    """Small matcher with overlapping and multi-word entries."""
+    return ImageryMatcher([
+        ('moon', NATURE),
+        ('silver moon', SENSORY | NATURE),
+        ('morning light', SENSORY),
+        ('light', NATURE),
+        ('sorrow', EMOTIONAL),
+        ('sorrow', ABSTRACT),
+    ])
+
+
+class TestImageryMatcher:
+    """Tests for ImageryMatcher."""
+
+    def test_multi_word_longest_match(self, matcher):
+        """The longest entry at a position wins and consumes its tokens."""
+        tokens = 'a silver moon and the moon'.split()
+        assert [m[:3] for m in matcher.matches(tokens)] == [
+            (1, 3, 'silver moon'), (5, 6, 'moon')]
+
+    def test_falls_back_to_shorter_entry(self, matcher):
+        """A partial multi-word prefix still yields the shorter entry."""
+        tokens = 'light of morning'.split()
+        assert [m[2] for m in matcher.matches(tokens)] == ['light']
+
+    def test_all_categories_in_one_pass(self, matcher):
+        """Merged masks tag every category of an entry."""
+        imagery = matcher.categorize('sorrow under a silver moon'.split())
+        assert imagery == {
+            'emotional': ['sorrow'],
+            'abstract': ['sorrow'],
+            'sensory': ['silver moon'],
+            'nature': ['silver moon'],
+        }
+
+    def test_lemma_fallback(self, matcher):
+        """Tokens that miss by text match by lemma, reporting the entry."""
+        tokens = ['sorrows', 'moons']
+        assert matcher.categorize(tokens) == {}
+        assert matcher.categorize(tokens, ['sorrow', 'moon']) == {
+            'emotional': ['sorrow'], 'abstract': ['sorrow'], 'nature': ['moon']}
+
+    def test_matches_vocabulary_membership(self):
+        """Single vocabulary words are tagged with exactly their categories."""
+        matcher = get_imagery_matcher()
+        vocabulary = get_all_words()
+        names = dict(zip(('nature', 'emotion', 'abstract', 'sensory'), IMAGERY_CATEGORIES))
+        for category, words in vocabulary.items():
+            for word in words[:20]:
+                tagged = matcher.categorize([word])
+                expected = {names[c] for c, ws in vocabulary.items() if word in ws}
+                assert set(tagged) == expected
+
+    def test_shared_instance(self):
+        """The vocabulary matcher is built once per process."""
+        assert get_imagery_matcher() is get_imagery_matcher()
+
+
+class TestAnalyzerImagery:
+    """Tests for analyze_imagery on the trie."""
+
+    def test_lemmas_from_doc(self):
+        """Inflected forms match through spaCy lemmas."""
+        from spacy.tokens import Doc
+        analyzer = PoetryAnalyzer()
+        doc = Doc(analyzer.nlp.vocab, words=['the', 'rivers', 'sleep'],
+                  lemmas=['the', 'river', 'sleep'])
+        assert analyzer._imagery_from_doc(doc)['nature'] == ['river']
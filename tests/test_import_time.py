@@ -0,0 +1,68 @@
+"""
+Import-time regression tests.
+
+Runs ``python -X importtime`` in a subprocess and checks that importing the
+package stays within budget and does not pull in heavy libraries.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).parent.parent
+
+# Cumulative import time budget in microseconds
+IMPORT_BUDGET_US = 100_000
+
+# Libraries that must only load when a method that needs them runs
+HEAVY_MODULES = ('spacy', 'textblob', 'nltk', 'pronouncing', 'numpy')
+
+
+def _import_profile(module):
+    """Return {module name: cumulative import microseconds} for ``module``."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(PACKAGE_DIR), str(PACKAGE_DIR.parent), env.get('PYTHONPATH', '')])
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    # First run writes bytecode caches so the measured run is warm
+    subprocess.run(command, env=env, capture_output=True, check=True)
+    result = subprocess.run(command, env=env, capture_output=True, text=True,
+                            check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def _package_modules():
+    """Module names that import the package from this checkout."""
+    modules = ['core']
+    if PACKAGE_DIR.name == 'poetry_system':
+        modules.append('poetry_system')
+    return modules
+
+
+@pytest.mark.parametrize('module', _package_modules())
+class TestImportTime:
+    """Tests for the cost of importing the package."""
+
+    def test_no_heavy_imports(self, module):
+        """Importing the package does not import NLP or numeric libraries."""
+        profile = _import_profile(module)
+        loaded = {name.split('.')[0] for name in profile}
+        assert not loaded & set(HEAVY_MODULES)
+
+    def test_within_budget(self, module):
+        """Cumulative import time stays within budget."""
+        profile = _import_profile(module)
+        assert profile[module] < IMPORT_BUDGET_US
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,115 @@
+"""
+Unit tests for analysis and generation instrumentation.
+
+Tests stage timers, fallback counters and the provided sinks.
+"""
+
+import logging
+import random
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+from core.instrumentation import (
+    NULL_INSTRUMENTATION,
+    Instrumentation,
+    LoggingSink,
+    MemorySink,
+    PrometheusSink,
+    prometheus_text,
+)
+
+POEM = "Soft winds whisper dreams\nThrough autumn's golden branches\nTime flows like water"
+
+
+@pytest.fixture
+def instrumentation():
+    """Fresh instrumentation with an in-memory sink."""
+    return Instrumentation(sinks=[MemorySink()])
+
+
+class TestInstrumentedAnalysis:
+    """Tests for analyzer stage timers."""
+
+    def test_disabled_by_default(self):
+        """Analyzers use the no-op instrumentation unless given one."""
+        analyzer = PoetryAnalyzer()
+        assert analyzer.instrumentation is NULL_INSTRUMENTATION
+        analyzer.analyze_imagery(POEM)
+        assert analyzer.instrumentation.snapshot() == {'timers': {}, 'counters': {}}
+
+    def test_stage_timers(self, instrumentation):
+        """Each analysis stage records calls and time."""
+        analyzer = PoetryAnalyzer(instrumentation=instrumentation)
+        analyzer.analyze_rhyme_scheme(POEM)
+        analyzer.analyze_imagery(POEM)
+        analyzer.analyze_sentiment(POEM)
+        timers = instrumentation.snapshot()['timers']
+        assert set(timers) >= {'rhyme_lookup', 'spacy_parse', 'vocab_match', 'sentiment'}
+        assert timers['spacy_parse']['count'] == 2
+        assert timers['vocab_match']['total_seconds'] >= timers['vocab_match']['max_seconds'] > 0
+
+    def test_analyze_many_parse_timer(self, instrumentation):
+        """Parsing inside nlp.pipe is timed per poem."""
+        analyzer = PoetryAnalyzer(instrumentation=instrumentation)
+        list(analyzer.analyze_many([POEM] * 3))
+        assert instrumentation.snapshot()['timers']['spacy_parse']['count'] >= 3
+
+
+class TestInstrumentedGeneration:
+    """Tests for generator counters."""
+
+    def test_shares_analyzer_instrumentation(self, instrumentation):
+        """A generator reports to its analyzer's instrumentation by default."""
+        generator = PoetryGenerator(PoetryAnalyzer(instrumentation=instrumentation), rng=1)
+        generator.generate_sonnet()
+        snapshot = instrumentation.snapshot()
+        assert snapshot['counters']['line_attempts'] == 14
+        assert snapshot['timers']['compose_line']['count'] == 14
+        assert snapshot['timers']['end_words']['count'] == 1
+
+    def test_ultimate_fallbacks_counted(self, instrumentation):
+        """The 'oh' and 'gentle' fallbacks are counted."""
+        generator = PoetryGenerator(PoetryAnalyzer(), instrumentation=instrumentation)
+        assert generator.generate_line(0) == 'oh'
+        generator.composer.sample = lambda *args, **kwargs: None
+        assert generator._create_simple_phrase(3, random.Random(0))[0] == 'gentle'
+        counters = instrumentation.snapshot()['counters']
+        assert counters['fallback_oh'] == 1
+        assert counters['fallback_gentle'] == 1
+
+
+class TestSinks:
+    """Tests for snapshot sinks."""
+
+    def test_memory_sink(self, instrumentation):
+        """flush() hands the snapshot to every sink."""
+        instrumentation.count('line_attempts', 3)
+        instrumentation.flush()
+        assert instrumentation.sinks[0].latest['counters'] == {'line_attempts': 3}
+
+    def test_prometheus_text(self, instrumentation, tmp_path):
+        """Snapshots render as Prometheus counters and can be written to a file."""
+        instrumentation.record('spacy_parse', 0.5)
+        instrumentation.count('fallback_oh')
+        text = prometheus_text(instrumentation.snapshot())
+        assert 'poetry_stage_seconds_total{stage="spacy_parse"} 0.5' in text
+        assert 'poetry_stage_calls_total{stage="spacy_parse"} 1' in text
+        assert 'poetry_events_total{event="fallback_oh"} 1' in text
+        path = tmp_path / 'poetry.prom'
+        PrometheusSink(str(path)).emit(instrumentation.snapshot())
+        assert path.read_text() == text
+
+    def test_logging_sink(self, instrumentation, caplog):
+        """The logging sink logs stages and counters."""
+        instrumentation.record('sentiment', 0.002)
+        instrumentation.count('image_misses')
+        with caplog.at_level(logging.INFO):
+            LoggingSink().emit(instrumentation.snapshot())
+        assert 'stage sentiment: 1 calls' in caplog.text
+        assert 'image_misses=1' in caplog.text
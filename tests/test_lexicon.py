@@ -0,0 +1,89 @@
+"""
+Unit tests for the compiled vocabulary lexicon.
+
+Tests artifact contents, lazy loading and invalidation on vocabulary changes.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import lexicon as lexicon_module
+from core.analyzer import PoetryAnalyzer
+from core.lexicon import Lexicon, build_lexicon, load_lexicon
+from vocabulary import nature_words, get_all_words
+
+
+@pytest.fixture(scope='module')
+def artifact(tmp_path_factory):
+    """Path of a freshly built artifact."""
+    return build_lexicon(str(tmp_path_factory.mktemp('lexicon') / 'lexicon.npz'))
+
+
+@pytest.fixture(scope='module')
+def lexicon(artifact):
+    """Lexicon loaded from the built artifact."""
+    return Lexicon.load(artifact)
+
+
+class TestLexiconContents:
+    """Tests for the compiled artifact data."""
+
+    def test_covers_all_vocabulary(self, lexicon):
+        """Every vocabulary word appears exactly once."""
+        all_words = {w for words in get_all_words().values() for w in words}
+        assert set(lexicon.words) == all_words
+        assert len(lexicon.words) == len(all_words)
+
+    def test_category_words(self, lexicon):
+        """Category word lists match the vocabulary modules."""
+        assert set(lexicon.category_words('nature')) == set(
+            nature_words.get_all_nature_words())
+        assert lexicon.category_words('unknown') == ()
+
+    def test_membership(self, lexicon):
+        """Words record every category and sub-category they appear in."""
+        assert set(lexicon.categories('darkness')) >= {'emotion'}
+        assert 'emotion/fear' in lexicon.subcategories('darkness')
+        assert 'emotion/sorrow' in lexicon.subcategories('darkness')
+
+    def test_syllables_match_analyzer(self, lexicon):
+        """Compiled syllable counts agree with count_syllables."""
+        analyzer = PoetryAnalyzer()
+        for word in lexicon.words[:50]:
+            assert lexicon.syllables(word) == analyzer.count_syllables(word)
+
+    def test_rhyme_keys(self, lexicon):
+        """Rhyming vocabulary words share a rhyme key."""
+        assert lexicon.rhyme_key('night') == lexicon.rhyme_key('bright')
+
+
+class TestLoadLexicon:
+    """Tests for load_lexicon caching and invalidation."""
+
+    def test_loaded_once_per_path(self, artifact):
+        """The same path returns the same process-wide lexicon."""
+        assert load_lexicon(artifact) is load_lexicon(artifact)
+
+    def test_rebuilds_when_vocabulary_changes(self, tmp_path, monkeypatch):
+        """A stale artifact is rebuilt with the new vocabulary."""
+        path = build_lexicon(str(tmp_path / 'lexicon.npz'))
+        monkeypatch.setitem(nature_words.NATURE_ELEMENTS, 'test_only', ['zephyrine'])
+        monkeypatch.setattr(lexicon_module, '_lexicons', {})
+        assert Lexicon.load(path).digest != lexicon_module.vocabulary_digest()
+        lexicon = load_lexicon(path)
+        assert 'zephyrine' in lexicon
+        assert Lexicon.load(path).digest == lexicon_module.vocabulary_digest()
+
+    def test_builds_missing_artifact(self, tmp_path, monkeypatch):
+        """A missing artifact is built on first load."""
+        monkeypatch.setattr(lexicon_module, '_lexicons', {})
+        path = tmp_path / 'sub' / 'lexicon.npz'
+        assert 'river' in load_lexicon(str(path))
+        assert path.exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
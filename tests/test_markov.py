@@ -0,0 +1,194 @@
+"""
+Unit tests for the array-backed n-gram model.
+
+Tests training counts, the CSR layout, sampling to a syllable budget and
+memory-mapped save/load.
+"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+from core.instrumentation import Instrumentation
+from core.markov import MarkovModel
+
+CORPUS = [
+    "the moon rises over the quiet sea",
+    "the moon falls into the silver sea",
+    "the wind rises over the hills",
+    "a river runs beneath the moon",
+]
+
+
+@pytest.fixture(scope='module')
+def model():
+    """Trigram model over the small corpus."""
+    return MarkovModel.train(CORPUS)
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    """Shared analyzer for syllable checking."""
+    return PoetryAnalyzer()
+
+
+class TestTrain:
+    """Tests for MarkovModel.train."""
+
+    def test_vocabulary(self, model):
+        """Words are interned once, in sorted order."""
+        words = [model.word(i) for i in range(1, len(model) + 1)]
+        assert words == sorted({w for line in CORPUS for w in line.split()})
+        assert model.word_id('moon') == words.index('moon') + 1
+        assert model.word_id('MOON') == model.word_id('moon')
+        assert model.word_id('sun') is None
+
+    def test_successor_counts(self, model):
+        """Counts follow the corpus for full and line-start contexts and line ends."""
+        assert model.successors_of(['the', 'moon']) == {'rises': 1, 'falls': 1, '': 1}
+        assert model.successors_of(['silver', 'sea']) == {'': 1}
+        assert model.successors_of(['over', 'the']) == {'quiet': 1, 'hills': 1}
+        assert model.successors_of([]) == {'the': 3, 'a': 1}
+        assert model.successors_of(['the']) == {'moon': 2, 'wind': 1}
+        assert model.successors_of(['the', 'sun']) == {}
+
+    def test_csr_layout(self, model):
+        """Each state owns a slice of successors with running counts."""
+        assert len(model.state_offsets) == len(model.state_keys) + 1
+        assert model.state_offsets[-1] == len(model.successors)
+        assert np.all(np.diff(model.state_keys) > 0)
+        for state in range(len(model.state_keys)):
+            start, end = model.state_offsets[state], model.state_offsets[state + 1]
+            assert end > start
+            assert np.all(np.diff(model.cumulative[start:end]) > 0)
+        assert model.cumulative.dtype == np.uint32
+        assert model.successors.dtype == np.int32
+
+    def test_order_one(self):
+        """A bigram model conditions on the previous word only."""
+        bigram = MarkovModel.train(CORPUS, order=1)
+        assert bigram.successors_of(['the']) == {
+            'moon': 3, 'quiet': 1, 'silver': 1, 'wind': 1, 'hills': 1}
+
+    def test_invalid_order(self):
+        """A non-positive order is rejected."""
+        with pytest.raises(ValueError):
+            MarkovModel.train(CORPUS, order=0)
+
+    def test_empty_corpus(self):
+        """An empty corpus trains a model that samples nothing."""
+        empty = MarkovModel.train([])
+        assert len(empty) == 0
+        assert empty.sample_line(5, random.Random(0)) is None
+
+
+class TestSampling:
+    """Tests for sampling successors and lines."""
+
+    def test_sample_next_proportional(self, model):
+        """Successors are drawn in proportion to their counts."""
+        rng = random.Random(1)
+        start = [0, 0]
+        draws = [model.word(model.sample_next(start, rng)) for _ in range(4000)]
+        assert set(draws) == {'the', 'a'}
+        assert 0.7 < draws.count('the') / len(draws) < 0.8
+
+    def test_unseen_context(self, model):
+        """An unseen context has no successor."""
+        assert model.sample_next([model.word_id('sea'), model.word_id('sea')],
+                                 random.Random(0)) is None
+
+    def test_sample_line_exact_syllables(self, model, analyzer):
+        """Sampled lines hit the budget, follow corpus transitions and end like a corpus line."""
+        rng = random.Random(2)
+        for syllables in (2, 8, 9, 10):
+            words = model.sample_line(syllables, rng)
+            assert words is not None
+            assert analyzer.count_line_syllables(' '.join(words))['total'] == syllables
+            context = []
+            for word in words:
+                assert word in model.successors_of(context[-2:])
+                context.append(word)
+            assert '' in model.successors_of(context[-2:])
+
+    def test_sample_line_must_end(self, model):
+        """A budget that only fits by stopping mid-phrase returns None."""
+        assert model.sample_line(5, random.Random(0)) is None
+
+    def test_sample_line_impossible(self, model):
+        """A budget no corpus line can reach returns None."""
+        assert model.sample_line(40, random.Random(0), attempts=5) is None
+
+
+class TestPersistence:
+    """Tests for save and load."""
+
+    def test_round_trip_memory_mapped(self, model, tmp_path):
+        """A loaded model is memory-mapped and samples like the original."""
+        path = model.save(str(tmp_path / 'model'))
+        loaded = MarkovModel.load(path)
+        assert isinstance(loaded.successors.base, np.memmap)
+        assert loaded.order == model.order
+        assert loaded.nbytes == model.nbytes
+        assert loaded.successors_of(['the', 'moon']) == {'rises': 1, 'falls': 1, '': 1}
+        assert ([loaded.sample_line(8, random.Random(seed)) for seed in range(5)]
+                == [model.sample_line(8, random.Random(seed)) for seed in range(5)])
+
+    def test_save_overwrites(self, model, tmp_path):
+        """Saving over an existing model replaces it."""
+        path = str(tmp_path / 'model')
+        MarkovModel.train(CORPUS[:1]).save(path)
+        model.save(path)
+        assert len(MarkovModel.load(path, mmap=False)) == len(model)
+
+    def test_format_version_mismatch(self, model, tmp_path):
+        """A model saved in another format version is rejected."""
+        path = model.save(str(tmp_path / 'model'))
+        with open(Path(path) / 'meta.json', 'w') as f:
+            json.dump({'format_version': 0, 'order': 2}, f)
+        with pytest.raises(ValueError):
+            MarkovModel.load(path)
+
+
+class TestGeneratorLanguageModel:
+    """Tests for PoetryGenerator with a language model."""
+
+    def test_lines_from_model(self, model, analyzer):
+        """Standard lines mostly come from the model, at the exact syllable count."""
+        generator = PoetryGenerator(analyzer, rng=4, language_model=model)
+        lines = [generator.generate_line(8) for _ in range(30)]
+        from_model = [line for line in lines
+                      if all(model.word_id(word) is not None for word in line.split())]
+        assert len(from_model) >= 15
+        for line in lines:
+            assert analyzer.count_line_syllables(line)['total'] == 8
+
+    def test_end_word(self, model, analyzer):
+        """A requested end word still closes a model-sampled line."""
+        generator = PoetryGenerator(analyzer, rng=5, language_model=model)
+        for _ in range(10):
+            line = generator.generate_line(7, end_word='night')
+            assert line.split()[-1] == 'night'
+            assert analyzer.count_line_syllables(line)['total'] == 7
+
+    def test_falls_back_to_vocabulary(self, model, analyzer):
+        """A budget the model cannot fill is composed from the vocabulary."""
+        instrumentation = Instrumentation()
+        generator = PoetryGenerator(analyzer, rng=4, instrumentation=instrumentation,
+                                    language_model=model)
+        for _ in range(5):
+            line = generator.generate_line(40)
+            assert analyzer.count_line_syllables(line)['total'] == 40
+        assert instrumentation.snapshot()['counters']['markov_misses'] >= 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
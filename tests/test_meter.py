@@ -0,0 +1,78 @@
+"""
+Unit tests for vectorized meter classification.
+
+Tests foot detection, line lengths, deviation scores and batch scoring.
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.features import get_feature_extractor
+from core.meter import METER_NAMES, classify_meter, line_label, score_meter
+
+LINES = [
+    "Shall I compare thee to a summer's day?",
+    "Tyger Tyger, burning bright,",
+    "And his cohorts were gleaming in purple and gold",
+    "",
+]
+
+
+@pytest.fixture(scope='module')
+def features():
+    """Features of the sample lines."""
+    return get_feature_extractor().extract(LINES)
+
+
+class TestClassifyMeter:
+    """Tests for classify_meter."""
+
+    def test_labels(self, features):
+        """Classic lines are classified by foot and length."""
+        meters = classify_meter(features)
+        assert [meters.label(i) for i in range(len(meters))] == [
+            'iambic pentameter', 'trochaic tetrameter', 'anapestic tetrameter', None]
+
+    def test_deviation_is_best_cost(self, features):
+        """Each line's deviation is its lowest cost over all meters."""
+        meters = classify_meter(features)
+        assert meters.costs.shape == (len(METER_NAMES), len(LINES))
+        np.testing.assert_allclose(meters.deviation[:3], meters.costs[:, :3].min(axis=0))
+        assert meters.deviation[1] == 0.0
+        assert meters.deviation[3] == 1.0
+
+    def test_feminine_ending(self):
+        """An extra unstressed syllable does not add an iambic foot."""
+        features = get_feature_extractor().extract(["To be or not to be that is the question"])
+        assert classify_meter(features).label(0) == 'iambic pentameter'
+
+    def test_line_label(self):
+        """Lengths beyond octameter fall back to a foot count."""
+        assert line_label('dactylic', 6) == 'dactylic hexameter'
+        assert line_label('iambic', 9) == 'iambic 9-foot'
+
+
+class TestScoreMeter:
+    """Tests for score_meter."""
+
+    def test_target_length(self, features):
+        """Lines off the target length are penalized per syllable."""
+        scores = score_meter(features, 'iambic', 5)
+        assert scores[0] == pytest.approx(classify_meter(features).deviation[0])
+        assert scores[3] == 1.0
+        assert score_meter(features, 'trochaic', 4)[1] == pytest.approx(1 / 8)
+
+    def test_invalid_meter(self, features):
+        """Unknown feet and non-positive lengths raise ValueError."""
+        with pytest.raises(ValueError):
+            score_meter(features, 'spondaic', 5)
+        with pytest.raises(ValueError):
+            score_meter(features, 'iambic', 0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
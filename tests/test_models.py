@@ -0,0 +1,84 @@
+"""
+Unit tests for the spaCy model registry.
+
+Tests lazy, once-per-process loading, exclusions and load metrics.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import spacy
+
+from core.analyzer import PoetryAnalyzer
+from core.models import ModelRegistry
+
+
+class _FakePipeline:
+    pipe_names = ['tok2vec', 'tagger']
+
+
+@pytest.fixture
+def fake_load(monkeypatch):
+    """Replace spacy.load with a recording stub."""
+    calls = []
+
+    def load(name, exclude=()):
+        calls.append((name, tuple(exclude)))
+        return _FakePipeline()
+
+    monkeypatch.setattr(spacy, 'load', load)
+    return calls
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry."""
+
+    def test_loads_once(self, fake_load):
+        """Repeated lookups reuse the loaded pipeline."""
+        registry = ModelRegistry()
+        assert registry.get('en_core_web_sm') is registry.get('en_core_web_sm')
+        assert len(fake_load) == 1
+
+    def test_excludes_components(self, fake_load):
+        """Unneeded components are excluded at load time."""
+        registry = ModelRegistry()
+        registry.get('en_core_web_sm', exclude=('ner', 'parser'))
+        assert fake_load[0] == ('en_core_web_sm', ('ner', 'parser'))
+
+    def test_metrics(self, fake_load):
+        """Load time and pipeline are recorded per loaded model."""
+        registry = ModelRegistry()
+        registry.get('en_core_web_sm')
+        [record] = registry.metrics()
+        assert record['model'] == 'en_core_web_sm'
+        assert record['load_seconds'] >= 0
+        assert record['pipeline'] == ['tok2vec', 'tagger']
+        assert 'rss_bytes' in record
+
+    def test_missing_model(self, monkeypatch):
+        """A missing model raises OSError with install instructions."""
+        def load(name, exclude=()):
+            raise OSError('not found')
+
+        monkeypatch.setattr(spacy, 'load', load)
+        with pytest.raises(OSError, match='spacy download'):
+            ModelRegistry().get('missing_model')
+
+
+class TestAnalyzerModel:
+    """Tests for the analyzer's lazy model handle."""
+
+    def test_not_loaded_on_construction(self):
+        """Constructing an analyzer does not load spaCy."""
+        assert PoetryAnalyzer()._nlp is None
+
+    def test_shared_between_analyzers(self):
+        """Analyzers share one pipeline per process."""
+        assert PoetryAnalyzer().nlp is PoetryAnalyzer().nlp
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
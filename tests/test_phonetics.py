@@ -0,0 +1,74 @@
+"""
+Unit tests for the phonetic index.
+
+Tests dictionary lookups, rhyme keys and the shared process-wide index.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.phonetics import PhoneticIndex, estimate_syllables, get_phonetic_index
+
+
+@pytest.fixture(scope='module')
+def index():
+    """Shared phonetic index."""
+    return get_phonetic_index()
+
+
+class TestPhoneticIndex:
+    """Tests for PhoneticIndex lookups."""
+
+    def test_known_word_entry(self, index):
+        """Known words carry syllables, stresses and a rhyming part."""
+        syllables, stresses, key = index.lookup('water')
+        assert syllables == 2
+        assert stresses == '10'
+        assert key.endswith('ER0')
+
+    def test_unknown_word(self, index):
+        """Unknown words return None rather than raising."""
+        assert index.lookup('zzzqx') is None
+        assert index.syllables('zzzqx') is None
+
+    def test_rhyme_key_shared(self, index):
+        """Rhyming words share a rhyme key."""
+        assert index.rhyme_key('cat') == index.rhyme_key('hat')
+        assert index.rhyme_key('cat') != index.rhyme_key('dog')
+
+    def test_rhymes_excludes_word(self, index):
+        """rhymes() lists rhyming words but not the word itself."""
+        rhymes = index.rhymes('cat')
+        assert 'hat' in rhymes
+        assert 'cat' not in rhymes
+
+    def test_first_pronunciation_wins(self):
+        """Entries use the first pronunciation of a word."""
+        index = PhoneticIndex([('permit', 'P ER0 M IH1 T'),
+                               ('permit', 'P ER1 M IH2 T')])
+        assert index.stresses('permit') == '01'
+        assert index.words_for_rhyme_key('IH2 T') == ('permit',)
+
+    def test_index_is_shared(self, index):
+        """The process-wide index is built once."""
+        assert get_phonetic_index() is index
+
+
+class TestEstimateSyllables:
+    """Tests for the out-of-dictionary heuristic."""
+
+    def test_vowel_groups(self):
+        """Counts vowel groups."""
+        assert estimate_syllables('blorpan') == 2
+
+    def test_minimum_one(self):
+        """Never returns less than 1."""
+        assert estimate_syllables('...') == 1
+        assert estimate_syllables('x') == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,141 @@
+"""
+Unit tests for the shared analysis pipeline.
+
+Tests the lazy poem representation, stage selection, the complete
+analysis shape and parse skipping in analyze_many.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.cache import AnalysisCache
+from core.instrumentation import Instrumentation
+from core.phonetics import get_phonetic_index
+from core.pipeline import ANALYSES, PoemRepresentation, check_analyses, empty_result
+
+POEM = "I saw a cat\nWho wore a hat\n\nAnd silver stars sang softly"
+
+
+class RecordingNlp:
+    """Wraps a pipeline, recording the texts sent to ``pipe``."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.texts = []
+
+    def __call__(self, text):
+        return self.nlp(text)
+
+    def pipe(self, items, **kwargs):
+        def record():
+            for text, context in items:
+                self.texts.append(text)
+                yield text, context
+        return self.nlp.pipe(record(), **kwargs)
+
+
+def parse_count(analyzer):
+    timers = analyzer.instrumentation.snapshot()['timers']
+    return timers.get('spacy_parse', {}).get('count', 0)
+
+
+@pytest.fixture
+def analyzer():
+    """Analyzer with instrumentation to count parses."""
+    return PoetryAnalyzer(instrumentation=Instrumentation())
+
+
+class TestPoemRepresentation:
+    """Tests for PoemRepresentation."""
+
+    def test_lazy_fields(self):
+        """Lines are split up front; the parse runs once, on first access."""
+        calls = []
+        representation = PoemRepresentation(
+            POEM, parse=lambda poem: calls.append(poem) or 'doc',
+            phonetics=get_phonetic_index())
+        assert representation.lines == ['I saw a cat', 'Who wore a hat',
+                                        'And silver stars sang softly']
+        assert representation.line_words[0] == ['i', 'saw', 'a', 'cat']
+        assert representation.rhyme_keys[0] == representation.rhyme_keys[1]
+        assert calls == []
+        assert representation.doc == representation.doc == 'doc'
+        assert calls == [POEM]
+
+    def test_check_analyses(self):
+        """None selects every analysis; unknown names raise ValueError."""
+        assert check_analyses(None) == ANALYSES
+        assert check_analyses('meter') == ('meter',)
+        with pytest.raises(ValueError):
+            check_analyses(['rhyme'])
+        with pytest.raises(ValueError):
+            empty_result('rhyme')
+
+
+class TestAnalyze:
+    """Tests for PoetryAnalyzer.analyze."""
+
+    def test_selected_stages_only(self, analyzer):
+        """Only requested analyses run; non-spaCy ones never parse."""
+        result = analyzer.analyze(POEM, ['rhyme_scheme', 'meter', 'structure'])
+        assert list(result) == ['rhyme_scheme', 'meter', 'structure']
+        assert result['rhyme_scheme'] == 'AAB'
+        assert result['structure'] == {'lines': 3, 'words': 13,
+                                       'syllables_per_line': [4, 4, 7]}
+        assert parse_count(analyzer) == 0
+
+    def test_doc_shared(self, analyzer):
+        """Imagery and sentiment share one parse and match the single methods."""
+        result = analyzer.analyze(POEM, ['imagery', 'sentiment'])
+        assert parse_count(analyzer) == 1
+        assert result['imagery'] == analyzer.analyze_imagery(POEM)
+        assert result['sentiment'] == analyzer.analyze_sentiment(POEM)
+
+    def test_empty_poem(self, analyzer):
+        """Empty poems get each analysis' empty result."""
+        assert analyzer.analyze('') == {analysis: empty_result(analysis)
+                                        for analysis in ANALYSES}
+
+    def test_complete_analysis_shape(self, analyzer):
+        """get_complete_analysis groups results like the original analyzer."""
+        analysis = analyzer.get_complete_analysis(POEM)
+        assert set(analysis) == {'sound_devices', 'imagery', 'sentiment',
+                                 'meter', 'structure'}
+        devices = analysis['sound_devices']
+        assert devices['rhyme_scheme'] == 'AAB'
+        assert {'alliteration', 'assonance', 'consonance'} <= set(devices)
+        assert devices['meter_patterns'] == [line['stresses'] for line in analysis['meter']]
+
+    def test_cached_stages(self, analyzer):
+        """Cached analyses are reused and skip the parse."""
+        analyzer.result_cache = AnalysisCache()
+        first = analyzer.analyze(POEM)
+        assert analyzer.analyze(POEM) == first
+        assert parse_count(analyzer) == 1
+
+
+class TestAnalyzeManyFeatures:
+    """Tests for analyze_many with selected analyses."""
+
+    def test_no_parse_without_doc_stages(self, analyzer):
+        """Poems are not parsed when no requested analysis needs spaCy."""
+        nlp = analyzer.nlp = RecordingNlp(analyzer.nlp)
+        results = list(analyzer.analyze_many([POEM, ''], features=['rhyme_scheme', 'meter']))
+        assert results[0] == analyzer.analyze(POEM, ['rhyme_scheme', 'meter'])
+        assert results[1] == {'rhyme_scheme': '', 'meter': []}
+        assert nlp.texts == ['', '']
+
+    def test_parses_for_doc_stages(self, analyzer):
+        """Poems needing spaCy are sent to the pipe lowercased."""
+        nlp = analyzer.nlp = RecordingNlp(analyzer.nlp)
+        result = next(analyzer.analyze_many([POEM], features=None))
+        assert nlp.texts == [POEM.lower()]
+        assert result == analyzer.analyze(POEM)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
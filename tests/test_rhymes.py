@@ -0,0 +1,58 @@
+"""
+Unit tests for the rhyme-class index.
+
+Tests grouping of vocabulary words by rhyme key, category and length.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.lexicon import load_lexicon
+from core.rhymes import RhymeIndex
+
+
+@pytest.fixture(scope='module')
+def lexicon():
+    """Shared compiled lexicon."""
+    return load_lexicon()
+
+
+@pytest.fixture(scope='module')
+def index(lexicon):
+    """Rhyme index over the vocabulary."""
+    return RhymeIndex(lexicon)
+
+
+class TestRhymeIndex:
+    """Tests for RhymeIndex."""
+
+    def test_class_members_share_key(self, index, lexicon):
+        """Every word in a class has that class's rhyme key."""
+        for key in index.classes():
+            for word in index.words(key):
+                assert lexicon.rhyme_key(word) == key
+
+    def test_classes_have_enough_words(self, index):
+        """classes() only returns keys with at least min_words words."""
+        for key in index.classes(min_words=3):
+            assert len(index.words(key)) >= 3
+
+    def test_category_filter(self, index, lexicon):
+        """Category filters restrict class members."""
+        for key in index.classes(('nature',)):
+            for word in index.words(key, ('nature',)):
+                assert 'nature' in lexicon.categories(word)
+
+    def test_max_syllables(self, index, lexicon):
+        """Length filters drop longer words."""
+        key = lexicon.rhyme_key('night')
+        assert 'night' in index.words(key, max_syllables=1)
+        assert all(lexicon.syllables(w) <= 1
+                   for w in index.words(key, max_syllables=1))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,119 @@
+"""
+Unit tests for generate-and-filter selection.
+
+Tests top-k selection, early stopping, batched scoring and best_of.
+"""
+
+import random
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.generator import PoetryGenerator
+from core.selection import PoemScorer, select_best
+
+
+class RecordingScorer:
+    """Scores poems by length, recording each batch it is given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, poems):
+        self.batches.append(list(poems))
+        return [len(poem) for poem in poems]
+
+
+@pytest.fixture(scope='module')
+def generator():
+    """Shared generator."""
+    return PoetryGenerator(PoetryAnalyzer(), rng=0)
+
+
+class TestSelectBest:
+    """Tests for select_best."""
+
+    def test_top_k_in_batches(self):
+        """The best k come back best first, scored one batch per call."""
+        scorer = RecordingScorer()
+        poems = ['a' * n for n in (3, 9, 1, 7, 9, 2, 5)]
+        best = select_best(poems, scorer, k=3, batch_size=3)
+        assert best == [('a' * 9, 9), ('a' * 9, 9), ('a' * 7, 7)]
+        assert [len(batch) for batch in scorer.batches] == [3, 3, 1]
+
+    def test_stops_at_threshold(self):
+        """No candidates are drawn after k reach the threshold."""
+        drawn = []
+
+        def candidates():
+            for n in range(100):
+                drawn.append(n)
+                yield 'a' * n
+
+        best = select_best(candidates(), RecordingScorer(), k=2, threshold=5, batch_size=4)
+        assert len(drawn) == 8
+        assert [score for _, score in best] == [7, 6]
+
+    def test_invalid_arguments(self):
+        """k and batch_size must be positive."""
+        with pytest.raises(ValueError):
+            select_best([], RecordingScorer(), k=0)
+        with pytest.raises(ValueError):
+            select_best([], RecordingScorer(), batch_size=0)
+
+
+class TestPoemScorer:
+    """Tests for the default batched scorer."""
+
+    def test_components(self):
+        """Syllable exactness, mood imagery and sentiment are each in [0, 1]."""
+        scorer = PoemScorer(PoetryAnalyzer(), mood='nature', syllables=[5, 7, 5])
+        exact, short = scorer.components([
+            'The old pond sleeps here\nA frog jumps into the pond\nSplash of the river',
+            'Sad hope\nA frog jumps into the pond'])
+        assert exact['syllables'] == 1.0
+        assert short['syllables'] == pytest.approx(1 / 3)
+        assert exact['imagery'] > 0
+        assert all(0 <= value <= 1 for value in exact.values())
+
+    def test_weighted_mean(self):
+        """Scores average only the components present."""
+        scorer = PoemScorer(PoetryAnalyzer(), weights={'imagery': 1, 'sentiment': 0})
+        poem = 'river stone river'
+        assert scorer([poem]) == [scorer.components([poem])[0]['imagery']]
+
+
+class TestBestOf:
+    """Tests for PoetryGenerator.best_of."""
+
+    def test_returns_best_k(self, generator):
+        """best_of returns k scored poems of the form, best first."""
+        best = generator.best_of('haiku', 12, k=3, mood='nature', rng=random.Random(1))
+        assert len(best) == 3
+        assert [score for _, score in best] == sorted((s for _, s in best), reverse=True)
+        assert all(len(poem.split('\n')) == 3 for poem, _ in best)
+
+    def test_reproducible(self, generator):
+        """The same seed selects the same poems."""
+        first = generator.best_of('sonnet', 6, k=2, rng=random.Random(5))
+        assert generator.best_of('sonnet', 6, k=2, rng=random.Random(5)) == first
+
+    def test_early_stop_generates_less(self, generator):
+        """Meeting the threshold stops generation after the current batch."""
+        scorer = RecordingScorer()
+        generator.best_of('haiku', 100, scorer=scorer, threshold=0, batch_size=5,
+                          rng=random.Random(2))
+        assert [len(batch) for batch in scorer.batches] == [5]
+
+    def test_unknown_form(self, generator):
+        """Unknown forms raise ValueError."""
+        with pytest.raises(ValueError):
+            generator.best_of('limerick', 3)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
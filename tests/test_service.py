@@ -0,0 +1,214 @@
+"""
+Unit tests for the asyncio poetry service.
+
+Tests micro-batching, timeouts, backpressure, latency reporting and the
+JSON-line protocol.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.service import PoetryService, percentile, serve
+
+POEMS = [
+    "Soft winds whisper dreams\nThrough autumn's golden branches\nTime flows like water",
+    "The river bends beneath a silver moon\nAnd sorrow drifts like mist across the stone",
+    "Bright blossoms tremble in the morning light\nA sparrow sings of courage and of grace",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    """Shared analyzer instance."""
+    return PoetryAnalyzer()
+
+
+class SlowAnalyzer(PoetryAnalyzer):
+    """Analyzer whose batches take a fixed extra time."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def analyze_many(self, poems, **kwargs):
+        time.sleep(self.delay)
+        return super().analyze_many(poems, **kwargs)
+
+
+class SlowGenerator:
+    """Generator whose haiku take a fixed time."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def generate_haiku(self, mood=None, rng=None):
+        time.sleep(self.delay)
+        return "slow\nold\npond"
+
+
+def test_percentile():
+    """Nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+class TestPoetryService:
+    """Tests for PoetryService."""
+
+    def test_concurrent_requests_are_batched(self, analyzer):
+        """Concurrent analyses share batches and match direct analysis."""
+        async def run():
+            async with PoetryService(analyzer, max_batch=8, max_wait=0.05) as service:
+                results = await asyncio.gather(
+                    *(service.analyze(POEMS[i % 3]) for i in range(12)))
+                return results, service.stats()
+
+        results, stats = asyncio.run(run())
+        expected = list(analyzer.analyze_many(POEMS))
+        assert results == [expected[i % 3] for i in range(12)]
+        assert stats['batches'] < 12
+        assert stats['mean_batch_size'] > 1
+        assert stats['latency']['analyze']['count'] == 12
+        assert stats['latency']['analyze']['p99_ms'] >= stats['latency']['analyze']['p50_ms']
+
+    def test_timeout(self):
+        """A request exceeding its timeout fails and is counted."""
+        async def run():
+            async with PoetryService(SlowAnalyzer(0.3), max_wait=0) as service:
+                with pytest.raises(asyncio.TimeoutError):
+                    await service.analyze(POEMS[0], timeout=0.05)
+                return service.stats()
+
+        assert asyncio.run(run())['timeouts'] == 1
+
+    def test_backpressure(self, analyzer):
+        """Submitting waits once max_pending requests are queued."""
+        async def run():
+            service = PoetryService(analyzer, max_pending=2)
+            await service.submit(POEMS[0])
+            await service.submit(POEMS[1])
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(service.submit(POEMS[2]), 0.05)
+            assert service.stats()['pending'] == 2
+            await service.stop()
+
+        asyncio.run(run())
+
+    def test_generate_seeded(self, analyzer):
+        """Generation with a seed is reproducible."""
+        async def run():
+            async with PoetryService(analyzer) as service:
+                return [await service.generate('haiku', seed=5) for _ in range(2)]
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert len(first.split('\n')) == 3
+
+    def test_generate_backpressure(self, analyzer):
+        """Starting a generation waits once max_generating are in flight."""
+        async def run():
+            async with PoetryService(analyzer, SlowGenerator(0.3),
+                                     max_generating=1) as service:
+                pending = await service.start_generate('haiku')
+                assert service.stats()['generating'] == 1
+                with pytest.raises(asyncio.TimeoutError):
+                    await service.start_generate('haiku', timeout=0.05)
+                await pending
+                second = await service.start_generate('haiku', timeout=1.0)
+                return await second
+
+        assert asyncio.run(run()) == "slow\nold\npond"
+
+    def test_analysis_not_behind_generation(self, analyzer):
+        """Analysis batches do not queue behind running generations."""
+        async def run():
+            async with PoetryService(analyzer, SlowGenerator(0.5), workers=1,
+                                     generate_workers=1, max_wait=0) as service:
+                await service.analyze(POEMS[0])
+                generations = [await service.start_generate('haiku') for _ in range(3)]
+                start = time.perf_counter()
+                await service.analyze(POEMS[1])
+                elapsed = time.perf_counter() - start
+                await asyncio.gather(*generations)
+                return elapsed
+
+        assert asyncio.run(run()) < 0.4
+
+
+class TestLineProtocol:
+    """Tests for the JSON-line TCP server."""
+
+    def test_round_trip(self, analyzer, caplog):
+        """Requests on one connection are answered by id, and shutdown is clean."""
+        async def run():
+            service = PoetryService(analyzer)
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            requests = [
+                {'id': 1, 'op': 'analyze', 'poem': POEMS[0]},
+                {'id': 2, 'op': 'generate', 'form': 'haiku', 'seed': 1},
+                {'id': 3, 'op': 'generate', 'form': 'limerick'},
+            ]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b'\n')
+            writer.write(b'not json\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+            return responses
+
+        responses = {r['id']: r for r in asyncio.run(run())}
+        assert responses[1]['result'] == next(analyzer.analyze_many([POEMS[0]]))
+        assert isinstance(responses[2]['result'], str)
+        assert 'form must be one of' in responses[3]['error']
+        assert responses[None]['error'].startswith('bad request')
+        assert not [r for r in caplog.records if r.levelname == 'ERROR']
+
+    def test_malformed_fields(self, analyzer):
+        """Fields of the wrong type get an error reply and the connection keeps serving."""
+        async def run():
+            service = PoetryService(analyzer)
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            requests = [
+                {'id': 1, 'op': 'analyze', 'poem': 'hi', 'timeout': '5'},
+                {'id': 2, 'op': 'generate', 'form': ['x']},
+                {'id': 3, 'op': 'analyze', 'poem': ['hi']},
+                {'id': 4, 'op': 'generate', 'seed': 1.5},
+                {'id': 5, 'op': 'analyze', 'poem': 'hi', 'timeout': -1},
+                {'id': 6, 'op': 'stats'},
+            ]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+            return responses
+
+        responses = {r['id']: r for r in asyncio.run(run())}
+        assert responses[1]['error'] == 'timeout must be a number, got str'
+        assert responses[2]['error'] == 'form must be a string, got list'
+        assert responses[3]['error'] == 'poem must be a string, got list'
+        assert responses[4]['error'] == 'seed must be an integer or a string, got float'
+        assert responses[5]['error'] == 'timeout must be >= 0'
+        assert responses[6]['result']['timeouts'] == 0
@@ -0,0 +1,74 @@
+"""
+Unit tests for the phoneme-based sound-device scanner.
+
+Tests sound extraction, grouping within a span and density.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.phonetics import PhoneticIndex
+from core.sounds import SoundScanner, get_sound_scanner, sound_features
+
+
+@pytest.fixture(scope='module')
+def scanner():
+    """Shared scanner over the CMU dictionary."""
+    return get_sound_scanner()
+
+
+class TestSoundFeatures:
+    """Tests for sound_features."""
+
+    def test_onset_vowel_coda(self):
+        """Onset, stressed vowel and final consonants come from the phones."""
+        assert sound_features('B L AE1 NG K') == ('B', 'AE', 'NG K')
+        assert sound_features('W AO1 T ER0') == ('W', 'AO', None)
+        assert sound_features('IH1 NG K') == (None, 'IH', 'NG K')
+
+    def test_unstressed_word(self):
+        """Words without primary stress have no sounds."""
+        assert sound_features('DH AH0') == (None, None, None)
+
+
+class TestSoundScanner:
+    """Tests for SoundScanner.scan."""
+
+    def test_alliteration_by_sound(self, scanner):
+        """Alliteration follows phonemes, not spelling."""
+        result = scanner.scan('Careless kings could crown a phantom fool')
+        groups = {group['sound']: group['words'] for group in result['alliteration']}
+        assert groups['K'] == ['careless', 'kings', 'could', 'crown']
+        assert groups['F'] == ['phantom', 'fool']
+
+    def test_assonance_and_consonance(self, scanner):
+        """Stressed vowels and word endings form groups."""
+        result = scanner.scan('I think the blank ink sank')
+        assert [g['words'] for g in result['consonance']] == [['think', 'blank', 'ink', 'sank']]
+        assert {g['sound'] for g in result['assonance']} == {'IH', 'AE'}
+        assert result['density'] == pytest.approx(4 / 6)
+
+    def test_span_and_line_breaks(self):
+        """Groups need words within the span and never cross lines."""
+        index = PhoneticIndex([('sun', 'S AH1 N'), ('sea', 'S IY1'),
+                               ('and', 'AH0 N D')])
+        scanner = SoundScanner(index, span=2)
+        assert scanner.scan('sun and sea')['alliteration'][0]['start'] == 0
+        assert scanner.scan('sun and and sea')['alliteration'] == []
+        assert scanner.scan('sun\nsea')['alliteration'] == []
+
+    def test_repeated_word_not_a_group(self, scanner):
+        """Repeating one word is not alliteration."""
+        assert scanner.scan('Tyger Tyger')['alliteration'] == []
+
+    def test_empty(self, scanner):
+        """Empty text has no groups."""
+        assert scanner.scan('') == {'alliteration': [], 'assonance': [],
+                                    'consonance': [], 'density': 0.0}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,124 @@
+"""
+Unit tests for streaming corpus analysis.
+
+Tests incremental reading with byte offsets, both output formats and
+resuming from a checkpoint.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import PoetryAnalyzer
+from core.stream import iter_poems, read_checkpoint, stream_analyze
+
+POEMS = [
+    "Soft winds whisper dreams\nThrough autumn's golden branches\nTime flows like water",
+    "The river bends beneath a silver moon\nAnd sorrow drifts like mist across the stone",
+    "Bright blossoms tremble in the morning light\nA sparrow sings of courage and of grace",
+    "Whispers of eternity\necho through the silent forest",
+    "I hear the thunder of a distant rune\nThe meadow sleeps in shadow all alone",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    """Shared analyzer instance."""
+    return PoetryAnalyzer()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Text corpus of the sample poems separated by blank lines."""
+    path = tmp_path / 'corpus.txt'
+    path.write_text('\n\n'.join(POEMS) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestIterPoems:
+    """Tests for iter_poems."""
+
+    def test_text_offsets(self, corpus):
+        """Poems come back whole, and each end offset resumes at the next poem."""
+        records = list(iter_poems(corpus, read_size=16))
+        assert [poem.strip() for _, _, poem in records] == POEMS
+        assert records[0][0] == 0
+        for (_, end, _), (offset, _, _) in zip(records, records[1:]):
+            assert end == offset
+        resumed = list(iter_poems(corpus, start=records[2][1]))
+        assert resumed == records[3:]
+
+    def test_jsonl(self, tmp_path):
+        """JSONL input accepts objects with the poem field, skipping blank lines."""
+        path = tmp_path / 'corpus.jsonl'
+        path.write_text('{"text": "a"}\n\n{"text": "b", "id": 2}\n', encoding='utf-8')
+        poems = [poem for _, _, poem in iter_poems(str(path), 'jsonl')]
+        assert poems == ['a', 'b']
+
+    def test_unknown_format(self, corpus):
+        """Unknown input formats raise ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_poems(corpus, 'csv'))
+
+
+class TestStreamAnalyze:
+    """Tests for stream_analyze."""
+
+    def test_jsonl_matches_analyze_many(self, corpus, tmp_path, analyzer):
+        """JSONL records hold analyze_many's results plus the poem offset."""
+        output = str(tmp_path / 'out.jsonl')
+        summary = stream_analyze(corpus, output, batch_size=2, analyzer=analyzer)
+        assert summary['poems'] == len(POEMS) and summary['done']
+        records = read_jsonl(output)
+        expected = list(analyzer.analyze_many(POEMS))
+        for record, result in zip(records, expected):
+            offset = record.pop('offset')
+            assert isinstance(offset, int)
+            assert record == json.loads(json.dumps(result))
+
+    def test_resume(self, corpus, tmp_path, analyzer):
+        """An interrupted run resumed from its checkpoint equals a full run."""
+        full = str(tmp_path / 'full.jsonl')
+        stream_analyze(corpus, full, batch_size=2, analyzer=analyzer)
+
+        partial = str(tmp_path / 'partial.jsonl')
+        summary = stream_analyze(corpus, partial, batch_size=2, max_batches=1,
+                                 analyzer=analyzer)
+        assert summary == {'poems': 2, 'offset': read_checkpoint(partial)['offset'],
+                           'done': False}
+        with open(partial, 'a') as f:
+            f.write('{"torn": ')
+        stream_analyze(corpus, partial, batch_size=2, resume=True, analyzer=analyzer)
+        assert read_jsonl(partial) == read_jsonl(full)
+
+    def test_resume_rejects_other_settings(self, corpus, tmp_path, analyzer):
+        """A checkpoint is only resumed with the settings that wrote it."""
+        output = str(tmp_path / 'out.jsonl')
+        stream_analyze(corpus, output, batch_size=2, max_batches=1, analyzer=analyzer)
+        with pytest.raises(ValueError):
+            stream_analyze(corpus, output, delimiter='\n', resume=True,
+                           analyzer=analyzer)
+
+    def test_columnar_chunks(self, corpus, tmp_path, analyzer):
+        """Columnar output writes one chunk per batch with flat columns."""
+        output = tmp_path / 'chunks'
+        stream_analyze(corpus, str(output), output_format='columnar',
+                       batch_size=2, analyzer=analyzer)
+        chunks = sorted(output.glob('chunk-*.npz'))
+        assert len(chunks) == 3
+        expected = list(analyzer.analyze_many(POEMS[:2]))
+        with np.load(chunks[0]) as chunk:
+            assert chunk['rhyme_scheme'].tolist() == [r['rhyme_scheme'] for r in expected]
+            offsets = chunk['imagery_nature_offsets']
+            words = chunk['imagery_nature_words'].tolist()
+            assert words[offsets[0]:offsets[1]] == expected[0]['imagery'].get('nature', [])
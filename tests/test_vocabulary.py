@@ -0,0 +1,39 @@
+"""
+Unit tests for the vocabulary modules.
+
+Tests lookup structures built from the vocabulary data.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vocabulary import emotion_words
+
+
+class TestEmotionLookup:
+    """Tests for get_emotion_lookup."""
+
+    def test_maps_word_to_emotions(self):
+        """Words map to every emotion that lists them."""
+        lookup = emotion_words.get_emotion_lookup()
+        assert lookup['bliss'] == ('joy',)
+        assert set(lookup['darkness']) == {'sorrow', 'fear'}
+
+    def test_covers_all_emotion_words(self):
+        """Every emotion word is present in the lookup."""
+        lookup = emotion_words.get_emotion_lookup()
+        assert set(lookup) == set(emotion_words.get_all_emotion_words())
+
+    def test_built_once_and_frozen(self):
+        """The lookup is shared and read-only."""
+        lookup = emotion_words.get_emotion_lookup()
+        assert emotion_words.get_emotion_lookup() is lookup
+        with pytest.raises(TypeError):
+            lookup['new'] = ('joy',)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
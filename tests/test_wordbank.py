@@ -0,0 +1,81 @@
+"""
+Unit tests for the array-backed word bank.
+
+Tests the word_cache-compatible interface and cumulative-offset sampling.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.lexicon import load_lexicon
+from core.wordbank import WordBank
+
+BUCKETS = {
+    'nature': {1: ['sun', 'moon'], 2: ['river'], 4: ['waterfall']},
+    'emotion': {2: ['sorrow']},
+}
+
+
+@pytest.fixture
+def bank():
+    """Word bank over a tiny vocabulary."""
+    return WordBank(BUCKETS)
+
+
+class TestWordCacheInterface:
+    """Tests for the word_cache-compatible mapping interface."""
+
+    def test_bucket_lookup(self, bank):
+        """word_cache[category][syllables] returns that bucket's words."""
+        assert bank['nature'][1] == ('sun', 'moon')
+        assert bank['nature'][4] == ('waterfall',)
+
+    def test_membership_and_keys(self, bank):
+        """Categories and non-empty syllable buckets behave like dict keys."""
+        assert 'nature' in bank and 'abstract' not in bank
+        assert list(bank.keys()) == ['nature', 'emotion']
+        assert list(bank['nature']) == [1, 2, 4]
+        assert 3 not in bank['nature']
+        with pytest.raises(KeyError):
+            bank['nature'][3]
+
+    def test_from_lexicon(self):
+        """Buckets built from the lexicon use compiled syllable counts."""
+        lexicon = load_lexicon()
+        bank = WordBank.from_lexicon(lexicon)
+        for syllables, words in bank['nature'].items():
+            assert all(lexicon.syllables(w) == syllables for w in words)
+
+
+class TestPick:
+    """Tests for cumulative-offset sampling."""
+
+    def test_count_at_most(self, bank):
+        """Prefix offsets count words up to a syllable bound."""
+        words = bank['nature']
+        assert words.count_at_most(1) == 2
+        assert words.count_at_most(3) == 3
+        assert words.count_at_most(10) == 4
+        assert words.count_at_most(0) == 0
+
+    def test_pick_respects_bound(self, bank):
+        """Picked words never exceed the syllable bound."""
+        rng = random.Random(0)
+        picks = Counter(bank.pick('nature', 2, rng) for _ in range(3000))
+        assert set(picks) == {'sun', 'moon', 'river'}
+        assert min(picks.values()) > 850
+
+    def test_pick_empty(self, bank):
+        """No eligible words returns None."""
+        assert bank.pick('emotion', 1) is None
+        assert bank.pick('abstract', 5) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,5 +1,8 @@
 """Emotional vocabulary for poetry generation"""
 
+from functools import lru_cache
+from types import MappingProxyType
+
 EMOTIONS = {
     'joy': [
         'delight', 'bliss', 'rapture', 'ecstasy', 'elation',
@@ -57,4 +60,19 @@ def get_all_emotion_words():
 
 def get_emotion_words(emotion):
     """Return all words for a specific emotion"""
-    return EMOTIONS.get(emotion, [])
\ No newline at end of file
+    return EMOTIONS.get(emotion, [])
+
+@lru_cache(maxsize=None)
+def get_emotion_lookup():
+    """Return a read-only mapping of word -> tuple of emotions it belongs to.
+
+    Built once per process; words listed under several emotions
+    (e.g. 'darkness') map to every one of them.
+    """
+    lookup = {}
+    for emotion, words in EMOTIONS.items():
+        for word in words:
+            emotions = lookup.get(word, ())
+            if emotion not in emotions:
+                lookup[word] = emotions + (emotion,)
+    return MappingProxyType(lookup)